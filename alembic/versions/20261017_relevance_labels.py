@@ -0,0 +1,25 @@
+"""Add relevance labels to golden datasets
+
+Revision ID: 20261017_relevance_labels
+Revises: 20240320_initial
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_relevance_labels'
+down_revision = '20240320_initial'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Maps document IDs to graded relevance; existing entries start unlabelled
+    op.add_column(
+        'golden_datasets',
+        sa.Column('relevance_labels', sa.JSON(), nullable=False, server_default='{}')
+    )
+
+def downgrade() -> None:
+    op.drop_column('golden_datasets', 'relevance_labels')
\ No newline at end of file
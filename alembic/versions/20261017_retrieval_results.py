@@ -0,0 +1,33 @@
+"""Store retrieval evaluation results in their own table
+
+Revision ID: 20261017_retrieval_results
+Revises: 20261017_relevance_labels
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_retrieval_results'
+down_revision = '20261017_relevance_labels'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'retrieval_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('golden_dataset', sa.String(length=100), nullable=False),
+        sa.Column('golden_entry_id', sa.Integer(), nullable=False),
+        sa.Column('k', sa.Integer(), nullable=False),
+        sa.Column('retrieved_ids', sa.JSON(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('metrics', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['golden_entry_id'], ['golden_datasets.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('retrieval_results')
\ No newline at end of file
@@ -48,6 +48,7 @@ class GoldenDatasetBase(BaseModel):
     name: str
     query: str
     expected_response: str
+    relevance_labels: Dict[str, float] = Field(default_factory=dict)  # document ID -> grade
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class GoldenDatasetCreate(GoldenDatasetBase):
@@ -1,12 +1,13 @@
 import asyncio
 from typing import Optional
 import typer
+from sqlalchemy import select
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress
 
-from evalkit.db.database import get_db
-from evalkit.db.models import Interaction, Evaluation
+from evalkit.db.database import db_session
+from evalkit.db.models import Interaction, Evaluation, GoldenDataset
 from evalkit.core.config import settings
 
 app = typer.Typer()
@@ -17,12 +18,22 @@ def evaluate(
     dataset: str = typer.Option(..., help="Name of the golden dataset to evaluate against"),
     model: str = typer.Option("gpt-4", help="Model to use for evaluation"),
     limit: int = typer.Option(100, help="Maximum number of interactions to evaluate"),
+    concurrency: int = typer.Option(
+        settings.SCORING_CONCURRENCY, help="Scorer calls in flight at once"
+    ),
+    batch_size: int = typer.Option(
+        settings.SCORING_BATCH_SIZE, help="Items packed into each judge request"
+    ),
 ):
     """Run evaluations against a golden dataset."""
+    from evalkit.eval.engine import ScoringEngine
+    from evalkit.eval.judge_cache import CachedScorer, JudgeCache
+    from evalkit.eval.scorer import ScorerFactory
+    
     console.print(f"[bold blue]Running evaluations using {model} against {dataset} dataset[/]")
     
     async def run_evaluations():
-        async with get_db() as db:
+        async with db_session() as db:
             # Get interactions to evaluate
             interactions = await db.execute(
                 select(Interaction)
@@ -30,29 +41,63 @@ def evaluate(
                 .order_by(Interaction.created_at.desc())
             )
             interactions = interactions.scalars().all()
+            golden = await db.execute(select(GoldenDataset).where(GoldenDataset.name == dataset))
+            expected = {entry.query: entry.expected_response for entry in golden.scalars().all()}
             
-            with Progress() as progress:
-                task = progress.add_task("[cyan]Evaluating...", total=len(interactions))
-                
-                for interaction in interactions:
-                    # TODO: Implement actual evaluation logic
-                    # This is a placeholder for the evaluation process
-                    score = 0.8  # Example score
-                    
-                    evaluation = Evaluation(
-                        interaction_id=interaction.id,
-                        evaluator_type=model,
-                        score=score,
-                        metrics={"example": "metric"},
-                        notes="Example evaluation"
+            items = [
+                {
+                    "query": interaction.query,
+                    "response": interaction.response,
+                    "expected_response": expected.get(interaction.query)
+                }
+                for interaction in interactions
+            ]
+            scorer = ScorerFactory.create("gpt", model=model)
+            if settings.JUDGE_CACHE_PATH:
+                scorer = CachedScorer(scorer, JudgeCache(
+                    settings.JUDGE_CACHE_PATH,
+                    max_entries=settings.JUDGE_CACHE_MAX_ENTRIES,
+                    max_age=settings.JUDGE_CACHE_MAX_AGE
+                ))
+            engine = ScoringEngine(
+                scorer,
+                concurrency=concurrency,
+                requests_per_minute=settings.SCORING_REQUESTS_PER_MINUTE,
+                tokens_per_minute=settings.SCORING_TOKENS_PER_MINUTE,
+                request_burst=settings.SCORING_REQUEST_BURST,
+                token_burst=settings.SCORING_TOKEN_BURST,
+                timeout=settings.SCORING_TIMEOUT,
+                max_retries=settings.SCORING_MAX_RETRIES,
+                batch_size=batch_size,
+                batch_max_tokens=settings.SCORING_BATCH_MAX_TOKENS
+            )
+            
+            try:
+                with Progress() as progress:
+                    task = progress.add_task("[cyan]Evaluating...", total=len(items))
+                    results = await engine.score_many(
+                        items, on_result=lambda index, result: progress.update(task, advance=1)
                     )
-                    db.add(evaluation)
-                    await db.commit()
-                    
-                    progress.update(task, advance=1)
+            finally:
+                await scorer.close()
+            
+            for interaction, result in zip(interactions, results):
+                db.add(Evaluation(
+                    interaction_id=interaction.id,
+                    evaluator_type=model,
+                    score=result["overall_score"],
+                    metrics=result["scores"],
+                    notes=result.get("error") or result["explanation"]
+                ))
+            await db.commit()
+            return engine.get_stats()
     
-    asyncio.run(run_evaluations())
-    console.print("[bold green]Evaluation complete![/]")
+    stats = asyncio.run(run_evaluations())
+    console.print(
+        f"[bold green]Evaluation complete![/] "
+        f"({stats['cached']} cached, {stats['requests']} requests, "
+        f"{stats['retries']} retries, {stats['failures']} failed)"
+    )
 
 @app.command()
 def list_interactions(
@@ -61,7 +106,7 @@ def list_interactions(
 ):
     """List recent interactions."""
     async def show_interactions():
-        async with get_db() as db:
+        async with db_session() as db:
             interactions = await db.execute(
                 select(Interaction)
                 .limit(limit)
@@ -106,7 +151,7 @@ def metrics(
 ):
     """Show evaluation metrics."""
     async def show_metrics():
-        async with get_db() as db:
+        async with db_session() as db:
             # TODO: Implement actual metrics calculation
             # This is a placeholder for the metrics display
             table = Table(title=f"Evaluation Metrics (Last {days} days)")
@@ -121,5 +166,161 @@ def metrics(
     
     asyncio.run(show_metrics())
 
+@app.command("bench-vector")
+def bench_vector(
+    dataset: Optional[str] = typer.Option(None, help="Path to a .npy matrix; generated if omitted"),
+    num_vectors: int = typer.Option(100000, help="Number of vectors to generate"),
+    dimension: int = typer.Option(128, help="Dimension of generated vectors"),
+    num_queries: int = typer.Option(1000, help="Number of queries held out of the dataset"),
+    k: int = typer.Option(10, help="Number of neighbours to retrieve"),
+    stores: Optional[str] = typer.Option(None, help="Comma-separated configs to run (default: all)"),
+    concurrency: str = typer.Option("1,4,16", help="Comma-separated client concurrency levels"),
+    save: bool = typer.Option(True, help="Save results to the vector_stores table"),
+):
+    """Benchmark vector store configurations for ingest, recall and latency."""
+    from evalkit.vector.benchmark import load_dataset, run_benchmark
+    
+    corpus, queries = load_dataset(dataset, num_vectors, dimension, num_queries)
+    console.print(
+        f"[bold blue]Benchmarking on {len(corpus)} vectors x {corpus.shape[1]} dims, "
+        f"{len(queries)} queries[/]"
+    )
+    
+    results = asyncio.run(run_benchmark(
+        corpus,
+        queries,
+        names=stores.split(",") if stores else None,
+        k=k,
+        concurrency_levels=tuple(int(level) for level in concurrency.split(",")),
+        save=save
+    ))
+    
+    table = Table(title="Vector Store Benchmark")
+    table.add_column("Store", style="cyan")
+    table.add_column("Ingest (vec/s)", style="green")
+    table.add_column(f"Recall@{k}", style="green")
+    table.add_column("p50 (ms)", style="yellow")
+    table.add_column("p99 (ms)", style="yellow")
+    table.add_column("Max QPS", style="magenta")
+    
+    for result in results:
+        metrics = result["metrics"]
+        table.add_row(
+            result["name"],
+            f"{metrics['ingest_vectors_per_s']:.0f}",
+            f"{metrics[f'recall_at_{k}']:.3f}",
+            f"{metrics['p50_ms']:.2f}",
+            f"{metrics['p99_ms']:.2f}",
+            f"{metrics['max_qps']:.0f}"
+        )
+    
+    console.print(table)
+
+@app.command()
+def ingest(
+    source: str = typer.Argument(..., help="JSONL or Parquet file to load"),
+    file_format: Optional[str] = typer.Option(
+        None, "--format", help="jsonl or parquet (default: from the extension)"
+    ),
+    text_field: str = typer.Option("text", help="Field holding the text to embed"),
+    id_field: Optional[str] = typer.Option(None, help="Field holding the vector ID"),
+    vector_field: Optional[str] = typer.Option(None, help="Field holding precomputed vectors"),
+    batch_size: int = typer.Option(1000, help="Records per chunk"),
+    queue_size: int = typer.Option(4, help="Chunks buffered between reading and embedding"),
+    embed_concurrency: int = typer.Option(4, help="Chunks embedded concurrently"),
+    checkpoint: Optional[str] = typer.Option(
+        None, help="Checkpoint file (default: <source>.checkpoint)"
+    ),
+    checkpoint_every: int = typer.Option(10000, help="Minimum rows between checkpoints"),
+    checkpoint_growth: float = typer.Option(
+        0.5, help="Grow the interval to this fraction of the rows written (0 for fixed)"
+    ),
+    resume: bool = typer.Option(True, help="Resume from the checkpoint if one exists"),
+):
+    """Stream a JSONL or Parquet corpus into the configured vector store."""
+    from evalkit.config import get_vector_store_config
+    from evalkit.embed.factory import create_embedder
+    from evalkit.vector.factory import create_vector_store
+    from evalkit.vector.ingest import IngestPipeline
+    
+    async def run_ingest():
+        store = create_vector_store()
+        await store.initialize(get_vector_store_config())
+        embedder = None if vector_field else create_embedder()
+        pipeline = IngestPipeline(
+            store,
+            embedder,
+            text_field=text_field,
+            id_field=id_field,
+            vector_field=vector_field,
+            batch_size=batch_size,
+            queue_size=queue_size,
+            embed_concurrency=embed_concurrency,
+            checkpoint_path=checkpoint or f"{source}.checkpoint",
+            checkpoint_every=checkpoint_every,
+            checkpoint_growth=checkpoint_growth
+        )
+        
+        try:
+            with Progress() as progress:
+                task = progress.add_task("[cyan]Ingesting...", total=None)
+                
+                def report(counters):
+                    progress.update(
+                        task,
+                        completed=counters["rows"],
+                        description=f"[cyan]Ingesting ({counters['rows_per_s']:.0f} rows/s)"
+                    )
+                
+                return await pipeline.run(source, file_format, resume=resume, on_progress=report)
+        finally:
+            if embedder is not None:
+                await embedder.close()
+            close = getattr(store, "close", None)
+            if close is not None:
+                await close()
+    
+    result = asyncio.run(run_ingest())
+    console.print(
+        f"[bold green]Ingested {result['rows']} rows "
+        f"({result['skipped']} skipped, {result['rows_per_s']:.0f} rows/s)[/]"
+    )
+
+@app.command("eval-retrieval")
+def eval_retrieval(
+    dataset: str = typer.Argument(..., help="Golden dataset with relevance labels"),
+    k: int = typer.Option(10, help="Number of results to score per query"),
+    save: bool = typer.Option(True, help="Store per-query results in the retrieval_results table"),
+):
+    """Score retrieval quality of the configured vector store on a golden dataset."""
+    from evalkit.config import get_vector_store_config
+    from evalkit.embed.factory import create_embedder
+    from evalkit.eval.retrieval import RetrievalEvaluator
+    from evalkit.vector.factory import create_vector_store
+    
+    async def run_eval():
+        store = create_vector_store()
+        await store.initialize(get_vector_store_config())
+        embedder = create_embedder()
+        try:
+            return await RetrievalEvaluator(store, embedder).evaluate(dataset, k=k, save=save)
+        finally:
+            await embedder.close()
+            close = getattr(store, "close", None)
+            if close is not None:
+                await close()
+    
+    result = asyncio.run(run_eval())
+    
+    table = Table(title=f"Retrieval Metrics ({dataset}, {result['num_queries']} queries)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    for name in (
+        f"recall_at_{k}", f"precision_at_{k}", f"hit_rate_at_{k}", "reciprocal_rank", f"ndcg_at_{k}"
+    ):
+        table.add_row(name, f"{result[name]:.3f}")
+    
+    console.print(table)
+
 if __name__ == "__main__":
-    app() 
\ No newline at end of file
+    app()
\ No newline at end of file
@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./evalkit.db"
     DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500
     
     # Vector Store
     DEFAULT_VECTOR_STORE: str = "faiss"
@@ -23,6 +29,21 @@ class Settings(BaseSettings):
     
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # Any OpenAI-compatible endpoint, e.g. a local mock
+    
+    # Scoring
+    SCORING_CONCURRENCY: int = 16
+    SCORING_REQUESTS_PER_MINUTE: Optional[int] = None
+    SCORING_TOKENS_PER_MINUTE: Optional[int] = None
+    SCORING_REQUEST_BURST: Optional[int] = None  # Bucket capacity; one second's worth if unset
+    SCORING_TOKEN_BURST: Optional[int] = None
+    SCORING_TIMEOUT: float = 60.0  # Seconds per scorer call
+    SCORING_MAX_RETRIES: int = 5
+    SCORING_BATCH_SIZE: int = 1  # Items per judge request; 1 scores each item on its own
+    SCORING_BATCH_MAX_TOKENS: int = 8000
+    JUDGE_CACHE_PATH: Optional[str] = "data/judge_cache.sqlite"  # None disables the cache
+    JUDGE_CACHE_MAX_ENTRIES: Optional[int] = 1_000_000
+    JUDGE_CACHE_MAX_AGE: Optional[float] = 30 * 24 * 3600  # Seconds
     
     # Metrics
     ENABLE_METRICS: bool = True
@@ -37,4 +58,4 @@ def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
 
-settings = get_settings() 
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -7,7 +7,7 @@ import asyncio
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from evalkit.db.database import get_db
+from evalkit.db.database import db_session, engine
 from evalkit.db.models import Interaction, Evaluation, GoldenDataset
 from evalkit.core.config import settings
 
@@ -19,7 +19,7 @@ st.set_page_config(
 
 async def get_metrics_data(days: int = 7):
     """Fetch metrics data from database."""
-    async with get_db() as db:
+    async with db_session() as db:
         # Get interaction counts
         interactions = await db.execute(
             select(Interaction)
@@ -33,8 +33,11 @@ async def get_metrics_data(days: int = 7):
             .where(Evaluation.created_at >= datetime.utcnow() - timedelta(days=days))
         )
         evaluations = evaluations.scalars().all()
-        
-        return interactions, evaluations
+    
+    # Each Streamlit rerun uses a new event loop, and pooled connections
+    # cannot outlive the loop that opened them
+    await engine.dispose()
+    return interactions, evaluations
 
 def create_metrics_dashboard():
     """Create the main metrics dashboard."""
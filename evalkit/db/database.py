@@ -1,17 +1,55 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from evalkit.core.config import settings
 
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """Return pool and driver options for the database backend."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {"poolclass": NullPool}  # Disable connection pooling for SQLite
+    
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "asyncpg":
+        # Prepared statements are cached per pooled connection, so repeated
+        # searches and listings skip parsing and planning; set to 0 behind
+        # pgbouncer in transaction mode
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
-    poolclass=NullPool,  # Disable connection pooling for SQLite
+    **_engine_options(settings.DATABASE_URL),
 )
 
+if make_url(settings.DATABASE_URL).get_driver_name() == "asyncpg":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_vector_codec(dbapi_connection: Any, connection_record: Any) -> None:
+        """Exchange pgvector values as binary NumPy arrays on new connections."""
+        from pgvector.asyncpg import register_vector
+        
+        try:
+            dbapi_connection.run_async(register_vector)
+        except ValueError:
+            # The vector extension is not installed yet; PGVectorStore.initialize
+            # creates it and then resets the pool
+            pass
+
 # Create async session factory
 async_session_factory = sessionmaker(
     engine,
@@ -19,8 +57,12 @@ async_session_factory = sessionmaker(
     expire_on_commit=False,
 )
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database sessions."""
+@asynccontextmanager
+async def db_session() -> AsyncIterator[AsyncSession]:
+    """Open a session that commits on success and rolls back on error.
+    
+    For code outside FastAPI: ``async with db_session() as db: ...``.
+    """
     async with async_session_factory() as session:
         try:
             yield session
@@ -28,5 +70,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close() 
\ No newline at end of file
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database sessions."""
+    async with db_session() as session:
+        yield session
\ No newline at end of file
@@ -8,7 +8,7 @@ Base = declarative_base()
 class Interaction(Base):
     """Model for storing user interactions with LLM features."""
     __tablename__ = "interactions"
-
+    
     id = Column(Integer, primary_key=True)
     query = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
@@ -22,7 +22,7 @@ class Interaction(Base):
 class Evaluation(Base):
     """Model for storing evaluations of interactions."""
     __tablename__ = "evaluations"
-
+    
     id = Column(Integer, primary_key=True)
     interaction_id = Column(Integer, ForeignKey("interactions.id"), nullable=False)
     evaluator_type = Column(String(50), nullable=False)  # "human", "gpt-4", etc.
@@ -35,23 +35,37 @@ class Evaluation(Base):
 class GoldenDataset(Base):
     """Model for storing golden dataset entries."""
     __tablename__ = "golden_datasets"
-
+    
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     query = Column(Text, nullable=False)
     expected_response = Column(Text, nullable=False)
+    relevance_labels = Column(JSON, nullable=False, default=dict)  # document ID -> graded relevance
     metadata = Column(JSON, nullable=False, default=dict)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class RetrievalResult(Base):
+    """Model for storing one golden query's retrieval results and metrics."""
+    __tablename__ = "retrieval_results"
+    
+    id = Column(Integer, primary_key=True)
+    golden_dataset = Column(String(100), nullable=False)
+    golden_entry_id = Column(Integer, ForeignKey("golden_datasets.id"), nullable=False)
+    k = Column(Integer, nullable=False)
+    retrieved_ids = Column(JSON, nullable=False, default=list)
+    score = Column(Float, nullable=False)  # nDCG@k, 0 for queries without relevant labels
+    metrics = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
 class VectorStore(Base):
     """Model for storing vector store configurations and benchmarks."""
     __tablename__ = "vector_stores"
-
+    
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     type = Column(String(50), nullable=False)  # "faiss", "qdrant", "pgvector"
     config = Column(JSON, nullable=False, default=dict)
     metrics = Column(JSON, nullable=False, default=dict)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List
+import numpy as np
+
+class Embedder(ABC):
+    """Base class for text embedding backends."""
+    
+    model: str
+    dimension: int
+    
+    @property
+    def cache_key(self) -> str:
+        """Identifies the vector space; embeddings are only reused under the same key."""
+        return f"{self.model}:{self.dimension}"
+    
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` into a ``(len(texts), dimension)`` float32 matrix."""
+        pass
+    
+    async def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text."""
+        return (await self.embed([text]))[0]
+    
+    async def close(self) -> None:
+        """Release any resources held by the embedder."""
+        pass
\ No newline at end of file
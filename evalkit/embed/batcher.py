@@ -0,0 +1,97 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+import numpy as np
+
+from .base import Embedder
+
+class BatchingEmbedder(Embedder):
+    """Embedder decorator that coalesces concurrent requests into batches.
+    
+    Texts from every caller are queued and sent to the wrapped embedder once
+    ``max_batch_size`` texts are waiting or ``max_wait`` seconds after the
+    first one arrived, whichever comes first. Up to ``max_concurrent_batches``
+    batches are in flight at a time.
+    """
+    
+    def __init__(
+        self,
+        embedder: Embedder,
+        max_batch_size: int = 256,
+        max_wait: float = 0.005,
+        max_concurrent_batches: int = 4
+    ):
+        self.embedder = embedder
+        self.model = embedder.model
+        self.dimension = embedder.dimension
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrent_batches = max_concurrent_batches
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.texts = 0
+    
+    @property
+    def cache_key(self) -> str:
+        return self.embedder.cache_key
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Queue ``texts`` for the next batches and wait for their vectors."""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+        
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        
+        return np.stack(await asyncio.gather(*futures))
+    
+    def _flush(self) -> None:
+        """Send the queued texts to the wrapped embedder as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+        
+        async with self._semaphore:
+            try:
+                vectors = await self.embedder.embed([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        
+        self.batches += 1
+        self.texts += len(batch)
+        for (_, future), vector in zip(batch, vectors):
+            # Callers may have been cancelled while the batch ran
+            if not future.done():
+                future.set_result(vector)
+    
+    async def close(self) -> None:
+        """Finish queued batches and close the wrapped embedder."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.embedder.close()
\ No newline at end of file
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+
+from .base import Embedder
+
+# SQLite's default limit on bound parameters per statement is 999
+_LOOKUP_CHUNK = 900
+
+def text_hash(text: str) -> bytes:
+    """Content hash that keys cached embeddings."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+class EmbeddingCache:
+    """On-disk embedding store keyed by ``(model, text hash)``.
+    
+    Vectors are stored as raw float32 blobs in a SQLite file in WAL mode, so
+    several processes can share one cache. Calls block; :class:`CachedEmbedder`
+    runs them in a worker thread.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+    
+    def get_many(self, model: str, hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the cached vectors among ``hashes``."""
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(hashes), _LOOKUP_CHUNK):
+                chunk = hashes[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"""
+                    SELECT text_hash, vector FROM embeddings
+                    WHERE model = ? AND text_hash IN ({",".join("?" * len(chunk))})
+                    """,
+                    [model, *chunk]
+                ).fetchall()
+                for hash_, blob in rows:
+                    found[hash_] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def put_many(self, model: str, hashes: List[bytes], vectors: np.ndarray) -> None:
+        """Store one vector per hash."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO embeddings (model, text_hash, dimension, vector, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (model, hash_, vectors.shape[1], vector.tobytes(), now)
+                    for hash_, vector in zip(hashes, vectors)
+                ]
+            )
+            self._conn.commit()
+    
+    def count(self, model: Optional[str] = None) -> int:
+        """Number of cached vectors, optionally for one model."""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)
+            ).fetchone()[0]
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class CachedEmbedder(Embedder):
+    """Embedder decorator that only embeds texts missing from an :class:`EmbeddingCache`.
+    
+    Lookups are keyed by the wrapped embedder's ``cache_key`` (model and
+    dimension) and a SHA-256 of the text; duplicate texts within a call are
+    embedded once.
+    """
+    
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder.model
+        self.dimension = embedder.dimension
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def cache_key(self) -> str:
+        return self.embedder.cache_key
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts``, reading and filling the cache."""
+        hashes = [text_hash(text) for text in texts]
+        unique = list(dict.fromkeys(hashes))
+        found = await asyncio.to_thread(self.cache.get_many, self.cache_key, unique)
+        
+        missing: Dict[bytes, str] = {}
+        for hash_, text in zip(hashes, texts):
+            if hash_ not in found:
+                missing.setdefault(hash_, text)
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+        
+        if missing:
+            missing_hashes = list(missing)
+            vectors = await self.embedder.embed(list(missing.values()))
+            await asyncio.to_thread(
+                self.cache.put_many, self.cache_key, missing_hashes, vectors
+            )
+            found.update(zip(missing_hashes, np.asarray(vectors, dtype=np.float32)))
+        
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, hash_ in enumerate(hashes):
+            result[row] = found[hash_]
+        return result
+    
+    async def close(self) -> None:
+        """Close the wrapped embedder and the cache."""
+        await self.embedder.close()
+        self.cache.close()
\ No newline at end of file
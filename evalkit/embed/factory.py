@@ -0,0 +1,34 @@
+from evalkit.embed.base import Embedder
+from evalkit.embed.batcher import BatchingEmbedder
+from evalkit.embed.cache import CachedEmbedder, EmbeddingCache
+from evalkit.embed.hash_embedder import HashEmbedder
+from evalkit.embed.openai_embedder import OpenAIEmbedder
+from evalkit.config import settings
+
+def create_embedder() -> Embedder:
+    """Create an embedder based on configuration.
+    
+    Requests are micro-batched, and with ``EMBEDDING_CACHE_PATH`` set the
+    cache sits in front of the batcher so only uncached texts are queued.
+    """
+    dimension = settings.EMBEDDING_DIMENSION or settings.VECTOR_DIMENSION
+    if settings.EMBEDDING_BACKEND == "hash":
+        embedder: Embedder = HashEmbedder(dimension=dimension)
+    elif settings.EMBEDDING_BACKEND == "openai":
+        embedder = OpenAIEmbedder(
+            model=settings.EMBEDDING_MODEL,
+            dimension=dimension,
+            api_key=settings.OPENAI_API_KEY,
+            reduce_dimension=settings.EMBEDDING_DIMENSION is not None
+        )
+    else:
+        raise ValueError(f"Unsupported embedding backend: {settings.EMBEDDING_BACKEND}")
+    
+    embedder = BatchingEmbedder(
+        embedder,
+        max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+        max_wait=settings.EMBEDDING_BATCH_WAIT
+    )
+    if settings.EMBEDDING_CACHE_PATH:
+        embedder = CachedEmbedder(embedder, EmbeddingCache(settings.EMBEDDING_CACHE_PATH))
+    return embedder
\ No newline at end of file
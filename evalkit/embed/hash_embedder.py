@@ -0,0 +1,41 @@
+import hashlib
+from typing import List, Tuple
+import numpy as np
+
+from evalkit.vector.lexical import tokenize
+from .base import Embedder
+
+class HashEmbedder(Embedder):
+    """Deterministic local embedder based on feature hashing.
+    
+    Each term is hashed to a signed position in the output vector and the
+    result is L2-normalized, so texts sharing terms land close together.
+    No model or network is involved, which makes it suitable for tests and
+    offline runs; the vectors carry no semantics beyond term overlap.
+    """
+    
+    def __init__(self, dimension: int = 256, model: str = "hash-v1"):
+        self.model = model
+        self.dimension = dimension
+    
+    def _position(self, term: str) -> Tuple[int, float]:
+        """Index and sign of ``term`` in the output vector."""
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimension, 1.0 if value >> 63 else -1.0
+    
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` without an event loop."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in tokenize(text):
+                index, sign = self._position(term)
+                vectors[row, index] += sign
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` by hashing their terms."""
+        return self.embed_sync(texts)
\ No newline at end of file
@@ -0,0 +1,45 @@
+from typing import List, Optional
+import numpy as np
+from openai import AsyncOpenAI
+
+from .base import Embedder
+
+# Inputs accepted by one embeddings request
+MAX_INPUTS_PER_REQUEST = 2048
+
+class OpenAIEmbedder(Embedder):
+    """Embedder backed by the OpenAI embeddings API.
+    
+    ``reduce_dimension`` asks the API to shorten vectors to ``dimension``,
+    which only ``text-embedding-3`` models support.
+    """
+    
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        dimension: int = 1536,
+        api_key: Optional[str] = None,
+        reduce_dimension: bool = False
+    ):
+        self.model = model
+        self.dimension = dimension
+        self.reduce_dimension = reduce_dimension
+        self.client = AsyncOpenAI(api_key=api_key)
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts``, splitting them into requests of at most 2048 inputs."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        extra = {"dimensions": self.dimension} if self.reduce_dimension else {}
+        for start in range(0, len(texts), MAX_INPUTS_PER_REQUEST):
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + MAX_INPUTS_PER_REQUEST],
+                **extra
+            )
+            for item in response.data:
+                vectors[start + item.index] = item.embedding
+        return vectors
+    
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self.client.close()
\ No newline at end of file
@@ -0,0 +1,287 @@
+import asyncio
+import random
+import time
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from evalkit.eval.scorer import Scorer
+from evalkit.metrics.collector import MetricsCollector
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status carried by an API error, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` is transient: a timeout, a dropped connection, 429 or 5xx."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    # openai's connection and timeout errors carry no status
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+def _retry_after(error: BaseException) -> float:
+    """Seconds the server asked us to wait, from a ``Retry-After`` header."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return 0.0
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate_per_minute``.
+    
+    Holds at most ``capacity`` tokens, one second's worth (and at least one)
+    by default, and starts full, so a run opens with at most that burst
+    instead of a minute's quota at once. Waiters are served in arrival
+    order, so one large request cannot be starved by a stream of small
+    ones; requests larger than the capacity wait for a full bucket and
+    leave it in debt.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` tokens are available and take them."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        needed = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < needed:
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+class ScoringEngine:
+    """Runs scorer calls concurrently under rate limits.
+    
+    At most ``concurrency`` calls are in flight. With ``requests_per_minute``
+    or ``tokens_per_minute`` set, each attempt first takes one request and
+    the scorer's token estimate from the matching :class:`TokenBucket`,
+    whose capacity is ``request_burst`` or ``token_burst`` if given.
+    Every attempt is cut off after ``timeout`` seconds; timeouts, connection
+    errors, 429s and 5xxs are retried up to ``max_retries`` times with full
+    jitter exponential backoff (at least any ``Retry-After`` the server
+    sent). Items that still fail get the scorer's error result, so one bad
+    item never aborts a run. Results the scorer can serve from its cache
+    (see :meth:`Scorer.lookup`) are returned without touching the limits.
+    
+    With ``batch_size`` above one, uncached items are packed into
+    :meth:`Scorer.score_batch` requests of at most ``batch_size`` items and
+    ``batch_max_tokens`` estimated tokens, so the rubric is sent once per
+    batch. A batch request gets ``timeout`` seconds per item it carries.
+    """
+    
+    def __init__(
+        self,
+        scorer: Scorer,
+        concurrency: int = 16,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        request_burst: Optional[float] = None,
+        token_burst: Optional[float] = None,
+        timeout: Optional[float] = 60.0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        batch_size: int = 1,
+        batch_max_tokens: int = 8000
+    ):
+        self.scorer = scorer
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.batch_size = batch_size
+        self.batch_max_tokens = batch_max_tokens
+        self.request_bucket = (
+            TokenBucket(requests_per_minute, request_burst) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute, token_burst) if tokens_per_minute else None
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.cached = 0
+        self.split_retries = 0
+    
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, min(_retry_after(error), self.backoff_max))
+    
+    async def _call(
+        self,
+        make_call: Callable[[], Awaitable[Any]],
+        tokens: int,
+        timeout: Optional[float]
+    ) -> Tuple[Any, Optional[BaseException]]:
+        """Run a scorer call under the limits, retrying transient failures.
+        
+        Returns ``(result, None)``, or ``(None, error)`` once retries run out.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                if self.request_bucket is not None:
+                    await self.request_bucket.acquire(1)
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire(tokens)
+                self.requests += 1
+                try:
+                    return await asyncio.wait_for(make_call(), timeout), None
+                except Exception as e:
+                    if attempt < self.max_retries and is_retryable(e):
+                        self.retries += 1
+                        await asyncio.sleep(self._backoff(attempt, e))
+                        continue
+                    return None, e
+    
+    def _record(self, count: int, start: float, error: Optional[BaseException] = None) -> None:
+        status = "success" if error is None else "error"
+        for _ in range(count):
+            MetricsCollector.record_evaluation(self.scorer.model, status=status)
+        if error is None:
+            MetricsCollector.record_latency("score", time.perf_counter() - start)
+        else:
+            self.failures += count
+    
+    async def _score_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result, error = await self._call(
+            lambda: self.scorer.score(**item, raise_errors=True),
+            self.scorer.estimate_tokens(**item),
+            self.timeout
+        )
+        self._record(1, start, error)
+        return self.scorer.error_result(error) if error is not None else result
+    
+    async def _score_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score ``batch`` in one request, splitting and retrying items the reply left unparsed.
+        
+        Unparsed items are halved into new batches until a single item is
+        left, which is scored with a regular ``score`` call.
+        """
+        if len(batch) == 1:
+            return [await self._score_item(batch[0])]
+        
+        start = time.perf_counter()
+        results, error = await self._call(
+            lambda: self.scorer.score_batch(batch, raise_errors=True),
+            self.scorer.estimate_batch_tokens(batch),
+            self.timeout * len(batch) if self.timeout else None
+        )
+        if error is not None:
+            self._record(len(batch), start, error)
+            return [self.scorer.error_result(error) for _ in batch]
+        
+        failed = [index for index, result in enumerate(results) if result is None]
+        self._record(len(batch) - len(failed), start)
+        if len(failed) == 1:
+            results[failed[0]] = await self._score_item(batch[failed[0]])
+        elif failed:
+            self.split_retries += 1
+            half = len(failed) // 2
+            parts = await asyncio.gather(
+                self._score_batch([batch[index] for index in failed[:half]]),
+                self._score_batch([batch[index] for index in failed[half:]])
+            )
+            for index, result in zip(failed, parts[0] + parts[1]):
+                results[index] = result
+        return results
+    
+    def _pack(self, items: List[Dict[str, Any]], indices: List[int]) -> List[List[int]]:
+        """Group ``indices`` greedily into batches within the size and token budget."""
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        for index in indices:
+            candidate = batch + [index]
+            if batch and (
+                len(candidate) > self.batch_size
+                or self.scorer.estimate_batch_tokens([items[i] for i in candidate])
+                > self.batch_max_tokens
+            ):
+                batches.append(batch)
+                candidate = [index]
+            batch = candidate
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def score_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Score one item, given as ``query``/``response``/``expected_response``/``context``."""
+        # Cached results skip the rate limits and the concurrency slot
+        cached = await self.scorer.lookup(**item)
+        if cached is not None:
+            self.cached += 1
+            return cached
+        return await self._score_item(item)
+    
+    async def score_many(
+        self,
+        items: List[Dict[str, Any]],
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """Score ``items`` concurrently and return their results in input order.
+        
+        ``on_result`` is called with each item's index and result as soon as
+        it finishes.
+        """
+        if self.batch_size <= 1:
+            async def run(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+                result = await self.score_one(item)
+                if on_result is not None:
+                    on_result(index, result)
+                return result
+            
+            return list(await asyncio.gather(*(run(i, item) for i, item in enumerate(items))))
+        
+        results: List[Optional[Dict[str, Any]]] = list(
+            await asyncio.gather(*(self.scorer.lookup(**item, batch=True) for item in items))
+        )
+        pending = [index for index, result in enumerate(results) if result is None]
+        self.cached += len(items) - len(pending)
+        if on_result is not None:
+            for index, result in enumerate(results):
+                if result is not None:
+                    on_result(index, result)
+        
+        async def run_batch(indices: List[int]) -> None:
+            for index, result in zip(indices, await self._score_batch([items[i] for i in indices])):
+                results[index] = result
+                if on_result is not None:
+                    on_result(index, result)
+        
+        await asyncio.gather(*(run_batch(batch) for batch in self._pack(items, pending)))
+        return results
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Counters for requests, retries, failed items, cache hits and batch splits."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "cached": self.cached,
+            "split_retries": self.split_retries
+        }
\ No newline at end of file
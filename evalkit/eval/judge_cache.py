@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set
+
+from evalkit.eval.scorer import Scorer
+from evalkit.metrics.collector import MetricsCollector
+
+# Writes between eviction passes
+_EVICT_EVERY = 256
+
+def judge_key(
+    model: str,
+    temperature: float,
+    prompt_version: str,
+    query: str,
+    response: str,
+    expected_response: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """Content hash of everything that determines a judge's verdict."""
+    payload = json.dumps(
+        [model, temperature, prompt_version, query, response, expected_response, context],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+class JudgeCache:
+    """On-disk store of judge results keyed by :func:`judge_key`.
+    
+    Results are JSON in a SQLite file in WAL mode. Entries older than
+    ``max_age`` seconds are neither returned nor kept, and past
+    ``max_entries`` the least recently used entries are evicted. Calls block;
+    :class:`CachedScorer` runs them in a worker thread.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS judgments (
+                key BLOB PRIMARY KEY,
+                model TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS judgments_accessed_at_idx ON judgments (accessed_at)"
+        )
+        self._conn.commit()
+        self.evict()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, if present and fresh."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM judgments WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                return None
+            self._conn.execute("UPDATE judgments SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+    
+    def put(self, key: bytes, model: str, result: Dict[str, Any]) -> None:
+        """Store ``result`` under ``key``."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO judgments (key, model, result, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, model, json.dumps(result), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            evict = self._writes % _EVICT_EVERY == 0
+        if evict:
+            self.evict()
+    
+    def evict(self) -> int:
+        """Drop expired entries and trim to ``max_entries``; returns the number removed."""
+        removed = 0
+        with self._lock:
+            if self.max_age is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM judgments WHERE created_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+            if self.max_entries is not None:
+                excess = self._count() - self.max_entries
+                if excess > 0:
+                    removed += self._conn.execute(
+                        """
+                        DELETE FROM judgments WHERE key IN (
+                            SELECT key FROM judgments ORDER BY accessed_at LIMIT ?
+                        )
+                        """,
+                        (excess,)
+                    ).rowcount
+            self._conn.commit()
+        return removed
+    
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+    
+    def count(self) -> int:
+        """Number of cached results."""
+        with self._lock:
+            return self._count()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class CachedScorer(Scorer):
+    """Scorer decorator that serves repeated judgments from a :class:`JudgeCache`.
+    
+    Keys cover the model, temperature, prompt template version and every
+    input, so changing any of them re-scores. Items judged in a batch are
+    keyed apart from items judged alone, as the prompts differ, by adding
+    ``:batch`` to the prompt version; a single-item lookup never returns a
+    batch result. Error results are never cached. Hits and misses are
+    counted here and in :class:`MetricsCollector`.
+    """
+    
+    def __init__(self, scorer: Scorer, cache: JudgeCache):
+        self.scorer = scorer
+        self.cache = cache
+        self.model = scorer.model
+        self.temperature = scorer.temperature
+        self.prompt_version = scorer.prompt_version
+        self.hits = 0
+        self.misses = 0
+        self._known_misses: Set[bytes] = set()
+    
+    def _key(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str],
+        context: Optional[Dict[str, Any]],
+        batch: bool = False
+    ) -> bytes:
+        return judge_key(
+            self.model,
+            self.temperature,
+            f"{self.prompt_version}:batch" if batch else self.prompt_version,
+            query,
+            response,
+            expected_response,
+            context
+        )
+    
+    async def lookup(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        batch: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached result for these inputs, counting the hit or miss.
+        
+        A ``batch`` lookup falls back to a result judged alone, which is how
+        the engine scores items left over from batches.
+        """
+        keys = [self._key(query, response, expected_response, context, batch)]
+        if batch:
+            keys.append(self._key(query, response, expected_response, context))
+        result = None
+        for key in keys:
+            result = await asyncio.to_thread(self.cache.get, key)
+            if result is not None:
+                break
+        if result is None:
+            # Both keys are known misses, so scoring the item alone after an
+            # unparsed batch reply does not count it again
+            self.misses += 1
+            self._known_misses.update(keys)
+            MetricsCollector.record_judge_cache("miss")
+        else:
+            self.hits += 1
+            MetricsCollector.record_judge_cache("hit")
+        return result
+    
+    async def score(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        """Return the cached result, or score with the wrapped scorer and cache it."""
+        key = self._key(query, response, expected_response, context)
+        # A miss already reported by lookup() is not read or counted again,
+        # including when the caller retries a failed attempt
+        if key not in self._known_misses:
+            cached = await self.lookup(query, response, expected_response, context)
+            if cached is not None:
+                return cached
+        
+        result = await self.scorer.score(
+            query, response, expected_response, context, raise_errors=raise_errors
+        )
+        self._known_misses.discard(key)
+        if "error" not in result:
+            await asyncio.to_thread(self.cache.put, key, self.model, result)
+        return result
+    
+    async def score_batch(
+        self,
+        items: List[Dict[str, Any]],
+        raise_errors: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Serve cached items and send only the rest to the wrapped scorer's batch call."""
+        keys = [
+            self._key(
+                item["query"],
+                item["response"],
+                item.get("expected_response"),
+                item.get("context"),
+                batch=True
+            )
+            for item in items
+        ]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for index, (key, item) in enumerate(zip(keys, items)):
+            if key not in self._known_misses:
+                results[index] = await self.lookup(**item, batch=True)
+        
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        scored = await self.scorer.score_batch(
+            [items[index] for index in missing], raise_errors=raise_errors
+        )
+        for index, result in zip(missing, scored):
+            results[index] = result
+            # Unparsed items stay known misses, as the caller retries them
+            if result is None:
+                continue
+            item = items[index]
+            self._known_misses.discard(keys[index])
+            self._known_misses.discard(self._key(
+                item["query"], item["response"], item.get("expected_response"), item.get("context")
+            ))
+            if "error" not in result:
+                await asyncio.to_thread(self.cache.put, keys[index], self.model, result)
+        return results
+    
+    def estimate_tokens(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        return self.scorer.estimate_tokens(query, response, expected_response, context)
+    
+    def estimate_batch_tokens(self, items: List[Dict[str, Any]]) -> int:
+        return self.scorer.estimate_batch_tokens(items)
+    
+    async def close(self) -> None:
+        """Close the wrapped scorer and the cache."""
+        await self.scorer.close()
+        self.cache.close()
\ No newline at end of file
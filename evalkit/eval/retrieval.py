@@ -0,0 +1,180 @@
+from typing import Dict, Any, List, Optional
+import numpy as np
+from sqlalchemy import select
+
+from evalkit.db.database import db_session
+from evalkit.db.models import GoldenDataset, RetrievalResult
+from evalkit.embed.base import Embedder
+from evalkit.vector.base import VectorStore
+
+def _gain_matrix(
+    found_ids: np.ndarray,
+    relevance: List[Dict[str, float]]
+) -> np.ndarray:
+    """Relevance grade of every retrieved ID, shaped like ``found_ids``.
+    
+    Retrieved and labelled IDs are encoded into one vocabulary so each
+    (query, document) pair becomes a single integer, and the lookup is a
+    ``searchsorted`` over the sorted label codes.
+    """
+    n_queries, k = found_ids.shape
+    if not any(relevance):
+        return np.zeros((n_queries, k), dtype=np.float64)
+    
+    label_queries = np.repeat(np.arange(n_queries), [len(labels) for labels in relevance])
+    label_ids = np.array([str(id_) for labels in relevance for id_ in labels], dtype=object)
+    label_grades = np.array(
+        [grade for labels in relevance for grade in labels.values()], dtype=np.float64
+    )
+    
+    # Empty slots get an ID no document can have
+    found = np.where(found_ids == None, "\0", found_ids).astype(str)  # noqa: E711
+    vocabulary, codes = np.unique(
+        np.concatenate([found.ravel(), label_ids.astype(str)]), return_inverse=True
+    )
+    found_codes = codes[:found.size].reshape(n_queries, k)
+    label_codes = codes[found.size:]
+    
+    label_keys = label_queries * len(vocabulary) + label_codes
+    order = np.argsort(label_keys)
+    label_keys, label_grades = label_keys[order], label_grades[order]
+    
+    found_keys = np.arange(n_queries)[:, None] * len(vocabulary) + found_codes
+    positions = np.minimum(np.searchsorted(label_keys, found_keys), len(label_keys) - 1)
+    return np.where(label_keys[positions] == found_keys, label_grades[positions], 0.0)
+
+def _ideal_gains(relevance: List[Dict[str, float]], k: int) -> np.ndarray:
+    """Each query's top ``k`` grades in descending order, zero-padded."""
+    n_queries = len(relevance)
+    counts = np.array([len(labels) for labels in relevance], dtype=np.int64)
+    label_queries = np.repeat(np.arange(n_queries), counts)
+    grades = np.array(
+        [grade for labels in relevance for grade in labels.values()], dtype=np.float64
+    )
+    
+    # Sort by query, then by grade descending, and rank labels within their query
+    order = np.lexsort((-grades, label_queries))
+    label_queries, grades = label_queries[order], grades[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(len(grades)) - np.repeat(starts, counts)
+    
+    ideal = np.zeros((n_queries, k), dtype=np.float64)
+    keep = ranks < k
+    ideal[label_queries[keep], ranks[keep]] = grades[keep]
+    return ideal
+
+def retrieval_metrics(
+    found_ids: np.ndarray,
+    relevance: List[Dict[str, float]],
+    k: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Per-query retrieval metrics for a ``(n_queries, k)`` matrix of ranked IDs.
+    
+    ``relevance`` holds one ``{document ID: grade}`` mapping per query;
+    grades above zero count as relevant. Returns arrays of recall@k,
+    precision@k, hit rate, reciprocal rank and nDCG@k (with exponential
+    gain ``2**grade - 1``). Recall and nDCG are NaN for queries without
+    relevant labels.
+    """
+    found_ids = np.asarray(found_ids, dtype=object)
+    if k is not None:
+        found_ids = found_ids[:, :k]
+    k = found_ids.shape[1]
+    
+    gains = _gain_matrix(found_ids, relevance)
+    relevant = gains > 0
+    hits = relevant.sum(axis=1)
+    num_relevant = np.array(
+        [sum(1 for grade in labels.values() if grade > 0) for labels in relevance],
+        dtype=np.float64
+    )
+    
+    ranks = np.arange(1, k + 1)
+    first_hit = np.where(relevant.any(axis=1), relevant.argmax(axis=1) + 1, np.inf)
+    
+    discounts = 1.0 / np.log2(ranks + 1)
+    dcg = ((2.0 ** gains - 1) * discounts).sum(axis=1)
+    ideal = ((2.0 ** _ideal_gains(relevance, k) - 1) * discounts).sum(axis=1)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            f"recall_at_{k}": np.where(num_relevant > 0, hits / num_relevant, np.nan),
+            f"precision_at_{k}": hits / k,
+            f"hit_rate_at_{k}": (hits > 0).astype(np.float64),
+            "reciprocal_rank": 1.0 / first_hit,
+            f"ndcg_at_{k}": np.where(ideal > 0, dcg / ideal, np.nan)
+        }
+
+class RetrievalEvaluator:
+    """Runs a labelled golden dataset through a vector store and scores retrieval.
+    
+    Every query is embedded and searched in one batch, metrics are computed
+    over the full result matrix, and each query's results and metrics are
+    stored as a :class:`RetrievalResult`. They are kept out of the
+    interactions table, which holds real traffic for the LLM judge and the
+    dashboard.
+    """
+    
+    def __init__(self, store: VectorStore, embedder: Embedder):
+        self.store = store
+        self.embedder = embedder
+    
+    async def evaluate(
+        self,
+        dataset: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        save: bool = True
+    ) -> Dict[str, Any]:
+        """Evaluate ``dataset`` at ``k`` and return the mean of each metric."""
+        async with db_session() as db:
+            result = await db.execute(
+                select(GoldenDataset)
+                .where(GoldenDataset.name == dataset)
+                .order_by(GoldenDataset.id)
+            )
+            entries = [entry for entry in result.scalars().all() if entry.relevance_labels]
+        if not entries:
+            raise ValueError(f"Golden dataset {dataset!r} has no entries with relevance labels")
+        
+        query_matrix = await self.embedder.embed([entry.query for entry in entries])
+        _, found_ids = await self.store.search_batch(query_matrix, k, filter_criteria)
+        relevance = [
+            {str(id_): float(grade) for id_, grade in entry.relevance_labels.items()}
+            for entry in entries
+        ]
+        metrics = retrieval_metrics(found_ids, relevance, k)
+        
+        if save:
+            await self._save(dataset, k, entries, found_ids, metrics)
+        
+        return {
+            "dataset": dataset,
+            "k": k,
+            "num_queries": len(entries),
+            **{name: float(np.nanmean(values)) for name, values in metrics.items()}
+        }
+    
+    async def _save(
+        self,
+        dataset: str,
+        k: int,
+        entries: List[GoldenDataset],
+        found_ids: np.ndarray,
+        metrics: Dict[str, np.ndarray]
+    ) -> None:
+        """Store one :class:`RetrievalResult` per golden entry."""
+        async with db_session() as db:
+            for row, entry in enumerate(entries):
+                values = {
+                    name: None if np.isnan(values[row]) else float(values[row])
+                    for name, values in metrics.items()
+                }
+                db.add(RetrievalResult(
+                    golden_dataset=dataset,
+                    golden_entry_id=entry.id,
+                    k=k,
+                    retrieved_ids=[id_ for id_ in found_ids[row].tolist() if id_ is not None],
+                    score=values[f"ndcg_at_{k}"] or 0.0,
+                    metrics=values
+                ))
\ No newline at end of file
@@ -1,40 +1,198 @@
+import asyncio
+import json
 from typing import Dict, Any, List, Optional
-import openai
+from openai import AsyncOpenAI
 from evalkit.core.config import settings
 
+# Criteria the judge scores, each between 0 and 1
+CRITERIA = ("relevance", "accuracy", "completeness", "clarity")
+
+RUBRIC = """Please evaluate the response on the following criteria:
+1. Relevance (0-1): How well does the response address the query?
+2. Accuracy (0-1): Is the information in the response factually correct?
+3. Completeness (0-1): Does the response cover all necessary aspects of the query?
+4. Clarity (0-1): Is the response clear and well-structured?
+"""
+
 class Scorer:
     """Base class for evaluation scorers."""
     
+    temperature = 0.0
+    # Bump whenever the prompt changes, so cached judgments are not reused
+    prompt_version = "1"
+    
     def __init__(self, model: str = "gpt-4"):
         self.model = model
         if model.startswith("gpt"):
             if not settings.OPENAI_API_KEY:
                 raise ValueError("OpenAI API key not set")
-            openai.api_key = settings.OPENAI_API_KEY
     
     async def score(
         self,
         query: str,
         response: str,
         expected_response: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False
     ) -> Dict[str, Any]:
-        """Score a query-response pair."""
+        """Score a query-response pair.
+        
+        Failures are returned as an error result unless ``raise_errors`` is
+        set, in which case they propagate so the caller can retry them.
+        """
         raise NotImplementedError
+    
+    async def lookup(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        batch: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Return a result available without calling the model, if any.
+        
+        ``batch`` marks a lookup for :meth:`score_batch`, whose results may
+        differ from those of :meth:`score`.
+        """
+        return None
+    
+    def estimate_tokens(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Rough number of tokens one ``score`` call consumes, for rate limiting."""
+        text = f"{query}{response}{expected_response or ''}{context or ''}"
+        return len(text) // 4 + 1
+    
+    async def score_batch(
+        self,
+        items: List[Dict[str, Any]],
+        raise_errors: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Score several items, given as ``score`` keyword arguments.
+        
+        The default makes one ``score`` call per item. Scorers that pack
+        items into a single request return ``None`` for items whose result
+        could not be parsed from the reply, so callers can retry them.
+        """
+        return list(await asyncio.gather(*(
+            self.score(**item, raise_errors=raise_errors) for item in items
+        )))
+    
+    def estimate_batch_tokens(self, items: List[Dict[str, Any]]) -> int:
+        """Rough number of tokens one ``score_batch`` call consumes."""
+        return sum(self.estimate_tokens(**item) for item in items)
+    
+    async def close(self) -> None:
+        """Release any client resources."""
+    
+    @staticmethod
+    def error_result(error: BaseException) -> Dict[str, Any]:
+        """Result recorded for an item that could not be scored."""
+        return {
+            "error": str(error) or type(error).__name__,
+            "scores": {criterion: 0.0 for criterion in CRITERIA},
+            "overall_score": 0.0,
+            "explanation": f"Error during evaluation: {str(error) or type(error).__name__}"
+        }
+
+def parse_evaluation(content: str) -> Dict[str, Any]:
+    """Parse the judge's JSON evaluation, tolerating surrounding prose or code fences.
+    
+    Scores are clamped to [0, 1], and the overall score defaults to the mean
+    of the criteria. Raises ``ValueError`` if no usable JSON object is found.
+    """
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError(f"No JSON object in evaluation: {content[:200]!r}")
+    data = json.loads(content[start:end + 1])
+    return _normalize_evaluation(data)
+
+def _normalize_evaluation(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict) or not isinstance(data.get("scores"), dict):
+        raise ValueError("Evaluation is missing its scores")
+    
+    scores = {
+        criterion: min(max(float(data["scores"][criterion]), 0.0), 1.0)
+        for criterion in CRITERIA
+    }
+    overall = data.get("overall_score")
+    overall = sum(scores.values()) / len(scores) if overall is None else float(overall)
+    return {
+        "scores": scores,
+        "overall_score": min(max(overall, 0.0), 1.0),
+        "explanation": str(data.get("explanation", ""))
+    }
+
+def parse_batch_evaluation(content: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """Parse the judge's JSON array of ``count`` per-item evaluations.
+    
+    Entries are matched to items by their 1-based ``item`` number, or by
+    position if they carry none. Items with a missing or malformed entry
+    come back as ``None``, as do all items if the array cannot be parsed.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    start, end = content.find("["), content.rfind("]")
+    if start == -1 or end < start:
+        return results
+    try:
+        entries = json.loads(content[start:end + 1])
+    except ValueError:
+        return results
+    if not isinstance(entries, list):
+        return results
+    
+    for position, entry in enumerate(entries):
+        number = entry.get("item", position + 1) if isinstance(entry, dict) else None
+        if not isinstance(number, int) or not 1 <= number <= count:
+            continue
+        if results[number - 1] is not None:
+            continue
+        try:
+            results[number - 1] = _normalize_evaluation(entry)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return results
 
 class GPTScorer(Scorer):
-    """Scorer using GPT models for evaluation."""
+    """Scorer using GPT models for evaluation.
     
-    async def score(
+    ``base_url`` points the client at any OpenAI-compatible endpoint, such as
+    a local mock server for throughput testing. The client does not retry on
+    its own; :class:`~evalkit.eval.engine.ScoringEngine` handles retries and
+    rate limits.
+    """
+    
+    SYSTEM_PROMPT = "You are an expert evaluator of LLM responses."
+    
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        base_url: Optional[str] = None,
+        max_tokens: int = 300,
+        temperature: float = 0.0
+    ):
+        super().__init__(model)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=base_url or settings.OPENAI_BASE_URL,
+            max_retries=0
+        )
+    
+    def build_prompt(
         self,
         query: str,
         response: str,
         expected_response: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """Score a query-response pair using GPT."""
-        
-        # Construct the prompt
+    ) -> str:
+        """Construct the rubric prompt for one query-response pair."""
         prompt = f"""Evaluate the following query-response pair:
 
 Query: {query}
@@ -48,65 +206,131 @@ Response: {response}
         if context:
             prompt += f"\nContext: {context}"
 
-        prompt += """
-
-Please evaluate the response on the following criteria:
-1. Relevance (0-1): How well does the response address the query?
-2. Accuracy (0-1): Is the information in the response factually correct?
-3. Completeness (0-1): Does the response cover all necessary aspects of the query?
-4. Clarity (0-1): Is the response clear and well-structured?
+        prompt += f"""
 
+{RUBRIC}
 Provide your evaluation in JSON format with the following structure:
-{
-    "scores": {
+{{
+    "scores": {{
         "relevance": 0.0,
         "accuracy": 0.0,
         "completeness": 0.0,
         "clarity": 0.0
-    },
+    }},
     "overall_score": 0.0,
     "explanation": "Brief explanation of the scores"
-}
+}}
 """
-
-        # Get evaluation from GPT
+        return prompt
+    
+    def estimate_tokens(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Prompt tokens (about four characters each) plus the completion limit."""
+        prompt = self.build_prompt(query, response, expected_response, context)
+        return (len(self.SYSTEM_PROMPT) + len(prompt)) // 4 + self.max_tokens
+    
+    def build_batch_prompt(self, items: List[Dict[str, Any]]) -> str:
+        """Construct one rubric prompt covering several query-response pairs."""
+        prompt = "Evaluate each of the following query-response pairs independently.\n"
+        for number, item in enumerate(items, 1):
+            prompt += f"\n### Item {number}\n\nQuery: {item['query']}\n"
+            prompt += f"\nResponse: {item['response']}\n"
+            if item.get("expected_response"):
+                prompt += f"\nExpected Response: {item['expected_response']}\n"
+            if item.get("context"):
+                prompt += f"\nContext: {item['context']}\n"
+        
+        prompt += f"""
+{RUBRIC}
+Provide your evaluation as a JSON array with one object per item, in item order:
+[
+    {{
+        "item": 1,
+        "scores": {{
+            "relevance": 0.0,
+            "accuracy": 0.0,
+            "completeness": 0.0,
+            "clarity": 0.0
+        }},
+        "overall_score": 0.0,
+        "explanation": "Brief explanation of the scores"
+    }}
+]
+"""
+        return prompt
+    
+    def estimate_batch_tokens(self, items: List[Dict[str, Any]]) -> int:
+        """Batch prompt tokens plus the completion limit for every item."""
+        prompt = self.build_batch_prompt(items)
+        return (len(self.SYSTEM_PROMPT) + len(prompt)) // 4 + self.max_tokens * len(items)
+    
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None
+    ) -> str:
+        completion = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens or self.max_tokens
+        )
+        return completion.choices[0].message.content or ""
+    
+    async def score(
+        self,
+        query: str,
+        response: str,
+        expected_response: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        """Score a query-response pair using GPT."""
+        prompt = self.build_prompt(query, response, expected_response, context)
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert evaluator of LLM responses."},
-                    {"role": "user", "content": prompt}
+            content = await self._complete([
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ])
+            return parse_evaluation(content)
+        except Exception as e:
+            if raise_errors:
+                raise
+            return self.error_result(e)
+    
+    async def score_batch(
+        self,
+        items: List[Dict[str, Any]],
+        raise_errors: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Score several query-response pairs in one request.
+        
+        The system message and rubric are sent once for the whole batch.
+        Items the reply does not cover with a well-formed entry come back
+        as ``None``.
+        """
+        try:
+            content = await self._complete(
+                [
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
+                    {"role": "user", "content": self.build_batch_prompt(items)}
                 ],
-                temperature=0.0
+                max_tokens=self.max_tokens * len(items)
             )
-            
-            # Parse the response
-            evaluation = response.choices[0].message.content
-            # TODO: Parse the JSON response and return structured data
-            
-            return {
-                "scores": {
-                    "relevance": 0.8,
-                    "accuracy": 0.9,
-                    "completeness": 0.7,
-                    "clarity": 0.85
-                },
-                "overall_score": 0.81,
-                "explanation": "Example evaluation"
-            }
-            
         except Exception as e:
-            return {
-                "error": str(e),
-                "scores": {
-                    "relevance": 0.0,
-                    "accuracy": 0.0,
-                    "completeness": 0.0,
-                    "clarity": 0.0
-                },
-                "overall_score": 0.0,
-                "explanation": f"Error during evaluation: {str(e)}"
-            }
+            if raise_errors:
+                raise
+            return [self.error_result(e) for _ in items]
+        return parse_batch_evaluation(content, len(items))
+    
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self.client.close()
 
 class ScorerFactory:
     """Factory for creating scorer instances."""
@@ -127,4 +351,4 @@ class ScorerFactory:
         return cls._scorers[scorer_type](**kwargs)
 
 # Register default scorers
-ScorerFactory.register("gpt", GPTScorer) 
\ No newline at end of file
+ScorerFactory.register("gpt", GPTScorer)
\ No newline at end of file
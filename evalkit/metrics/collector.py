@@ -35,6 +35,12 @@ SCORE_HISTOGRAM = Histogram(
     buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
 )
 
+JUDGE_CACHE_COUNTER = Counter(
+    'evalkit_judge_cache_total',
+    'Judge cache lookups',
+    ['result']
+)
+
 class MetricsCollector:
     """Collector for EvalKit metrics."""
     
@@ -77,6 +83,11 @@ class MetricsCollector:
     ) -> None:
         """Record an evaluation score."""
         SCORE_HISTOGRAM.labels(metric=metric).observe(score)
+    
+    @staticmethod
+    def record_judge_cache(result: str) -> None:
+        """Record a judge cache lookup (``hit`` or ``miss``)."""
+        JUDGE_CACHE_COUNTER.labels(result=result).inc()
 
 class MetricsContext:
     """Context manager for recording metrics."""
@@ -107,4 +118,4 @@ class MetricsContext:
         if exc_type is not None:
             self.collector.record_interaction(status="error")
         else:
-            self.collector.record_interaction(status="success") 
\ No newline at end of file
+            self.collector.record_interaction(status="success")
\ No newline at end of file
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import numpy as np
 
+from .lexical import reciprocal_rank_fusion
+
 class VectorStore(ABC):
     """Base class for vector store implementations."""
     
@@ -30,6 +33,74 @@ class VectorStore(ABC):
         """Search for similar vectors."""
         pass
     
+    @abstractmethod
+    async def search_batch(
+        self,
+        query_matrix: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search for the nearest neighbours of every row of ``query_matrix``.
+        
+        Returns ``(distances, ids)``, both shaped ``(n_queries, k)``. ``ids`` is
+        an object array of vector IDs with ``None`` in slots that have no hit.
+        """
+        pass
+    
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Keyword search over the text stored with each vector.
+        
+        Returns dicts with ``id``, ``score`` (higher is better) and ``metadata``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support lexical search")
+    
+    async def hybrid_search(
+        self,
+        query_text: str,
+        query_vector: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        candidates: Optional[int] = None,
+        rrf_k: int = 60
+    ) -> List[Dict[str, Any]]:
+        """Fuse dense and lexical retrieval with reciprocal rank fusion.
+        
+        Both retrievals run concurrently and return ``candidates`` hits each
+        (``4 * k`` by default). Results carry the fused ``score`` plus each
+        hit's ``dense_rank``/``lexical_rank`` (``None`` if it was not found by
+        that retriever) and its vector ``distance`` when known.
+        """
+        candidates = candidates or 4 * k
+        dense, lexical = await asyncio.gather(
+            self.search(query_vector, candidates, filter_criteria),
+            self.lexical_search(query_text, candidates, filter_criteria)
+        )
+        
+        dense_ranks = {result["id"]: rank for rank, result in enumerate(dense, start=1)}
+        lexical_ranks = {result["id"]: rank for rank, result in enumerate(lexical, start=1)}
+        hits = {result["id"]: result for result in lexical}
+        hits.update({result["id"]: result for result in dense})
+        
+        fused = reciprocal_rank_fusion(
+            [[result["id"] for result in dense], [result["id"] for result in lexical]], rrf_k
+        )
+        return [
+            {
+                "id": id_,
+                "score": score,
+                "distance": hits[id_].get("distance"),
+                "dense_rank": dense_ranks.get(id_),
+                "lexical_rank": lexical_ranks.get(id_),
+                "metadata": hits[id_].get("metadata")
+            }
+            for id_, score in fused[:k]
+        ]
+    
     @abstractmethod
     async def delete_vectors(self, ids: List[str]) -> None:
         """Delete vectors by their IDs."""
@@ -0,0 +1,224 @@
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Tuple
+import faiss
+import numpy as np
+
+from evalkit.db.database import db_session
+from evalkit.db.models import VectorStore as VectorStoreRecord
+from evalkit.vector.base import VectorStore
+from evalkit.vector.faiss_store import FAISSStore
+from evalkit.vector.pgvector_store import PGVectorStore
+from evalkit.vector.rerank import recall_at_k
+
+# Store configurations swept by default, as (name, store type, config)
+BENCHMARK_CONFIGS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("faiss-flat", "faiss", {"index_type": "flat"}),
+    ("faiss-ivf", "faiss", {"index_type": "ivf_flat", "nprobe": 16}),
+    ("faiss-hnsw", "faiss", {"index_type": "hnsw", "hnsw_m": 32, "ef_search": 64}),
+    ("faiss-ivfpq-rerank", "faiss", {
+        "index_type": "ivf_pq",
+        "nprobe": 16,
+        "rerank": True,
+        "rerank_factor": 8
+    }),
+    ("pgvector-ivfflat", "pgvector", {
+        "index_method": "ivfflat",
+        "nprobe": 10,
+        "table_name": "bench_vectors_ivfflat"
+    }),
+    ("pgvector-hnsw", "pgvector", {
+        "index_method": "hnsw",
+        "ef_search": 64,
+        "table_name": "bench_vectors_hnsw"
+    }),
+    ("pgvector-hnsw-binary-rerank", "pgvector", {
+        "index_method": "hnsw",
+        "ef_search": 64,
+        "storage_dtype": "binary",
+        "rerank_factor": 8,
+        "table_name": "bench_vectors_binary"
+    }),
+]
+
+_STORE_CLASSES = {"faiss": FAISSStore, "pgvector": PGVectorStore}
+
+def load_dataset(
+    path: Optional[str] = None,
+    num_vectors: int = 100000,
+    dimension: int = 128,
+    num_queries: int = 1000,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(corpus, queries)`` as L2-normalized float32 matrices.
+    
+    ``path`` is a ``.npy`` matrix whose last ``num_queries`` rows become the
+    queries. Without it, a clustered Gaussian mixture is generated, which
+    is closer to real embeddings than uniform noise. Normalizing makes L2,
+    inner product and cosine rank neighbours identically, so FAISS and
+    pgvector results are comparable against one ground truth.
+    """
+    if path:
+        data = np.load(path, mmap_mode="r")
+        corpus = np.asarray(data[:-num_queries], dtype=np.float32)
+        queries = np.asarray(data[-num_queries:], dtype=np.float32)
+    else:
+        rng = np.random.default_rng(seed)
+        num_clusters = max(1, int(np.sqrt(num_vectors + num_queries)))
+        centers = rng.standard_normal((num_clusters, dimension)).astype(np.float32)
+        assignment = rng.integers(0, num_clusters, num_vectors + num_queries)
+        data = centers[assignment] + 0.5 * rng.standard_normal(
+            (num_vectors + num_queries, dimension)
+        ).astype(np.float32)
+        corpus, queries = data[:num_vectors], data[num_vectors:]
+    
+    corpus = np.ascontiguousarray(corpus)
+    queries = np.ascontiguousarray(queries)
+    faiss.normalize_L2(corpus)
+    faiss.normalize_L2(queries)
+    return corpus, queries
+
+def ground_truth(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-``k`` corpus rows for every query."""
+    _, indices = faiss.knn(queries, corpus, k, metric=faiss.METRIC_INNER_PRODUCT)
+    return indices
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99))
+    }
+
+def _percentiles_from(concurrency: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """Single-client latency and peak throughput across concurrency levels."""
+    single = concurrency.get("1") or next(iter(concurrency.values()))
+    return {
+        "p50_ms": single["p50_ms"],
+        "p99_ms": single["p99_ms"],
+        "max_qps": max(level["qps"] for level in concurrency.values())
+    }
+
+async def _run_queries(
+    store: VectorStore,
+    queries: np.ndarray,
+    k: int,
+    concurrency: int
+) -> Dict[str, float]:
+    """Issue every query with ``concurrency`` concurrent clients."""
+    latencies: List[float] = []
+    
+    async def client(rows: np.ndarray) -> None:
+        for query in rows:
+            start = time.perf_counter()
+            await store.search(query, k=k)
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[client(queries[i::concurrency]) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    
+    return {"qps": len(queries) / elapsed, **_percentiles(latencies)}
+
+async def benchmark_store(
+    store_type: str,
+    config: Dict[str, Any],
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int = 10,
+    concurrency_levels: Tuple[int, ...] = (1, 4, 16)
+) -> Dict[str, Any]:
+    """Load ``corpus`` into a fresh store and measure ingest, recall and latency.
+    
+    The corpus is added in one call so each store can use its bulk path (and
+    pgvector builds its IVF index once, sized for the final row count).
+    """
+    store = _STORE_CLASSES[store_type]()
+    await store.initialize({**config, "dimension": corpus.shape[1]})
+    await store.clear()
+    
+    try:
+        start = time.perf_counter()
+        ids = await store.add_vectors(
+            corpus,
+            [{} for _ in range(len(corpus))],
+            [str(row) for row in range(len(corpus))]
+        )
+        ingest_seconds = time.perf_counter() - start
+        
+        # Map store-assigned IDs back to corpus rows
+        id_to_row = {id_: row for row, id_ in enumerate(ids)}
+        
+        def recall(found_ids: np.ndarray) -> float:
+            found_rows = np.array(
+                [[id_to_row.get(id_, -1) for id_ in row] for row in found_ids], dtype=np.int64
+            )
+            return recall_at_k(found_rows, truth)
+        
+        _, found_ids = await store.search_batch(queries, k=k)
+        recalls = {f"recall_at_{k}": recall(found_ids)}
+        
+        # Two-stage configs also report the compressed index's own recall
+        if config.get("rerank") or config.get("storage_dtype") == "binary":
+            _, first_stage_ids = await store.search_batch(queries, k=k, rerank=False)
+            recalls[f"first_stage_recall_at_{k}"] = recall(first_stage_ids)
+            recalls["rerank_recall_gain"] = (
+                recalls[f"recall_at_{k}"] - recalls[f"first_stage_recall_at_{k}"]
+            )
+        
+        concurrency = {}
+        for level in concurrency_levels:
+            concurrency[str(level)] = await _run_queries(store, queries, k, level)
+        
+        return {
+            "num_vectors": len(corpus),
+            "num_queries": len(queries),
+            "dimension": corpus.shape[1],
+            "k": k,
+            "ingest_seconds": ingest_seconds,
+            "ingest_vectors_per_s": len(corpus) / ingest_seconds,
+            **recalls,
+            **_percentiles_from(concurrency),
+            "concurrency": concurrency,
+            "store_metrics": await store.get_metrics()
+        }
+    finally:
+        await store.clear()
+        close = getattr(store, "close", None)
+        if close is not None:
+            await close()
+
+async def save_results(
+    name: str,
+    store_type: str,
+    config: Dict[str, Any],
+    metrics: Dict[str, Any]
+) -> None:
+    """Record one benchmark run as a ``vector_stores`` row."""
+    async with db_session() as db:
+        db.add(VectorStoreRecord(name=name, type=store_type, config=config, metrics=metrics))
+        await db.commit()
+
+async def run_benchmark(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    names: Optional[List[str]] = None,
+    k: int = 10,
+    concurrency_levels: Tuple[int, ...] = (1, 4, 16),
+    save: bool = True
+) -> List[Dict[str, Any]]:
+    """Benchmark each selected config against one dataset and ground truth."""
+    truth = ground_truth(corpus, queries, k)
+    results = []
+    for name, store_type, config in BENCHMARK_CONFIGS:
+        if names and name not in names:
+            continue
+        metrics = await benchmark_store(
+            store_type, config, corpus, queries, truth, k, concurrency_levels
+        )
+        metrics["benchmarked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if save:
+            await save_results(name, store_type, config, metrics)
+        results.append({"name": name, "type": store_type, "config": config, "metrics": metrics})
+    return results
\ No newline at end of file
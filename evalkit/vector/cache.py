@@ -0,0 +1,253 @@
+import hashlib
+import json
+import pickle
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+from .base import VectorStore
+
+# Methods of wrapped stores, beyond the VectorStore interface, that change search results
+_MUTATING_METHODS = ("load", "train", "rebuild_index")
+
+class CachedVectorStore(VectorStore):
+    """Vector store decorator that caches search results.
+    
+    Entries are keyed on a hash of the query vector, ``k``, the filters and
+    any search parameters, and evicted least-recently-used once either
+    ``max_entries`` or ``max_bytes`` is exceeded, or after ``ttl`` seconds.
+    Every write through the cache bumps an index version, which invalidates
+    all entries; ``ttl`` bounds staleness from writes made elsewhere, such
+    as another process sharing a pgvector table.
+    """
+    
+    def __init__(
+        self,
+        store: VectorStore,
+        max_entries: int = 10000,
+        ttl: Optional[float] = 300.0,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.version = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __getattr__(self, name: str) -> Any:
+        # Delegate store-specific methods (save, close, compact, ...)
+        attr = getattr(self.store, name)
+        if name not in _MUTATING_METHODS:
+            return attr
+        
+        async def invalidating(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                self.invalidate()
+        return invalidating
+    
+    def invalidate(self) -> None:
+        """Bump the index version and drop every cached result."""
+        self.version += 1
+        self._entries.clear()
+        self._bytes = 0
+    
+    def _key(
+        self,
+        kind: str,
+        query: Any,
+        k: int,
+        filter_criteria: Optional[Dict[str, Any]],
+        search_params: Dict[str, Any]
+    ) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(kind.encode("utf-8"))
+        if isinstance(query, str):
+            digest.update(query.encode("utf-8"))
+        else:
+            digest.update(np.ascontiguousarray(query, dtype=np.float32).tobytes())
+        digest.update(
+            json.dumps(
+                [k, filter_criteria, search_params], sort_keys=True, default=str
+            ).encode("utf-8")
+        )
+        return digest.digest()
+    
+    def _get(self, key: bytes) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        created_at, size, value = entry
+        if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+            del self._entries[key]
+            self._bytes -= size
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def _put(self, key: bytes, value: Any, version: int) -> None:
+        # A write finished while this search was running, so its result may be stale
+        if version != self.version:
+            return
+        
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (time.monotonic(), size, value)
+        self._bytes += size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+    
+    async def initialize(self, config: Dict[str, Any]) -> None:
+        """Initialize the wrapped store."""
+        await self.store.initialize(config)
+        self.invalidate()
+    
+    async def add_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Add vectors to the wrapped store and invalidate the cache."""
+        try:
+            return await self.store.add_vectors(vectors, metadata, ids)
+        finally:
+            self.invalidate()
+    
+    async def search(
+        self,
+        query_vector: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        **search_params: Any
+    ) -> List[Dict[str, Any]]:
+        """Search through the cache; hits report the lookup time as ``search_time``."""
+        start_time = time.time()
+        key = self._key("search", query_vector, k, filter_criteria, search_params)
+        cached = self._get(key)
+        if cached is not None:
+            search_time = time.time() - start_time
+            return [
+                {**result, "metadata": dict(result["metadata"]), "search_time": search_time}
+                for result in cached
+            ]
+        
+        version = self.version
+        results = await self.store.search(query_vector, k, filter_criteria, **search_params)
+        self._put(
+            key,
+            [{**result, "metadata": dict(result["metadata"] or {})} for result in results],
+            version
+        )
+        return results
+    
+    async def search_batch(
+        self,
+        query_matrix: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        **search_params: Any
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search through the cache row by row; only missing rows reach the store."""
+        query_matrix = np.atleast_2d(query_matrix)
+        keys = [
+            self._key("search_batch", query, k, filter_criteria, search_params)
+            for query in query_matrix
+        ]
+        
+        distances = np.full((len(query_matrix), k), np.inf, dtype=np.float32)
+        ids = np.full((len(query_matrix), k), None, dtype=object)
+        missing = []
+        for row, key in enumerate(keys):
+            cached = self._get(key)
+            if cached is None:
+                missing.append(row)
+                continue
+            distances[row], ids[row] = cached
+        
+        if missing:
+            version = self.version
+            found_distances, found_ids = await self.store.search_batch(
+                query_matrix[missing], k, filter_criteria, **search_params
+            )
+            distances[missing] = found_distances
+            ids[missing] = found_ids
+            for i, row in enumerate(missing):
+                self._put(keys[row], (found_distances[i].copy(), found_ids[i].copy()), version)
+        
+        return distances, ids
+    
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Lexical search through the cache."""
+        key = self._key("lexical_search", query_text, k, filter_criteria, {})
+        cached = self._get(key)
+        if cached is not None:
+            return [{**result, "metadata": dict(result["metadata"])} for result in cached]
+        
+        version = self.version
+        results = await self.store.lexical_search(query_text, k, filter_criteria)
+        self._put(
+            key,
+            [{**result, "metadata": dict(result["metadata"] or {})} for result in results],
+            version
+        )
+        return results
+    
+    async def delete_vectors(self, ids: List[str]) -> None:
+        """Delete vectors from the wrapped store and invalidate the cache."""
+        try:
+            await self.store.delete_vectors(ids)
+        finally:
+            self.invalidate()
+    
+    async def get_metrics(self, **kwargs: Any) -> Dict[str, Any]:
+        """Get the wrapped store's metrics plus cache statistics.
+        
+        Keyword arguments, such as pgvector's ``exact``, go to the wrapped store.
+        """
+        metrics = await self.store.get_metrics(**kwargs)
+        lookups = self.hits + self.misses
+        return {
+            **metrics,
+            "cache": {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "version": self.version
+            }
+        }
+    
+    async def clear(self) -> None:
+        """Clear the wrapped store and invalidate the cache."""
+        try:
+            await self.store.clear()
+        finally:
+            self.invalidate()
\ No newline at end of file
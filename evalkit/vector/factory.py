@@ -1,14 +1,27 @@
 from typing import Dict, Any
 from evalkit.vector.base import VectorStore
-from evalkit.vector.faiss_store import FAISSVectorStore
+from evalkit.vector.cache import CachedVectorStore
+from evalkit.vector.faiss_store import FAISSStore
 from evalkit.vector.pgvector_store import PGVectorStore
+from evalkit.vector.sharded_store import ShardedFAISSStore
 from evalkit.config import settings
 
 def create_vector_store() -> VectorStore:
     """Create vector store instance based on configuration."""
     if settings.VECTOR_STORE_TYPE == "faiss":
-        return FAISSVectorStore()
+        store = FAISSStore()
+    elif settings.VECTOR_STORE_TYPE == "faiss_sharded":
+        store = ShardedFAISSStore()
     elif settings.VECTOR_STORE_TYPE == "pgvector":
-        return PGVectorStore()
+        store = PGVectorStore()
     else:
-        raise ValueError(f"Unsupported vector store type: {settings.VECTOR_STORE_TYPE}") 
\ No newline at end of file
+        raise ValueError(f"Unsupported vector store type: {settings.VECTOR_STORE_TYPE}")
+    
+    if settings.VECTOR_CACHE_ENABLED:
+        return CachedVectorStore(
+            store,
+            max_entries=settings.VECTOR_CACHE_MAX_ENTRIES,
+            ttl=settings.VECTOR_CACHE_TTL,
+            max_bytes=settings.VECTOR_CACHE_MAX_BYTES
+        )
+    return store
\ No newline at end of file
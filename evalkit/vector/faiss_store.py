@@ -1,38 +1,769 @@
 import faiss
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
 import time
 from .base import VectorStore
+from .lexical import BM25Index
+from .metadata_index import InvertedMetadataIndex
+from .metadata_store import ColumnarMetadataStore
+from .rerank import exact_knn, exact_rerank, recall_at_k
+from .vector_file import VectorFile
+
+INDEX_FILE = "index.faiss"
+METADATA_FILE = "metadata.json"
+METADATA_COLUMNS_DIR = "metadata_columns"
+FULL_VECTORS_FILE = "vectors.f32"
+# Prefix of each store's private working copy; only save() updates FULL_VECTORS_FILE
+WORKING_VECTORS_FILE = "vectors.f32.work"
+
+logger = logging.getLogger(__name__)
+
+IVF_INDEX_TYPES = ("ivf_flat", "ivf_pq")
+INDEX_TYPES = ("flat", "hnsw") + IVF_INDEX_TYPES
+
+# Scalar quantizer codes for reduced-precision storage
+SQ_CODES = {"float32": None, "float16": "SQfp16", "int8": "SQ8"}
+
+# Size of the float32 sample kept to estimate the recall cost of quantization
+PRECISION_SAMPLE_SIZE = 2000
+
+# Settings a caller may change when reopening a snapshot; the rest describe
+# how the saved index was built and always come from the snapshot
+TUNING_SETTINGS = (
+    "nprobe",
+    "ef_search",
+    "rerank",
+    "rerank_factor",
+    "compaction_threshold",
+    "promote_threshold",
+    "exact_filter_fraction",
+    "train_sample_size",
+    "text_field"
+)
+
+def _default_nlist(num_vectors: int) -> int:
+    """Pick an IVF list count for a corpus of ``num_vectors``.
+    
+    Follows the usual FAISS guidance of roughly 4 * sqrt(N) lists while
+    keeping at least 39 training points per centroid.
+    """
+    return max(1, min(int(4 * np.sqrt(num_vectors)), num_vectors // 39))
+
+class _ReadWriteLock:
+    """Lock allowing concurrent readers or a single writer.
+    
+    Waiting writers block new readers, so a steady stream of searches cannot
+    starve index updates.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
 
 class FAISSStore(VectorStore):
     """FAISS vector store implementation."""
     
     def __init__(self):
         self.index = None
-        self.metadata = {}
+        self.metadata = ColumnarMetadataStore()
         self.dimension = None
         self.metric = None
+        self.path = None
+        self.use_gpu = False
+        self.read_only = False
+        self.index_type = "flat"
+        self.nlist = None
+        # Whether nlist was derived from the data, and may grow with it
+        self._auto_nlist = False
+        self.nprobe = 16
+        self.hnsw_m = 32
+        self.ef_construction = 200
+        self.ef_search = 64
+        self.pq_m = 64
+        self.pq_nbits = 8
+        self.train_sample_size = 100000
+        self.promote_threshold = None
+        self.promote_to = "ivf_flat"
+        self.compaction_threshold = 0.2
+        self.exact_filter_fraction = 0.01
+        self.storage_dtype = "float32"
+        self.rerank = False
+        self.rerank_factor = 4
+        self.text_field = "text"
+        self._tuning: Dict[str, Any] = {}
+        self._metadata_index = InvertedMetadataIndex()
+        self._lexical_index = BM25Index()
+        
+        # External string IDs map to stable int64 IDs inside the FAISS index
+        self._next_id = 0
+        self._id_to_internal = {}
+        self._internal_to_id = {}
+        self._tombstones = set()
+        self._tombstone_selector = None
+        self._compaction_task = None
+        
+        # Full-precision copies (rows = internal IDs) used for exact reranking
+        self._full_vectors: Optional[VectorFile] = None
+        self._precision_sample = None
+        self._precision_seen = 0
+        self._recall_estimate = None
+        self._rerank_recall = None
+        
+        # FAISS calls run on a dedicated pool so they never block the event loop
+        self._executor = None
+        self._owns_executor = False
+        self._lock = _ReadWriteLock()
     
     async def initialize(self, config: Dict[str, Any]) -> None:
-        """Initialize FAISS index with configuration."""
+        """Initialize FAISS index with configuration.
+        
+        If ``path`` points at a directory holding a saved snapshot, the index
+        and its metadata are loaded from there instead of starting empty. The
+        snapshot fixes how the index is built (type, dimension, list count,
+        graph and quantizer parameters); tuning settings such as ``nprobe``,
+        ``ef_search`` and ``rerank`` given here override the saved ones.
+        
+        ``index_type`` selects ``flat``, ``ivf_flat``, ``hnsw`` or ``ivf_pq``.
+        IVF indexes are trained on a sample of the first batch added (or an
+        explicit :meth:`train` call); without an ``nlist`` the list count is
+        derived from that sample, and the index is retrained with more lists
+        each time the corpus grows enough to double it. Vectors added before
+        there are enough to train on wait in a flat index. A flat index is rebuilt as
+        ``promote_to`` once it holds ``promote_threshold`` vectors.
+        
+        FAISS work runs on ``executor`` if one is given, otherwise on a private
+        thread pool of ``executor_workers`` threads. ``omp_threads`` caps the
+        OpenMP threads each FAISS call may use (process-wide).
+        
+        String values under the ``text_field`` metadata key are indexed for
+        BM25 :meth:`lexical_search`.
+        """
         self.dimension = config.get("dimension", 1536)  # Default for OpenAI embeddings
         self.metric = config.get("metric", "l2")
+        self.path = config.get("path")
+        self.use_gpu = config.get("use_gpu", False)
+        self._tuning = {key: config[key] for key in TUNING_SETTINGS if key in config}
+        self._configure_index(config)
+        self._configure_executor(config)
+        
+        if self.path and os.path.exists(os.path.join(self.path, INDEX_FILE)):
+            await self.load(self.path, mmap=config.get("mmap", False))
+            return
+        
+        self._create_index()
+    
+    def _configure_executor(self, config: Dict[str, Any]) -> None:
+        """Set up the executor and OpenMP thread count for FAISS calls."""
+        if config.get("omp_threads"):
+            faiss.omp_set_num_threads(config["omp_threads"])
         
-        # Create the index
+        executor: Optional[Executor] = config.get("executor")
+        if executor is not None:
+            self._executor = executor
+            self._owns_executor = False
+        elif self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=config.get("executor_workers", os.cpu_count() or 4),
+                thread_name_prefix="faiss"
+            )
+            self._owns_executor = True
+    
+    async def _run(self, func: Callable[..., Any], *args: Any, write: bool = False) -> Any:
+        """Run ``func`` on the FAISS executor under the store's read or write lock."""
+        lock = self._lock.write if write else self._lock.read
+        
+        def call() -> Any:
+            with lock():
+                return func(*args)
+        
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+    
+    async def close(self) -> None:
+        """Wait for compaction, remove the working vector file and stop the private executor."""
+        if self._compaction_task is not None:
+            await asyncio.wait([self._compaction_task])
+        await self._run(self._release_full_vectors, write=True)
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._owns_executor = False
+    
+    def _configure_index(self, config: Dict[str, Any]) -> None:
+        """Read index type and tuning parameters from ``config``."""
+        self.index_type = config.get("index_type", self.index_type)
+        self.nlist = config.get("nlist", self.nlist)
+        self._auto_nlist = config.get("auto_nlist", self._auto_nlist)
+        self.nprobe = config.get("nprobe", self.nprobe)
+        self.hnsw_m = config.get("hnsw_m", self.hnsw_m)
+        self.ef_construction = config.get("ef_construction", self.ef_construction)
+        self.ef_search = config.get("ef_search", self.ef_search)
+        self.pq_m = config.get("pq_m", self.pq_m)
+        self.pq_nbits = config.get("pq_nbits", self.pq_nbits)
+        self.train_sample_size = config.get("train_sample_size", self.train_sample_size)
+        self.promote_threshold = config.get("promote_threshold", self.promote_threshold)
+        self.promote_to = config.get("promote_to", self.promote_to)
+        self.compaction_threshold = config.get("compaction_threshold", self.compaction_threshold)
+        self.exact_filter_fraction = config.get("exact_filter_fraction", self.exact_filter_fraction)
+        self.storage_dtype = config.get("storage_dtype", self.storage_dtype)
+        self.rerank = config.get("rerank", self.rerank)
+        self.rerank_factor = config.get("rerank_factor", self.rerank_factor)
+        self.text_field = config.get("text_field", self.text_field)
+        
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {self.index_type}")
+        if self.storage_dtype not in SQ_CODES:
+            raise ValueError(f"Unsupported storage dtype: {self.storage_dtype}")
+        if self.storage_dtype != "float32" and self.index_type == "ivf_pq":
+            raise ValueError("storage_dtype does not apply to ivf_pq, which is already compressed")
+        if self.promote_to not in IVF_INDEX_TYPES + ("hnsw",):
+            raise ValueError(f"Unsupported promotion target: {self.promote_to}")
+    
+    def _index_config(self) -> Dict[str, Any]:
+        """Return the index settings that are persisted with a snapshot."""
+        return {
+            "index_type": self.index_type,
+            "nlist": self.nlist,
+            "auto_nlist": self._auto_nlist,
+            "nprobe": self.nprobe,
+            "hnsw_m": self.hnsw_m,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "pq_m": self.pq_m,
+            "pq_nbits": self.pq_nbits,
+            "train_sample_size": self.train_sample_size,
+            "promote_threshold": self.promote_threshold,
+            "promote_to": self.promote_to,
+            "compaction_threshold": self.compaction_threshold,
+            "exact_filter_fraction": self.exact_filter_fraction,
+            "storage_dtype": self.storage_dtype,
+            "rerank": self.rerank,
+            "rerank_factor": self.rerank_factor,
+            "text_field": self.text_field
+        }
+    
+    def _create_index(self) -> None:
+        """Create an empty index for the configured type, dimension and metric.
+        
+        IVF indexes store our internal IDs natively (with a hash-table direct
+        map for reconstruction and removal); flat and HNSW indexes are wrapped
+        in an ``IndexIDMap2``. With a reduced ``storage_dtype`` the vectors are
+        kept as float16 or 8-bit scalar-quantized codes.
+        """
+        metric_type = self._metric_type()
+        
+        # Without a configured nlist, _train recreates the index sized to its sample
+        nlist = self.nlist or 1
+        sq_code = SQ_CODES[self.storage_dtype]
+        if self.index_type == "flat":
+            description = sq_code or "Flat"
+        elif self.index_type == "ivf_flat":
+            description = f"IVF{nlist},{sq_code or 'Flat'}"
+        elif self.index_type == "hnsw":
+            description = f"HNSW{self.hnsw_m}" + (f",{sq_code}" if sq_code else "")
+        else:
+            description = f"IVF{nlist},PQ{self.pq_m}x{self.pq_nbits}"
+        
+        if self.index_type in IVF_INDEX_TYPES:
+            self.index = faiss.index_factory(self.dimension, description, metric_type)
+            self.index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        else:
+            self.index = faiss.index_factory(self.dimension, f"IDMap2,{description}", metric_type)
+        
+        if self.index_type == "hnsw":
+            self._base_index().hnsw.efConstruction = self.ef_construction
+        
+        self.read_only = False
+        self._maybe_move_to_gpu()
+    
+    def _metric_type(self) -> int:
+        """Return the FAISS metric constant for the configured metric."""
         if self.metric == "l2":
-            self.index = faiss.IndexFlatL2(self.dimension)
+            return faiss.METRIC_L2
         elif self.metric == "ip":  # Inner product (cosine similarity)
-            self.index = faiss.IndexFlatIP(self.dimension)
+            return faiss.METRIC_INNER_PRODUCT
+        raise ValueError(f"Unsupported metric: {self.metric}")
+    
+    def _train(self, vectors: np.ndarray) -> None:
+        """Train the index on a random sample of ``vectors``."""
+        if len(vectors) > self.train_sample_size:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(len(vectors), self.train_sample_size, replace=False)]
         else:
-            raise ValueError(f"Unsupported metric: {self.metric}")
+            sample = vectors
+        
+        min_points = self._min_training_points()
+        if len(sample) < min_points:
+            raise ValueError(
+                f"Training a {self.index_type} index needs at least {min_points} vectors, "
+                f"got {len(sample)}; call train() with a larger sample first"
+            )
+        
+        if self.index_type in IVF_INDEX_TYPES and (self.nlist is None or self._auto_nlist):
+            # Size the coarse quantizer to the sample rather than a fixed list count
+            self.nlist = _default_nlist(len(sample))
+            self._auto_nlist = True
+            self._create_index()
+        self.index.train(sample)
+    
+    def _min_training_points(self) -> int:
+        """Return the fewest vectors the configured index can be trained on."""
+        if self.index_type not in IVF_INDEX_TYPES:
+            return 1
+        # A derived list count is sized to whatever sample there is
+        min_points = 1 if self.nlist is None or self._auto_nlist else self.nlist
+        if self.index_type == "ivf_pq":
+            min_points = max(min_points, 2 ** self.pq_nbits)
+        return min_points
+    
+    def _stage_in_flat_index(self) -> None:
+        """Hold vectors in a flat index until there are enough to train on.
         
-        # If GPU is available and requested
-        if config.get("use_gpu", False):
+        The flat index is rebuilt as the configured type through the regular
+        promotion path once it reaches the training minimum.
+        """
+        self.promote_to = self.index_type
+        self.promote_threshold = self._min_training_points()
+        self.index_type = "flat"
+        self._create_index()
+    
+    def _base_index(self) -> Any:
+        """Return the index underneath the ID map, if there is one."""
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return faiss.downcast_index(self.index.index)
+        return self.index
+    
+    def _live_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return internal IDs and vectors of every entry that is not tombstoned."""
+        if self.index_type in IVF_INDEX_TYPES:
+            internal_ids = np.fromiter(self._internal_to_id, dtype=np.int64)
+            if len(internal_ids) == 0:
+                return internal_ids, np.empty((0, self.dimension), dtype=np.float32)
+            return internal_ids, self.index.reconstruct_batch(internal_ids)
+        
+        internal_ids = faiss.vector_to_array(self.index.id_map)
+        vectors = self._base_index().reconstruct_n(0, self.index.ntotal)
+        keep = np.isin(internal_ids, np.fromiter(self._tombstones, dtype=np.int64), invert=True)
+        return internal_ids[keep], vectors[keep]
+    
+    def _rebuild(self, index_type: Optional[str] = None) -> None:
+        """Rebuild the index from its live vectors, optionally changing its type."""
+        internal_ids, vectors = self._live_vectors()
+        if self._full_vectors is not None and len(internal_ids):
+            # Rebuild from the originals rather than quantized reconstructions
+            vectors = np.asarray(self._full_vectors[internal_ids], dtype=np.float32)
+        if index_type is not None:
+            self.index_type = index_type
+        
+        self._create_index()
+        # With nothing left the index stays empty and untrained until the next add
+        if len(vectors):
+            if not self.index.is_trained:
+                self._train(vectors)
+            self.index.add_with_ids(vectors, internal_ids)
+        self._tombstones.clear()
+        self._tombstone_selector = None
+    
+    def _maybe_promote(self) -> None:
+        """Rebuild a flat index as an approximate one once it is large enough."""
+        if (
+            self.index_type != "flat"
+            or not self.promote_threshold
+            or len(self._internal_to_id) < self.promote_threshold
+        ):
+            return
+        
+        self._rebuild(self.promote_to)
+    
+    def _maybe_grow_nlist(self) -> None:
+        """Retrain a derived-``nlist`` IVF index once the corpus supports twice the lists.
+        
+        Each rebuild costs O(N), but the corpus must roughly quadruple before
+        the next one, so the total stays linear in the corpus size.
+        """
+        if self.index_type not in IVF_INDEX_TYPES or not self._auto_nlist:
+            return
+        target = _default_nlist(min(len(self._internal_to_id), self.train_sample_size))
+        if target >= 2 * self.nlist:
+            self._rebuild()
+    
+    def _compact(self) -> None:
+        """Physically remove tombstoned vectors from the index."""
+        if not self._tombstones:
+            return
+        
+        tombstones = np.fromiter(self._tombstones, dtype=np.int64)
+        self.metadata.compact()
+        if self.index_type in IVF_INDEX_TYPES:
+            # The hash-table direct map only supports removal by explicit ID array
+            self.index.remove_ids(faiss.IDSelectorArray(tombstones))
+        elif self.index_type == "flat":
+            self.index.remove_ids(faiss.IDSelectorBatch(tombstones))
+        else:
+            # HNSW graphs cannot drop nodes, so rebuild from the survivors
+            self._rebuild()
+            self._rebuild_lexical_index()
+            return
+        
+        self._tombstones.clear()
+        self._tombstone_selector = None
+        self._rebuild_lexical_index()
+    
+    def _rebuild_lexical_index(self) -> None:
+        """Re-index the text of every live vector, dropping dead postings."""
+        self._lexical_index.clear()
+        if not len(self.metadata):
+            return
+        internal_ids = np.fromiter(self._internal_to_id, dtype=np.int64)
+        texts = self.metadata.gather(self.text_field, internal_ids)
+        for internal_id, text in zip(internal_ids.tolist(), texts):
+            if isinstance(text, str):
+                self._lexical_index.add(internal_id, text)
+    
+    def _should_compact(self) -> bool:
+        """Whether tombstones have passed the configured fraction of the index."""
+        return (
+            self.index.ntotal > 0
+            and len(self._tombstones) >= self.compaction_threshold * self.index.ntotal
+        )
+    
+    def _working_vectors_path(self, path: Optional[str] = None) -> Optional[str]:
+        """Create an empty working vector file private to this store and return its path.
+        
+        Every store gets a uniquely named file, so stores in other processes
+        that load the same snapshot never write to or remove each other's.
+        """
+        path = path or self.path
+        if not path:
+            return None
+        os.makedirs(path, exist_ok=True)
+        fd, working_path = tempfile.mkstemp(prefix=WORKING_VECTORS_FILE + ".", dir=path)
+        os.close(fd)
+        return working_path
+    
+    def _release_full_vectors(self) -> None:
+        """Close the full vectors, removing this store's working file if it has one."""
+        full_vectors, self._full_vectors = self._full_vectors, None
+        if full_vectors is None:
+            return
+        full_vectors.close()
+        if full_vectors.path and not full_vectors.read_only:
             try:
-                res = faiss.StandardGpuResources()
-                self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
-            except Exception as e:
-                print(f"Failed to use GPU: {e}")
+                os.remove(full_vectors.path)
+            except FileNotFoundError:
+                pass
+    
+    def _store_full_vectors(self, internal_ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Keep float32 copies of added vectors for reranking and recall estimates.
+        
+        With a ``path`` the copies go to a memory-mapped working file in it,
+        so they need not fit in memory alongside the index.
+        """
+        if self.rerank:
+            if self._full_vectors is None:
+                self._full_vectors = VectorFile(self.dimension, self._working_vectors_path())
+            self._full_vectors.write(internal_ids, vectors)
+        
+        if self.storage_dtype == "float32":
+            return
+        
+        # Reservoir sample of the float32 inputs for the quantization recall estimate
+        if self._precision_sample is None:
+            self._precision_sample = np.zeros((0, self.dimension), dtype=np.float32)
+        room = PRECISION_SAMPLE_SIZE - len(self._precision_sample)
+        if room > 0:
+            self._precision_sample = np.vstack([self._precision_sample, vectors[:room]])
+        rest = vectors[max(room, 0):]
+        if len(rest):
+            seen = self._precision_seen + max(room, 0) + np.arange(len(rest))
+            slots = np.random.default_rng().integers(0, seen + 1)
+            keep = slots < PRECISION_SAMPLE_SIZE
+            self._precision_sample[slots[keep]] = rest[keep]
+        self._precision_seen += len(vectors)
+        self._recall_estimate = None
+    
+    def _estimate_precision_recall(self, k: int = 10) -> Optional[Dict[str, float]]:
+        """Estimate recall@k lost to reduced-precision storage on a float32 sample.
+        
+        The sample is split into queries and a corpus; the corpus is indexed
+        both exactly and with the configured scalar quantizer, and recall is
+        the overlap of their top-k lists (with and without exact reranking).
+        """
+        sample = self._precision_sample
+        if self.storage_dtype == "float32" or sample is None or len(sample) < 100:
+            return None
+        if self._recall_estimate is not None:
+            return self._recall_estimate
+        
+        queries, corpus = sample[:100], sample[100:]
+        k = min(k, len(corpus))
+        _, true_ids = faiss.knn(queries, corpus, k, metric=self._metric_type())
+        
+        quantized = faiss.index_factory(
+            self.dimension, SQ_CODES[self.storage_dtype], self._metric_type()
+        )
+        quantized.train(corpus)
+        quantized.add(corpus)
+        _, candidate_ids = quantized.search(queries, k * self.rerank_factor)
+        _, reranked_ids = exact_rerank(queries, candidate_ids, corpus, k, self.metric)
+        
+        self._recall_estimate = {
+            f"quantized_recall_at_{k}": recall_at_k(candidate_ids[:, :k], true_ids),
+            f"reranked_recall_at_{k}": recall_at_k(reranked_ids, true_ids)
+        }
+        return self._recall_estimate
+    
+    async def estimate_rerank_recall(
+        self,
+        k: int = 10,
+        num_queries: int = 100,
+        rerank_factor: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Measure how much exact reranking improves recall@k on the live index.
+        
+        Queries are sampled from the stored vectors. Ground truth is an exact
+        search over every live full-precision vector, read block by block
+        from the vector file, and is compared with the index's own top ``k``
+        and with the top ``k`` after reranking ``k * rerank_factor``
+        candidates. The result is also reported by :meth:`get_metrics`.
+        """
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+        if self._full_vectors is None:
+            raise RuntimeError("Full-precision vectors are only kept with rerank enabled")
+        
+        return await self._run(
+            self._estimate_rerank_recall, k, num_queries, rerank_factor, nprobe, ef_search
+        )
+    
+    def _estimate_rerank_recall(
+        self,
+        k: int,
+        num_queries: int,
+        rerank_factor: Optional[int],
+        nprobe: Optional[int],
+        ef_search: Optional[int]
+    ) -> Dict[str, Any]:
+        live = np.sort(np.fromiter(self._internal_to_id, dtype=np.int64))
+        k = min(k, len(live))
+        if k == 0:
+            raise ValueError("Cannot estimate recall on an empty index")
+        
+        sample = np.random.default_rng().choice(live, min(num_queries, len(live)), replace=False)
+        queries = np.asarray(self._full_vectors[np.sort(sample)], dtype=np.float32)
+        true_ids = exact_knn(queries, self._full_vectors, live, k, self.metric)
+        
+        fetch = k * (rerank_factor or self.rerank_factor)
+        params = self._search_params(fetch, nprobe, ef_search)
+        _, candidate_ids = self.index.search(queries, fetch, params=params)
+        _, reranked_ids = exact_rerank(queries, candidate_ids, self._full_vectors, k, self.metric)
+        
+        first_stage = recall_at_k(candidate_ids[:, :k], true_ids)
+        reranked = recall_at_k(reranked_ids, true_ids)
+        self._rerank_recall = {
+            "k": k,
+            "num_queries": len(queries),
+            "candidates": fetch,
+            f"first_stage_recall_at_{k}": first_stage,
+            f"reranked_recall_at_{k}": reranked,
+            "recall_gain": reranked - first_stage
+        }
+        return self._rerank_recall
+    
+    def _search_params(
+        self,
+        k: int,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        selector: Optional[Any] = None
+    ) -> Optional[Any]:
+        """Build per-query FAISS search parameters for the current index type.
+        
+        Without an explicit ``selector``, tombstoned IDs are excluded through
+        an ID selector so deleted vectors never take up result slots.
+        """
+        if selector is None and self._tombstones:
+            if self._tombstone_selector is None:
+                excluded = faiss.IDSelectorBatch(np.fromiter(self._tombstones, dtype=np.int64))
+                self._tombstone_selector = (faiss.IDSelectorNot(excluded), excluded)
+            selector = self._tombstone_selector[0]
+        
+        if self.index_type in IVF_INDEX_TYPES:
+            return faiss.SearchParametersIVF(nprobe=nprobe or self.nprobe, sel=selector)
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(
+                efSearch=max(ef_search or self.ef_search, k),
+                sel=selector
+            )
+        if selector is not None:
+            return faiss.SearchParameters(sel=selector)
+        return None
+    
+    def _maybe_move_to_gpu(self) -> None:
+        """Move the index to GPU if available and requested."""
+        if not self.use_gpu:
+            return
+        
+        try:
+            res = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
+        except Exception as e:
+            print(f"Failed to use GPU: {e}")
+    
+    def _check_writable(self) -> None:
+        """Raise if the index cannot be modified."""
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+        if self.read_only:
+            raise RuntimeError("FAISS index was opened read-only (memory-mapped)")
+    
+    async def save(self, path: Optional[str] = None) -> None:
+        """Write the index and its metadata to ``path``.
+        
+        Files are written to temporary names first and then renamed, so a
+        reader opening the snapshot never sees a half-written index.
+        """
+        await self._run(self._save, path)
+    
+    def _save(self, path: Optional[str] = None) -> None:
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+        
+        path = path or self.path
+        if not path:
+            raise ValueError("No path configured for saving the FAISS index")
+        os.makedirs(path, exist_ok=True)
+        
+        index = self.index
+        if hasattr(faiss, "index_gpu_to_cpu") and hasattr(index, "getDevice"):
+            index = faiss.index_gpu_to_cpu(index)
+        
+        index_path = os.path.join(path, INDEX_FILE)
+        metadata_path = os.path.join(path, METADATA_FILE)
+        
+        vectors_path = os.path.join(path, FULL_VECTORS_FILE)
+        
+        faiss.write_index(index, index_path + ".tmp")
+        self.metadata.save(os.path.join(path, METADATA_COLUMNS_DIR))
+        if self._full_vectors is not None:
+            self._full_vectors.save(vectors_path + ".tmp", self._next_id)
+        with open(metadata_path + ".tmp", "w") as f:
+            json.dump(
+                {
+                    "dimension": self.dimension,
+                    "metric": self.metric,
+                    "index_config": self._index_config(),
+                    "ids": list(self._id_to_internal.keys()),
+                    "internal_ids": list(self._id_to_internal.values()),
+                    "next_id": self._next_id,
+                    "tombstones": sorted(self._tombstones)
+                },
+                f
+            )
+        
+        # Vectors and metadata go first so a new index is never paired with
+        # stale ones; extra rows are harmless to an older index
+        if self._full_vectors is not None:
+            os.replace(vectors_path + ".tmp", vectors_path)
+        os.replace(metadata_path + ".tmp", metadata_path)
+        os.replace(index_path + ".tmp", index_path)
+    
+    async def load(self, path: Optional[str] = None, mmap: bool = False) -> None:
+        """Load the index and its metadata from ``path``.
+        
+        With ``mmap=True`` the index is memory-mapped read-only, so several
+        processes opening the same snapshot share one copy in the page cache.
+        """
+        await self._run(self._load, path, mmap, write=True)
+    
+    def _load(self, path: Optional[str], mmap: bool) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path configured for loading the FAISS index")
+        
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            saved = json.load(f)
+        
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        self.index = faiss.read_index(os.path.join(path, INDEX_FILE), io_flags)
+        self.dimension = saved["dimension"]
+        self.metric = saved["metric"]
+        self._configure_index({**saved.get("index_config", {}), **self._tuning})
+        self.metadata = ColumnarMetadataStore()
+        self.metadata.load(os.path.join(path, METADATA_COLUMNS_DIR), mmap=mmap)
+        vectors_path = os.path.join(path, FULL_VECTORS_FILE)
+        self._release_full_vectors()
+        if os.path.exists(vectors_path) and mmap:
+            self._full_vectors = VectorFile(self.dimension, vectors_path, read_only=True)
+        elif os.path.exists(vectors_path):
+            # Writes go to a working copy so the snapshot only changes on save()
+            working_path = self._working_vectors_path(path)
+            shutil.copyfile(vectors_path, working_path)
+            self._full_vectors = VectorFile(self.dimension, working_path)
+        self._precision_sample = None
+        self._precision_seen = 0
+        self._recall_estimate = None
+        self._rerank_recall = None
+        self._id_to_internal = dict(zip(saved["ids"], saved["internal_ids"]))
+        self._internal_to_id = dict(zip(saved["internal_ids"], saved["ids"]))
+        self._next_id = saved["next_id"]
+        self._tombstones = set(saved["tombstones"])
+        self._tombstone_selector = None
+        if self.rerank and self._full_vectors is None and not mmap:
+            # Reranking was turned on for a snapshot saved without it
+            internal_ids, vectors = self._live_vectors()
+            self._full_vectors = VectorFile(self.dimension, self._working_vectors_path(path))
+            self._full_vectors.write(internal_ids, vectors)
+        self._metadata_index.clear()
+        for internal_id, meta in self.metadata.items():
+            self._metadata_index.add(internal_id, meta)
+        self._rebuild_lexical_index()
+        self.path = path
+        self.read_only = mmap
+        
+        if not mmap:
+            self._maybe_move_to_gpu()
     
     async def add_vectors(
         self,
@@ -40,111 +771,423 @@ class FAISSStore(VectorStore):
         metadata: List[Dict[str, Any]],
         ids: Optional[List[str]] = None
     ) -> List[str]:
-        """Add vectors to the FAISS index."""
-        if self.index is None:
-            raise RuntimeError("FAISS index not initialized")
+        """Add vectors to the FAISS index.
+        
+        Adding an ID that already exists replaces the previous vector.
+        """
+        self._check_writable()
         
         if len(vectors) != len(metadata):
             raise ValueError("Number of vectors must match number of metadata entries")
         
+        return await self._run(self._add_vectors, vectors, metadata, ids, write=True)
+    
+    def _add_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: Optional[List[str]]
+    ) -> List[str]:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        internal_ids = np.arange(self._next_id, self._next_id + len(vectors), dtype=np.int64)
+        
         # Generate IDs if not provided
         if ids is None:
-            ids = [str(i) for i in range(self.index.ntotal, self.index.ntotal + len(vectors))]
+            ids = [str(i) for i in internal_ids]
+        
+        # Approximate indexes learn their coarse quantizer from the first batch
+        # that is large enough; smaller ones wait in a flat index
+        if not self.index.is_trained:
+            if len(vectors) < self._min_training_points():
+                self._stage_in_flat_index()
+            else:
+                self._train(vectors)
         
         # Add vectors to index
-        self.index.add(vectors)
+        self.index.add_with_ids(vectors, internal_ids)
+        self._store_full_vectors(internal_ids, vectors)
+        self._next_id += len(vectors)
         
-        # Store metadata
-        for i, id_ in enumerate(ids):
-            self.metadata[id_] = metadata[i]
+        # Store ID mapping and metadata, tombstoning any replaced entries
+        self.metadata.set_rows(internal_ids, metadata)
+        replaced = []
+        for internal_id, id_, meta in zip(internal_ids.tolist(), ids, metadata):
+            previous = self._id_to_internal.get(id_)
+            if previous is not None:
+                self._tombstone(previous)
+                self._metadata_index.remove(previous, self.metadata.get(previous) or {})
+                replaced.append(previous)
+            self._id_to_internal[id_] = internal_id
+            self._internal_to_id[internal_id] = id_
+            self._metadata_index.add(internal_id, meta)
+            text = meta.get(self.text_field)
+            if isinstance(text, str):
+                self._lexical_index.add(internal_id, text)
+        self.metadata.delete(np.asarray(replaced, dtype=np.int64))
         
+        self._maybe_promote()
+        self._maybe_grow_nlist()
         return ids
     
+    async def train(self, vectors: np.ndarray) -> None:
+        """Train an approximate index on a representative sample of vectors."""
+        self._check_writable()
+        if self.index.ntotal > 0:
+            raise RuntimeError("Cannot retrain a FAISS index that already holds vectors")
+        
+        await self._run(self._train, np.ascontiguousarray(vectors, dtype=np.float32), write=True)
+    
+    def _search(
+        self,
+        query_matrix: np.ndarray,
+        k: int,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Run a search and return distances and internal labels.
+        
+        Metadata filters are resolved through the inverted metadata index and
+        handed to FAISS as an ID selector, so filtered queries still fill all
+        ``k`` slots. Very selective filters skip the ANN index and run an
+        exact search over the matching vectors instead.
+        
+        With ``rerank`` enabled the index is asked for ``k * rerank_factor``
+        candidates, which are re-scored against the full-precision vectors.
+        Both default to the store's configuration.
+        """
+        query_matrix = np.ascontiguousarray(np.atleast_2d(query_matrix), dtype=np.float32)
+        if not self.index.is_trained or self.index.ntotal == 0:
+            # An untrained IVF index refuses to search; either way there is nothing to find
+            return self._exact_search(query_matrix, k, np.empty(0, dtype=np.int64))
+        
+        selector = None
+        if filter_criteria:
+            allowed = self._metadata_index.match(filter_criteria)
+            if len(allowed) <= max(k, self.exact_filter_fraction * len(self._internal_to_id)):
+                return self._exact_search(query_matrix, k, allowed)
+            selector = faiss.IDSelectorBatch(allowed)
+        
+        rerank = self.rerank if rerank is None else rerank
+        reranking = rerank and self._full_vectors is not None
+        fetch = k * (rerank_factor or self.rerank_factor) if reranking else k
+        params = self._search_params(fetch, nprobe, ef_search, selector=selector)
+        distances, labels = self.index.search(query_matrix, fetch, params=params)
+        if not reranking:
+            return distances, labels
+        return exact_rerank(query_matrix, labels, self._full_vectors, k, self.metric)
+    
+    def _exact_search(
+        self,
+        query_matrix: np.ndarray,
+        k: int,
+        internal_ids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force search restricted to ``internal_ids``."""
+        distances = np.full((len(query_matrix), k), np.inf, dtype=np.float32)
+        if self.metric == "ip":
+            distances.fill(-np.inf)
+        labels = np.full((len(query_matrix), k), -1, dtype=np.int64)
+        if len(internal_ids) == 0:
+            return distances, labels
+        
+        metric_type = self._metric_type()
+        if self._full_vectors is not None:
+            subset = np.asarray(self._full_vectors[internal_ids], dtype=np.float32)
+        else:
+            subset = self.index.reconstruct_batch(internal_ids)
+        found = min(k, len(internal_ids))
+        subset_distances, positions = faiss.knn(query_matrix, subset, found, metric=metric_type)
+        distances[:, :found] = subset_distances
+        labels[:, :found] = internal_ids[positions]
+        return distances, labels
+    
     async def search(
         self,
         query_vector: np.ndarray,
         k: int = 10,
-        filter_criteria: Optional[Dict[str, Any]] = None
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors."""
+        """Search for similar vectors.
+        
+        ``filter_criteria`` restricts hits to vectors whose metadata equals
+        every given value. ``nprobe`` (IVF), ``ef_search`` (HNSW), ``rerank``
+        and ``rerank_factor`` override the configured defaults for this query
+        only.
+        """
         if self.index is None:
             raise RuntimeError("FAISS index not initialized")
         
-        # Ensure query vector is 2D
-        if query_vector.ndim == 1:
-            query_vector = query_vector.reshape(1, -1)
-        
         # Search
         start_time = time.time()
-        distances, indices = self.index.search(query_vector, k)
+        hits = await self._run(
+            self._search_hits,
+            query_vector,
+            k,
+            filter_criteria,
+            nprobe,
+            ef_search,
+            rerank,
+            rerank_factor
+        )
         search_time = time.time() - start_time
         
         # Prepare results
         results = []
-        for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx == -1:  # FAISS returns -1 for empty slots
-                continue
-                
-            # Convert index to ID
-            id_ = str(idx)
-            if id_ not in self.metadata:
-                continue
-            
+        for id_, distance, meta in hits:
             result = {
                 "id": id_,
-                "distance": float(distance),
-                "metadata": self.metadata[id_],
+                "distance": distance,
+                "metadata": meta,
                 "search_time": search_time
             }
             results.append(result)
         
         return results
     
+    def _search_hits(self, *search_args: Any) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Run :meth:`_search` for one query and return ``(id, distance, metadata)`` hits.
+        
+        IDs and metadata are resolved inside the same locked call as the
+        search, so a concurrent add or delete cannot change them mid-gather.
+        """
+        distances, indices = self._search(*search_args)
+        hits = []
+        for distance, idx in zip(distances[0].tolist(), indices[0].tolist()):
+            # Convert internal index to external ID; FAISS returns -1 for empty slots
+            id_ = self._internal_to_id.get(idx)
+            if id_ is None:
+                continue
+            hits.append((idx, id_, distance))
+        
+        # Gather metadata for all hits at once from the columnar store
+        rows = self.metadata.take(np.array([hit[0] for hit in hits], dtype=np.int64))
+        return [(id_, distance, meta) for (_, id_, distance), meta in zip(hits, rows)]
+    
+    async def search_batch(
+        self,
+        query_matrix: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search all rows of ``query_matrix`` with a single ``index.search`` call."""
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+        
+        return await self._run(
+            self._search_ids,
+            query_matrix,
+            k,
+            filter_criteria,
+            nprobe,
+            ef_search,
+            rerank,
+            rerank_factor
+        )
+    
+    def _search_ids(self, *search_args: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Run :meth:`_search` and map its labels to external IDs in the same locked call.
+        
+        A delete or compaction between the two steps could otherwise remap
+        the internal IDs and return the wrong external ones.
+        """
+        distances, indices = self._search(*search_args)
+        return distances, self._to_external_ids(indices)
+    
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 search over the ``text_field`` of each vector's metadata."""
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+        
+        start_time = time.time()
+        hits = await self._run(self._lexical_search, query_text, k, filter_criteria)
+        search_time = time.time() - start_time
+        
+        return [
+            {
+                "id": id_,
+                "score": score,
+                "metadata": meta,
+                "search_time": search_time
+            }
+            for id_, score, meta in hits
+        ]
+    
+    def _lexical_search(
+        self,
+        query_text: str,
+        k: int,
+        filter_criteria: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Return ``(id, score, metadata)`` BM25 hits, resolved under the read lock."""
+        allowed = self._metadata_index.match(filter_criteria) if filter_criteria else None
+        scores, internal_ids = self._lexical_index.search(query_text, k, allowed)
+        rows = self.metadata.take(internal_ids)
+        return [
+            (self._internal_to_id[internal_id], score, meta)
+            for score, internal_id, meta in zip(scores.tolist(), internal_ids.tolist(), rows)
+        ]
+    
+    def _to_external_ids(self, indices: np.ndarray) -> np.ndarray:
+        """Map a matrix of internal FAISS labels to external IDs (``None`` for misses)."""
+        lookup = self._internal_to_id.get
+        ids = np.empty(indices.shape, dtype=object)
+        ids.ravel()[:] = [lookup(idx) for idx in indices.ravel().tolist()]
+        return ids
+    
+    def _tombstone(self, internal_id: int) -> None:
+        """Mark an internal ID as deleted without touching the index."""
+        del self._internal_to_id[internal_id]
+        self._tombstones.add(internal_id)
+        self._tombstone_selector = None
+        self._lexical_index.remove(internal_id)
+    
     async def delete_vectors(self, ids: List[str]) -> None:
-        """Delete vectors by their IDs."""
-        # FAISS doesn't support direct deletion, so we need to rebuild the index
+        """Delete vectors by their IDs.
+        
+        Deletes only tombstone the vectors; they are filtered out at search
+        time and physically removed by a background compaction once they pass
+        ``compaction_threshold`` of the index.
+        """
         if not ids:
             return
+        self._check_writable()
         
-        # Get all current vectors
-        all_vectors = faiss.vector_to_array(self.index.get_xb())
-        all_metadata = self.metadata.copy()
+        await self._run(self._delete_vectors, ids, write=True)
         
-        # Clear current index
-        self.index = None
-        await self.initialize({"dimension": self.dimension, "metric": self.metric})
-        
-        # Rebuild index without deleted vectors
-        new_vectors = []
-        new_metadata = {}
-        
-        for i, id_ in enumerate(all_metadata.keys()):
-            if id_ not in ids:
-                new_vectors.append(all_vectors[i])
-                new_metadata[id_] = all_metadata[id_]
-        
-        if new_vectors:
-            await self.add_vectors(
-                np.array(new_vectors),
-                list(new_metadata.values()),
-                list(new_metadata.keys())
+        if self._should_compact() and (
+            self._compaction_task is None or self._compaction_task.done()
+        ):
+            self._compaction_task = asyncio.get_running_loop().create_task(self.compact())
+            self._compaction_task.add_done_callback(self._compaction_done)
+    
+    def _compaction_done(self, task: "asyncio.Task[None]") -> None:
+        """Log a failed background compaction and forget the finished task."""
+        if self._compaction_task is task:
+            self._compaction_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background compaction failed", exc_info=task.exception())
+    
+    def _delete_vectors(self, ids: List[str]) -> None:
+        deleted = []
+        for id_ in ids:
+            internal_id = self._id_to_internal.pop(id_, None)
+            if internal_id is None:
+                continue
+            self._tombstone(internal_id)
+            self._metadata_index.remove(internal_id, self.metadata.get(internal_id) or {})
+            deleted.append(internal_id)
+        self.metadata.delete(np.asarray(deleted, dtype=np.int64))
+    
+    async def compact(self) -> None:
+        """Remove tombstoned vectors from the index."""
+        self._check_writable()
+        await self._run(self._compact, write=True)
+    
+    def _index_stats(self) -> Dict[str, Any]:
+        """Return build parameters and structure statistics of the index.
+        
+        IVF indexes report how evenly vectors are spread over their lists
+        (an imbalance factor of 1.0 is perfectly even); HNSW indexes report
+        their graph parameters and the number of nodes on each level.
+        """
+        stats: Dict[str, Any] = {
+            "ntotal": self.index.ntotal,
+            "tombstone_fraction": len(self._tombstones) / max(1, self.index.ntotal)
+        }
+        if hasattr(self.index, "gpu_index"):
+            return stats
+        
+        if self.index_type in IVF_INDEX_TYPES:
+            ivf = faiss.extract_index_ivf(self.index)
+            sizes = np.array(
+                [ivf.invlists.list_size(i) for i in range(ivf.nlist)], dtype=np.int64
             )
+            total = max(1, int(sizes.sum()))
+            stats.update({
+                "nlist": ivf.nlist,
+                "list_size_min": int(sizes.min()),
+                "list_size_max": int(sizes.max()),
+                "list_size_mean": float(sizes.mean()),
+                "empty_lists": int((sizes == 0).sum()),
+                "imbalance_factor": float(len(sizes) * (sizes ** 2).sum() / total ** 2)
+            })
+            if self.index_type == "ivf_pq":
+                stats.update({"pq_m": self.pq_m, "pq_nbits": self.pq_nbits})
+        elif self.index_type == "hnsw":
+            hnsw = faiss.downcast_index(self._base_index()).hnsw
+            levels = faiss.vector_to_array(hnsw.levels)
+            stats.update({
+                "m": self.hnsw_m,
+                "ef_construction": hnsw.efConstruction,
+                "max_level": int(hnsw.max_level),
+                "nodes_per_level": np.bincount(levels)[1:].tolist() if len(levels) else []
+            })
+        return stats
     
     async def get_metrics(self) -> Dict[str, Any]:
         """Get FAISS index metrics."""
         if self.index is None:
             return {"status": "not_initialized"}
         
+        recall = await self._run(self._estimate_precision_recall) or {}
+        index_stats = await self._run(self._index_stats)
         return {
-            "total_vectors": self.index.ntotal,
+            "total_vectors": len(self._internal_to_id),
+            "tombstoned_vectors": len(self._tombstones),
             "dimension": self.dimension,
             "metric": self.metric,
+            "index_type": self.index_type,
+            "is_trained": self.index.is_trained,
+            "nlist": self.nlist if self.index_type in IVF_INDEX_TYPES else None,
+            "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+            "storage_dtype": self.storage_dtype,
+            "rerank": self.rerank,
+            "rerank_factor": self.rerank_factor if self.rerank else None,
+            "quantization_recall_at_10": recall.get("quantized_recall_at_10"),
+            "rerank_recall_at_10": recall.get("reranked_recall_at_10"),
+            "rerank_recall": self._rerank_recall,
             "is_gpu": hasattr(self.index, "gpu_index"),
-            "metadata_count": len(self.metadata)
+            "metadata_count": len(self.metadata),
+            "metadata_bytes": self.metadata.nbytes(),
+            "lexical_documents": len(self._lexical_index),
+            "path": self.path,
+            "read_only": self.read_only,
+            "index_stats": index_stats
         }
     
     async def clear(self) -> None:
         """Clear all vectors from the store."""
-        self.index = None
-        self.metadata = {}
-        await self.initialize({"dimension": self.dimension, "metric": self.metric}) 
\ No newline at end of file
+        self._check_writable()
+        await self._run(self._clear, write=True)
+    
+    def _clear(self) -> None:
+        self.metadata.clear()
+        self._id_to_internal = {}
+        self._internal_to_id = {}
+        self._tombstones = set()
+        self._tombstone_selector = None
+        self._metadata_index.clear()
+        self._lexical_index.clear()
+        self._release_full_vectors()
+        self._precision_sample = None
+        self._precision_seen = 0
+        self._recall_estimate = None
+        self._rerank_recall = None
+        self._create_index()
\ No newline at end of file
@@ -0,0 +1,304 @@
+import asyncio
+import json
+import os
+import time
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+import numpy as np
+
+from evalkit.embed.base import Embedder
+from evalkit.vector.base import VectorStore
+
+# Records split for writing: (ids, texts or vectors, metadata, end offset, skipped rows)
+Chunk = Tuple[Optional[List[str]], Any, List[Dict[str, Any]], int, int]
+
+def _jsonl_records(path: str, batch_size: int, offset: int) -> Iterator[Tuple[List[Dict], int]]:
+    """Yield ``(records, next_offset)`` where offsets are byte positions."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        records = []
+        for line in f:
+            offset += len(line)
+            if not line.strip():
+                continue
+            records.append(json.loads(line))
+            if len(records) >= batch_size:
+                yield records, offset
+                records = []
+        if records:
+            yield records, offset
+
+def _parquet_records(path: str, batch_size: int, offset: int) -> Iterator[Tuple[List[Dict], int]]:
+    """Yield ``(records, next_offset)`` where offsets are row numbers.
+    
+    Row groups before ``offset`` are not read at all.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet needs pyarrow; install it with `pip install evalkit[parquet]`"
+        ) from e
+    
+    parquet_file = pq.ParquetFile(path)
+    first_group, skip = 0, offset
+    while (
+        first_group < parquet_file.num_row_groups
+        and skip >= parquet_file.metadata.row_group(first_group).num_rows
+    ):
+        skip -= parquet_file.metadata.row_group(first_group).num_rows
+        first_group += 1
+    
+    position = offset - skip
+    row_groups = range(first_group, parquet_file.num_row_groups)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=row_groups):
+        records = batch.to_pylist()
+        drop = min(skip, len(records))
+        records = records[drop:]
+        skip -= drop
+        position += drop + len(records)
+        if records:
+            yield records, position
+
+def read_records(
+    path: str,
+    batch_size: int = 1000,
+    offset: int = 0,
+    file_format: Optional[str] = None
+) -> Iterator[Tuple[List[Dict], int]]:
+    """Read ``path`` in chunks of ``batch_size`` records, starting at ``offset``.
+    
+    ``file_format`` is ``jsonl`` or ``parquet`` and defaults to the file
+    extension. Each chunk comes with the offset to resume after it.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format in ("jsonl", "ndjson", "json"):
+        return _jsonl_records(path, batch_size, offset)
+    if file_format in ("parquet", "pq"):
+        return _parquet_records(path, batch_size, offset)
+    raise ValueError(f"Unsupported ingest format: {file_format}")
+
+def load_checkpoint(path: str, source: str) -> Optional[Dict[str, Any]]:
+    """Return the checkpoint at ``path`` if it belongs to ``source``."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != os.path.abspath(source):
+        raise ValueError(f"Checkpoint {path} belongs to {checkpoint.get('source')}, not {source}")
+    return checkpoint
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """Write ``checkpoint`` atomically."""
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+class IngestPipeline:
+    """Streams records from a JSONL or Parquet file into a vector store.
+    
+    Reading, embedding and writing run as concurrent stages joined by
+    bounded queues: at most ``queue_size`` chunks wait to be embedded and
+    ``embed_concurrency`` chunks are being embedded, so memory stays flat
+    however large the source is and a slow store throttles the reader.
+    Chunks are written in source order.
+    
+    Each record's ``text_field`` is embedded, or with ``vector_field`` set
+    the record's precomputed vector is used instead. The remaining fields
+    become metadata, with ``id_field`` used as the vector ID. Records
+    without text (or without a vector), or without an ID when ``id_field``
+    is set, are skipped and counted.
+    
+    Every ``checkpoint_every`` rows, the store is saved (if it has a
+    ``save`` method) and the source offset is written to ``checkpoint_path``,
+    and a later run resumes from there. Rows written after the last
+    checkpoint are written again on resume; FAISS replaces them by ID,
+    while pgvector assigns new IDs, so keep ``checkpoint_every`` small
+    there.
+    
+    A FAISS ``save`` rewrites the whole snapshot, so saving every fixed
+    number of rows costs time and disk writes quadratic in the corpus
+    size. For stores with ``save`` the interval therefore grows to at least
+    ``checkpoint_growth`` times the rows written so far; with the default
+    of 0.5 the snapshots written add up to about three times the final
+    one, at the price of redoing up to a third of the rows after a crash.
+    Set ``checkpoint_growth=0`` for a fixed interval.
+    """
+    
+    def __init__(
+        self,
+        store: VectorStore,
+        embedder: Optional[Embedder] = None,
+        text_field: str = "text",
+        id_field: Optional[str] = None,
+        vector_field: Optional[str] = None,
+        batch_size: int = 1000,
+        queue_size: int = 4,
+        embed_concurrency: int = 4,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10000,
+        checkpoint_growth: float = 0.5
+    ):
+        self.store = store
+        self.embedder = embedder
+        self.text_field = text_field
+        self.id_field = id_field
+        self.vector_field = vector_field
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.embed_concurrency = embed_concurrency
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_growth = checkpoint_growth
+    
+    def _chunk(self, records: List[Dict[str, Any]], end_offset: int) -> Chunk:
+        """Split raw records into IDs, texts or vectors, and metadata."""
+        ids, inputs, metadata = [], [], []
+        for record in records:
+            if self.vector_field:
+                value = record.pop(self.vector_field, None)
+            else:
+                value = record.get(self.text_field)
+                if not isinstance(value, str) or not value:
+                    value = None
+            if value is None:
+                continue
+            if self.id_field:
+                record_id = record.pop(self.id_field, None)
+                if record_id is None:
+                    continue
+                ids.append(str(record_id))
+            inputs.append(value)
+            metadata.append(record)
+        
+        if self.vector_field and inputs:
+            inputs = np.asarray(inputs, dtype=np.float32)
+        return (
+            ids if self.id_field else None,
+            inputs,
+            metadata,
+            end_offset,
+            len(records) - len(metadata)
+        )
+    
+    async def _embed(self, inputs: Any) -> np.ndarray:
+        if self.vector_field:
+            return inputs
+        return await self.embedder.embed(inputs)
+    
+    async def run(
+        self,
+        source: str,
+        file_format: Optional[str] = None,
+        resume: bool = True,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Ingest ``source`` and return the final progress counters.
+        
+        ``on_progress`` is called after every chunk with the same counters:
+        ``rows`` written, ``skipped``, ``rows_per_s`` and ``offset``.
+        """
+        if not self.vector_field and self.embedder is None:
+            raise ValueError("An embedder is required unless records carry vectors")
+        
+        checkpoint = None
+        if resume and self.checkpoint_path:
+            checkpoint = load_checkpoint(self.checkpoint_path, source)
+        offset = checkpoint["offset"] if checkpoint else 0
+        progress = {
+            "rows": checkpoint["rows"] if checkpoint else 0,
+            "skipped": checkpoint.get("skipped", 0) if checkpoint else 0,
+            "rows_per_s": 0.0,
+            "offset": offset,
+            "resumed_from": offset
+        }
+        
+        loop = asyncio.get_running_loop()
+        records = read_records(source, self.batch_size, offset, file_format)
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.embed_concurrency)
+        
+        async def read() -> None:
+            while True:
+                # File reads and JSON/Arrow decoding stay off the event loop
+                item = await loop.run_in_executor(None, next, records, None)
+                if item is None:
+                    await read_queue.put(None)
+                    return
+                await read_queue.put(self._chunk(*item))
+        
+        async def embed() -> None:
+            while True:
+                chunk = await read_queue.get()
+                if chunk is None:
+                    await write_queue.put(None)
+                    return
+                # Queued as a running task so several chunks embed at once
+                await write_queue.put((chunk, asyncio.ensure_future(self._embed(chunk[1]))))
+        
+        async def write() -> None:
+            start = time.perf_counter()
+            written = 0
+            since_checkpoint = 0
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    break
+                (ids, _, metadata, end_offset, skipped), vectors = item
+                vectors = await vectors
+                if metadata:
+                    await self.store.add_vectors(vectors, metadata, ids)
+                
+                written += len(metadata)
+                since_checkpoint += len(metadata)
+                progress["rows"] += len(metadata)
+                progress["skipped"] += skipped
+                progress["offset"] = end_offset
+                progress["rows_per_s"] = written / max(time.perf_counter() - start, 1e-9)
+                if since_checkpoint >= self._checkpoint_interval(progress["rows"]):
+                    await self._checkpoint(source, progress)
+                    since_checkpoint = 0
+                if on_progress is not None:
+                    on_progress(dict(progress))
+            
+            await self._checkpoint(source, progress, complete=True)
+        
+        tasks = [asyncio.ensure_future(stage()) for stage in (read, embed, write)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # Embedding tasks still queued between the stages
+            while not write_queue.empty():
+                item = write_queue.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+            raise
+        
+        return progress
+    
+    def _checkpoint_interval(self, rows: int) -> int:
+        """Rows to write before the next checkpoint, given ``rows`` written so far."""
+        if getattr(self.store, "save", None) is None:
+            return self.checkpoint_every
+        return max(self.checkpoint_every, int(rows * self.checkpoint_growth))
+    
+    async def _checkpoint(
+        self,
+        source: str,
+        progress: Dict[str, Any],
+        complete: bool = False
+    ) -> None:
+        """Make written rows durable, then record how far the source was read."""
+        save = getattr(self.store, "save", None)
+        if save is not None:
+            await save()
+        if self.checkpoint_path:
+            save_checkpoint(self.checkpoint_path, {
+                "source": os.path.abspath(source),
+                "offset": progress["offset"],
+                "rows": progress["rows"],
+                "skipped": progress["skipped"],
+                "complete": complete,
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            })
\ No newline at end of file
@@ -0,0 +1,145 @@
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+
+# Words, plus compound tokens such as product codes (SKU-1042) and versions (v1.2.3)
+_TOKEN_PATTERN = re.compile(r"\w+(?:[-.:/]\w+)*")
+_PART_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` into terms.
+    
+    Compound tokens are kept whole and also split into their parts, so an
+    exact code like ``ERR-1042`` matches strongly while ``1042`` alone still
+    matches.
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        terms.append(token)
+        parts = _PART_PATTERN.findall(token)
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists, scoring each ID by the sum of ``1 / (k + rank)``."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking, start=1):
+            scores[id_] = scores.get(id_, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+class BM25Index:
+    """In-memory BM25 index over documents addressed by internal vector ID.
+    
+    Postings are appended on add and turned into NumPy arrays on first use,
+    so scoring a query term is a handful of vectorized operations over its
+    posting list. Removed documents are masked out rather than unlinked;
+    document frequencies and lengths are computed over live documents only.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=np.bool_)
+    
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = len(self._live)
+        if size <= capacity:
+            return
+        
+        capacity = max(size, 2 * capacity, 1024)
+        extra = capacity - len(self._live)
+        self._lengths = np.concatenate([self._lengths, np.zeros(extra, dtype=np.float32)])
+        self._live = np.concatenate([self._live, np.zeros(extra, dtype=np.bool_)])
+    
+    def add(self, internal_id: int, text: str) -> None:
+        """Index the text of one document."""
+        terms = tokenize(text)
+        self._ensure_capacity(internal_id + 1)
+        self._lengths[internal_id] = len(terms)
+        self._live[internal_id] = True
+        
+        for term, count in Counter(terms).items():
+            ids, counts = self._postings.setdefault(term, ([], []))
+            ids.append(internal_id)
+            counts.append(count)
+            self._arrays.pop(term, None)
+    
+    def remove(self, internal_id: int) -> None:
+        """Exclude one document from future searches."""
+        if internal_id < len(self._live):
+            self._live[internal_id] = False
+    
+    def _posting(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self._postings.get(term)
+            if posting is None:
+                return None
+            arrays = (
+                np.asarray(posting[0], dtype=np.int64),
+                np.asarray(posting[1], dtype=np.float32)
+            )
+            self._arrays[term] = arrays
+        return arrays
+    
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the BM25 scores and internal IDs of the top ``k`` documents.
+        
+        ``allowed`` optionally restricts results to the given internal IDs.
+        """
+        empty = (np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64))
+        num_docs = int(self._live.sum())
+        if num_docs == 0:
+            return empty
+        
+        average_length = max(float(self._lengths[self._live].mean()), 1.0)
+        scores = np.zeros(len(self._live), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._posting(term)
+            if posting is None:
+                continue
+            ids, counts = posting
+            live = self._live[ids]
+            ids, counts = ids[live], counts[live]
+            if len(ids) == 0:
+                continue
+            
+            idf = math.log(1 + (num_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = counts + self.k1 * (1 - self.b + self.b * self._lengths[ids] / average_length)
+            scores[ids] += idf * counts * (self.k1 + 1) / norm
+        
+        mask = scores > 0
+        if allowed is not None:
+            allowed_mask = np.zeros(len(scores), dtype=np.bool_)
+            allowed_mask[allowed[allowed < len(scores)]] = True
+            mask &= allowed_mask
+        
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return empty
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = np.argsort(-scores[candidates], kind="stable")
+        return scores[candidates[order]], candidates[order]
+    
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._postings = {}
+        self._arrays = {}
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=np.bool_)
+    
+    def __len__(self) -> int:
+        return int(self._live.sum())
\ No newline at end of file
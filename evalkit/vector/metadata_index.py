@@ -0,0 +1,55 @@
+from collections import defaultdict
+from typing import Dict, Any, Hashable, Set, Tuple
+import numpy as np
+
+class InvertedMetadataIndex:
+    """Inverted index from metadata ``(key, value)`` pairs to internal vector IDs.
+    
+    Only scalar (hashable) metadata values are indexed; filters are equality
+    matches combined with AND, like the pgvector store's metadata filters.
+    """
+    
+    def __init__(self):
+        self._postings: Dict[Tuple[str, Hashable], Set[int]] = defaultdict(set)
+    
+    def add(self, internal_id: int, metadata: Dict[str, Any]) -> None:
+        """Index the metadata of one vector."""
+        for key, value in metadata.items():
+            if isinstance(value, Hashable):
+                self._postings[(key, value)].add(internal_id)
+    
+    def remove(self, internal_id: int, metadata: Dict[str, Any]) -> None:
+        """Drop one vector from the postings it appears in."""
+        for key, value in metadata.items():
+            if not isinstance(value, Hashable):
+                continue
+            posting = self._postings.get((key, value))
+            if posting is None:
+                continue
+            posting.discard(internal_id)
+            if not posting:
+                del self._postings[(key, value)]
+    
+    def match(self, filter_criteria: Dict[str, Any]) -> np.ndarray:
+        """Return the sorted internal IDs whose metadata matches every criterion."""
+        postings = []
+        for key, value in filter_criteria.items():
+            posting = self._postings.get((key, value)) if isinstance(value, Hashable) else None
+            if not posting:
+                return np.empty(0, dtype=np.int64)
+            postings.append(posting)
+        
+        # Intersect starting from the most selective posting list
+        postings.sort(key=len)
+        matched = set(postings[0])
+        for posting in postings[1:]:
+            matched &= posting
+        
+        return np.sort(np.fromiter(matched, dtype=np.int64, count=len(matched)))
+    
+    def clear(self) -> None:
+        """Remove all postings."""
+        self._postings.clear()
+    
+    def __len__(self) -> int:
+        return len(self._postings)
\ No newline at end of file
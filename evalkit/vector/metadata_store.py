@@ -0,0 +1,325 @@
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import os
+import shutil
+import numpy as np
+
+SCHEMA_FILE = "schema.json"
+
+_NUMPY_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64}
+
+def _infer_kind(value: Any) -> str:
+    """Return the column kind able to hold ``value``."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "object"
+
+def _common_kind(kind: str, other: str) -> str:
+    """Return the narrowest kind able to hold values of both kinds.
+    
+    Mixed ``int``/``float`` columns are stored as objects rather than
+    floats, so ``{"page": 1}`` still reads back as ``1`` and not ``1.0``.
+    """
+    if kind == other:
+        return kind
+    return "object"
+
+class _Column:
+    """One metadata key stored as a typed array plus a validity mask.
+    
+    String values are interned: the column holds ``int32`` codes into a
+    per-column dictionary, so repeated values such as source names or
+    document types cost four bytes per row.
+    """
+    
+    def __init__(self, kind: str, capacity: int):
+        self.kind = kind
+        self.dictionary: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.values = self._empty(kind, capacity)
+        self.valid = np.zeros(capacity, dtype=np.bool_)
+    
+    @staticmethod
+    def _empty(kind: str, capacity: int) -> np.ndarray:
+        if kind == "str":
+            return np.full(capacity, -1, dtype=np.int32)
+        if kind == "object":
+            return np.full(capacity, None, dtype=object)
+        return np.zeros(capacity, dtype=_NUMPY_DTYPES[kind])
+    
+    def grow(self, capacity: int) -> None:
+        """Extend the column to ``capacity`` rows, all missing."""
+        extra = capacity - len(self.valid)
+        self.values = np.concatenate([self.values, self._empty(self.kind, extra)])
+        self.valid = np.concatenate([self.valid, np.zeros(extra, dtype=np.bool_)])
+    
+    def _intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.dictionary)
+            self._codes[value] = code
+            self.dictionary.append(value)
+        return code
+    
+    def _convert(self, kind: str) -> None:
+        """Change the column kind, keeping the existing values."""
+        rows = np.flatnonzero(self.valid)
+        existing = self.take(rows)
+        self.kind = kind
+        self.dictionary = []
+        self._codes = {}
+        self.values = self._empty(kind, len(self.valid))
+        self.valid[:] = False
+        self.set(rows, existing)
+    
+    def set(self, rows: np.ndarray, values: List[Any]) -> None:
+        """Write ``values`` into ``rows``."""
+        kind = self.kind
+        for value in values:
+            kind = _common_kind(kind, _infer_kind(value))
+        if kind != self.kind:
+            self._convert(kind)
+        
+        if kind == "str":
+            self.values[rows] = [self._intern(value) for value in values]
+        elif kind == "object":
+            for row, value in zip(rows.tolist(), values):
+                self.values[row] = value
+        else:
+            self.values[rows] = values
+        self.valid[rows] = True
+    
+    def clear(self, rows: np.ndarray) -> None:
+        """Mark ``rows`` as missing."""
+        self.valid[rows] = False
+        if self.kind == "str":
+            self.values[rows] = -1
+        elif self.kind == "object":
+            self.values[rows] = None
+    
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """Return the raw column values for ``rows`` (codes for string columns)."""
+        return self.values[rows]
+    
+    def take(self, rows: np.ndarray) -> List[Any]:
+        """Return Python values for ``rows``, with ``None`` for missing rows."""
+        values = self.values[rows]
+        valid = self.valid[rows]
+        if self.kind == "str":
+            dictionary = self.dictionary
+            return [dictionary[code] if ok else None for code, ok in zip(values.tolist(), valid)]
+        return [value if ok else None for value, ok in zip(values.tolist(), valid)]
+    
+    def pruned(self) -> Tuple[List[str], np.ndarray]:
+        """Return the dictionary without strings no row uses, and the codes remapped to it."""
+        used = np.unique(self.values[self.valid])
+        if len(used) == len(self.dictionary):
+            return self.dictionary, self.values
+        
+        # The extra trailing slot maps the -1 code of missing rows to itself
+        remap = np.full(len(self.dictionary) + 1, -1, dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        return [self.dictionary[code] for code in used.tolist()], remap[self.values]
+    
+    def prune(self) -> None:
+        """Drop strings no row uses from the dictionary."""
+        self.dictionary, self.values = self.pruned()
+        self._codes = {value: code for code, value in enumerate(self.dictionary)}
+    
+    def nbytes(self) -> int:
+        """Approximate memory used by the column."""
+        size = self.values.nbytes + self.valid.nbytes
+        if self.kind == "str":
+            size += sum(len(value) for value in self.dictionary)
+        return size
+
+class ColumnarMetadataStore:
+    """Column-oriented metadata addressed by internal vector ID.
+    
+    Internal IDs are dense, so they double as row numbers: gathering the
+    metadata of a result set is one fancy-indexing operation per column
+    instead of a dict lookup per hit. ``None`` values are stored as missing.
+    """
+    
+    def __init__(self):
+        self._columns: Dict[str, _Column] = {}
+        self._present = np.zeros(0, dtype=np.bool_)
+        self._count = 0
+    
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = len(self._present)
+        if size <= capacity:
+            return
+        
+        capacity = max(size, 2 * capacity, 1024)
+        self._present = np.concatenate(
+            [self._present, np.zeros(capacity - len(self._present), dtype=np.bool_)]
+        )
+        for column in self._columns.values():
+            column.grow(capacity)
+    
+    def set_rows(self, internal_ids: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
+        """Store one metadata dict per internal ID."""
+        internal_ids = np.asarray(internal_ids, dtype=np.int64)
+        if len(internal_ids) == 0:
+            return
+        self._ensure_capacity(int(internal_ids.max()) + 1)
+        self.delete(internal_ids)
+        
+        # Group values by key so each column is written once per batch
+        by_key: Dict[str, List[Any]] = {}
+        rows_by_key: Dict[str, List[int]] = {}
+        for row, meta in zip(internal_ids.tolist(), metadata):
+            for key, value in meta.items():
+                if value is None:
+                    continue
+                by_key.setdefault(key, []).append(value)
+                rows_by_key.setdefault(key, []).append(row)
+        
+        for key, values in by_key.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = _Column(_infer_kind(values[0]), len(self._present))
+                self._columns[key] = column
+            column.set(np.asarray(rows_by_key[key], dtype=np.int64), values)
+        
+        self._present[internal_ids] = True
+        self._count = int(self._present.sum())
+    
+    def delete(self, internal_ids: np.ndarray) -> None:
+        """Drop the metadata of ``internal_ids``."""
+        internal_ids = np.asarray(internal_ids, dtype=np.int64)
+        internal_ids = internal_ids[internal_ids < len(self._present)]
+        for column in self._columns.values():
+            column.clear(internal_ids)
+        self._present[internal_ids] = False
+        self._count = int(self._present.sum())
+    
+    def get(self, internal_id: int) -> Optional[Dict[str, Any]]:
+        """Return the metadata of one internal ID, or ``None`` if absent."""
+        if internal_id >= len(self._present) or not self._present[internal_id]:
+            return None
+        return self.take(np.array([internal_id], dtype=np.int64))[0]
+    
+    def take(self, internal_ids: np.ndarray) -> List[Dict[str, Any]]:
+        """Gather the metadata dicts of ``internal_ids`` in order."""
+        internal_ids = np.asarray(internal_ids, dtype=np.int64)
+        rows: List[Dict[str, Any]] = [{} for _ in range(len(internal_ids))]
+        for key, column in self._columns.items():
+            for row, value in zip(rows, column.take(internal_ids)):
+                if value is not None:
+                    row[key] = value
+        return rows
+    
+    def gather(self, key: str, internal_ids: np.ndarray) -> np.ndarray:
+        """Return one column for ``internal_ids`` as an array.
+        
+        String columns are decoded through their dictionary; missing values
+        come back as ``None``.
+        """
+        column = self._columns.get(key)
+        if column is None:
+            return np.full(len(internal_ids), None, dtype=object)
+        if column.kind != "str":
+            values = column.gather(internal_ids).astype(object)
+            values[~column.valid[internal_ids]] = None
+            return values
+        
+        dictionary = np.asarray(column.dictionary + [None], dtype=object)
+        return dictionary[column.gather(internal_ids)]
+    
+    def items(self) -> List[Any]:
+        """Return ``(internal_id, metadata)`` pairs for every stored row."""
+        internal_ids = np.flatnonzero(self._present)
+        return list(zip(internal_ids.tolist(), self.take(internal_ids)))
+    
+    def compact(self) -> None:
+        """Release strings and columns that deleted rows left unused.
+        
+        String dictionaries only grow as values are written, so without this
+        every value ever stored stays interned.
+        """
+        for key, column in list(self._columns.items()):
+            if not column.valid.any():
+                del self._columns[key]
+            elif column.kind == "str":
+                column.prune()
+    
+    def nbytes(self) -> int:
+        """Approximate memory used by all columns."""
+        return self._present.nbytes + sum(column.nbytes() for column in self._columns.values())
+    
+    def clear(self) -> None:
+        """Remove all rows and columns."""
+        self._columns = {}
+        self._present = np.zeros(0, dtype=np.bool_)
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def save(self, path: str) -> None:
+        """Write the columns to the directory ``path``.
+        
+        Typed columns are stored as ``.npy`` files so :meth:`load` can memory-map
+        them; object columns are stored in the JSON schema. String
+        dictionaries are written without the values no row uses any more.
+        """
+        tmp_path = path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        
+        schema: Dict[str, Any] = {"columns": []}
+        np.save(os.path.join(tmp_path, "present.npy"), self._present)
+        for i, (key, column) in enumerate(self._columns.items()):
+            entry: Dict[str, Any] = {"key": key, "kind": column.kind}
+            values = column.values
+            if column.kind == "str":
+                entry["dictionary"], values = column.pruned()
+            if column.kind == "object":
+                entry["values"] = values.tolist()
+            else:
+                np.save(os.path.join(tmp_path, f"{i}.values.npy"), values)
+            np.save(os.path.join(tmp_path, f"{i}.valid.npy"), column.valid)
+            schema["columns"].append(entry)
+        
+        with open(os.path.join(tmp_path, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f)
+        
+        # Directories cannot be replaced atomically, so swap via a backup name
+        old_path = path + ".old"
+        shutil.rmtree(old_path, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, old_path)
+        os.rename(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    
+    def load(self, path: str, mmap: bool = False) -> None:
+        """Read columns written by :meth:`save`, optionally memory-mapped read-only."""
+        mmap_mode = "r" if mmap else None
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        
+        self._present = np.load(os.path.join(path, "present.npy"), mmap_mode=mmap_mode)
+        self._columns = {}
+        for i, entry in enumerate(schema["columns"]):
+            column = _Column(entry["kind"], 0)
+            if column.kind == "str":
+                column.dictionary = entry["dictionary"]
+                column._codes = {value: code for code, value in enumerate(column.dictionary)}
+            if column.kind == "object":
+                column.values = np.empty(len(entry["values"]), dtype=object)
+                column.values[:] = entry["values"]
+            else:
+                column.values = np.load(
+                    os.path.join(path, f"{i}.values.npy"), mmap_mode=mmap_mode
+                )
+            column.valid = np.load(os.path.join(path, f"{i}.valid.npy"), mmap_mode=mmap_mode)
+            self._columns[entry["key"]] = column
+        self._count = int(self._present.sum())
\ No newline at end of file
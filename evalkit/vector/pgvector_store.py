@@ -1,11 +1,73 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import io
+import json
+import math
+import re
+import struct
 import numpy as np
+from pgvector import Vector
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 import time
 
-from evalkit.db.database import get_db
+from evalkit.db.database import db_session, engine
 from evalkit.vector.base import VectorStore
+from evalkit.vector.rerank import recall_at_k
+
+# Binary COPY framing: signature, flags and header-extension length, then a -1 field count
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+INDEX_METHODS = ("ivfflat", "hnsw")
+
+def _default_lists(rows: int) -> int:
+    """pgvector's guidance for IVF lists: rows / 1000 up to 1M rows, then sqrt(rows)."""
+    if rows <= 1000000:
+        return max(1, rows // 1000)
+    return int(math.sqrt(rows))
+
+def _copy_payload(
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    metadata: List[Dict[str, Any]],
+    half: bool = False
+) -> bytes:
+    """Encode ``(id, embedding, metadata)`` rows in the binary COPY format.
+    
+    The fixed-size part of every row is built as one NumPy structured array
+    in pgvector's wire format (``int16`` dimension, ``int16`` padding,
+    big-endian ``float32``, or ``float16`` for ``halfvec``); only the JSONB
+    field is encoded per row.
+    """
+    dimension = vectors.shape[1]
+    scalar = np.dtype(">f2" if half else ">f4")
+    row = np.dtype([
+        ("fields", ">i2"),
+        ("id_size", ">i4"),
+        ("id", ">i4"),
+        ("vector_size", ">i4"),
+        ("dimension", ">i2"),
+        ("unused", ">i2"),
+        ("values", scalar, (dimension,))
+    ])
+    rows = np.zeros(len(ids), dtype=row)
+    rows["fields"] = 3
+    rows["id_size"] = 4
+    rows["id"] = ids
+    rows["vector_size"] = 4 + dimension * scalar.itemsize
+    rows["dimension"] = dimension
+    rows["values"] = vectors
+    fixed = rows.tobytes()
+    
+    parts = [_COPY_HEADER]
+    for i, meta in enumerate(metadata):
+        # Binary jsonb is a version byte followed by the JSON text
+        body = b"\x01" + json.dumps(meta).encode("utf-8")
+        parts.append(fixed[i * row.itemsize:(i + 1) * row.itemsize])
+        parts.append(struct.pack("!i", len(body)))
+        parts.append(body)
+    parts.append(_COPY_TRAILER)
+    return b"".join(parts)
 
 class PGVectorStore(VectorStore):
     """PostgreSQL pgvector implementation."""
@@ -14,140 +76,609 @@ class PGVectorStore(VectorStore):
         self.dimension = None
         self.table_name = "vectors"
         self.metadata_table = "vector_metadata"
+        self.storage_dtype = "float32"
+        self.rerank = False
+        self.rerank_factor = 4
+        self.copy_batch_size = 10000
+        self.rebuild_index_threshold = None
+        self.iterative_scan = "relaxed_order"
+        self.index_method = "ivfflat"
+        self.index_lists = None
+        self.hnsw_m = 16
+        self.ef_construction = 64
+        self.nprobe = None
+        self.ef_search = None
+        self.metrics_ttl = 30.0
+        self.text_field = "text"
+        self.text_search_config = "english"
+        self._metrics_cache: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+        self._legacy_metadata = False
+        self._rerank_recall = None
     
     async def initialize(self, config: Dict[str, Any]) -> None:
-        """Initialize pgvector store."""
+        """Initialize pgvector store.
+        
+        ``storage_dtype="float16"`` stores embeddings as ``halfvec``. With
+        ``rerank`` the full-precision ``vector`` column is kept and only the
+        index is built over a ``halfvec`` cast of it, so candidates found in
+        the half-precision index can be re-ordered by exact distance.
+        ``storage_dtype="binary"`` keeps the ``vector`` column and indexes its
+        ``binary_quantize`` bit codes (Hamming distance), always reranking.
+        
+        ``copy_batch_size`` sets the rows per COPY in :meth:`add_vectors`, and
+        loads of at least ``rebuild_index_threshold`` vectors drop the ANN
+        index and build it again once the rows are in.
+        
+        Metadata is stored as JSONB next to the embedding with a GIN index.
+        Rows in a ``metadata_table`` left by older versions are copied into
+        the new column on first start. ``iterative_scan`` lets filtered
+        queries keep scanning the ANN index until ``k`` rows match (pgvector
+        0.8+); set it to ``None`` on older servers.
+        
+        ``index_method`` is ``ivfflat`` or ``hnsw`` (built with ``hnsw_m`` and
+        ``ef_construction``). IVF needs data to place its centroids, so the
+        index is only built once the table has rows, with ``index_lists``
+        derived from the row count unless set. ``nprobe`` and ``ef_search``
+        are the per-query defaults for ``ivfflat.probes``/``hnsw.ef_search``.
+        ``metrics_ttl`` is how long :meth:`get_metrics` results are reused.
+        
+        The ``text_field`` metadata key is indexed for :meth:`lexical_search`
+        through a generated ``tsvector`` column using ``text_search_config``.
+        Both are fixed when the column is created.
+        """
         self.dimension = config.get("dimension", 1536)
         self.table_name = config.get("table_name", "vectors")
         self.metadata_table = config.get("metadata_table", "vector_metadata")
+        self.storage_dtype = config.get("storage_dtype", self.storage_dtype)
+        self.rerank = config.get("rerank", self.rerank)
+        self.rerank_factor = config.get("rerank_factor", self.rerank_factor)
+        self.copy_batch_size = config.get("copy_batch_size", self.copy_batch_size)
+        self.rebuild_index_threshold = config.get(
+            "rebuild_index_threshold", self.rebuild_index_threshold
+        )
+        self.iterative_scan = config.get("iterative_scan", self.iterative_scan)
+        self.index_method = config.get("index_method", self.index_method)
+        self.index_lists = config.get("index_lists", self.index_lists)
+        self.hnsw_m = config.get("hnsw_m", self.hnsw_m)
+        self.ef_construction = config.get("ef_construction", self.ef_construction)
+        self.nprobe = config.get("nprobe", self.nprobe)
+        self.ef_search = config.get("ef_search", self.ef_search)
+        self.metrics_ttl = config.get("metrics_ttl", self.metrics_ttl)
+        self.text_field = config.get("text_field", self.text_field)
+        self.text_search_config = config.get("text_search_config", self.text_search_config)
+        
+        if self.index_method not in INDEX_METHODS:
+            raise ValueError(f"Unsupported pgvector index method: {self.index_method}")
+        if self.storage_dtype not in ("float32", "float16", "binary"):
+            raise ValueError(f"Unsupported storage dtype for pgvector: {self.storage_dtype}")
+        if self.iterative_scan not in (None, "off", "relaxed_order", "strict_order"):
+            raise ValueError(f"Unsupported iterative scan mode: {self.iterative_scan}")
+        # Both are interpolated into DDL
+        for name in (self.text_field, self.text_search_config):
+            if not re.fullmatch(r"\w+", name):
+                raise ValueError(f"Invalid text search identifier: {name}")
         
-        async with get_db() as db:
+        async with db_session() as db:
             # Enable pgvector extension
             await db.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            await db.commit()
+        
+        # Connections opened before the extension existed have no vector codec
+        await engine.dispose()
+        
+        async with db_session() as db:
             
             # Create vectors table
             await db.execute(text(f"""
                 CREATE TABLE IF NOT EXISTS {self.table_name} (
                     id SERIAL PRIMARY KEY,
-                    embedding vector({self.dimension}),
+                    embedding {self._column_type()}({self.dimension}),
+                    metadata JSONB,
                     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
                 )
             """))
+            await db.execute(text(
+                f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS metadata JSONB"
+            ))
+            
+            # Move metadata out of the old side table
+            result = await db.execute(
+                text("SELECT to_regclass(:name)"), {"name": self.metadata_table}
+            )
+            self._legacy_metadata = result.scalar() is not None
+            if self._legacy_metadata:
+                await db.execute(text(f"""
+                    UPDATE {self.table_name} v
+                    SET metadata = m.metadata
+                    FROM {self.metadata_table} m
+                    WHERE m.vector_id = v.id AND v.metadata IS NULL
+                """))
             
-            # Create metadata table
+            # Create index for filtering on metadata
             await db.execute(text(f"""
-                CREATE TABLE IF NOT EXISTS {self.metadata_table} (
-                    id SERIAL PRIMARY KEY,
-                    vector_id INTEGER REFERENCES {self.table_name}(id),
-                    metadata JSONB,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                )
+                CREATE INDEX IF NOT EXISTS {self.table_name}_metadata_idx
+                ON {self.table_name}
+                USING gin (metadata jsonb_path_ops)
             """))
             
-            # Create index for similarity search
+            # Create full-text index for lexical search
             await db.execute(text(f"""
-                CREATE INDEX IF NOT EXISTS {self.table_name}_embedding_idx 
-                ON {self.table_name} 
-                USING ivfflat (embedding vector_cosine_ops)
-                WITH (lists = 100)
+                ALTER TABLE {self.table_name}
+                ADD COLUMN IF NOT EXISTS text_search tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector(
+                        '{self.text_search_config}'::regconfig,
+                        coalesce(metadata->>'{self.text_field}', '')
+                    )
+                ) STORED
             """))
+            await db.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS {self.table_name}_text_search_idx
+                ON {self.table_name}
+                USING gin (text_search)
+            """))
+            
+            # Create index for similarity search
+            await self._create_index(db)
             
             await db.commit()
     
+    async def _index_exists(self, db: AsyncSession) -> bool:
+        result = await db.execute(
+            text("SELECT to_regclass(:name)"), {"name": f"{self.table_name}_embedding_idx"}
+        )
+        return result.scalar() is not None
+    
+    async def _create_index(self, db: AsyncSession) -> None:
+        """Create the ANN index unless it exists.
+        
+        IVF centroids are sampled from the table, so an ``ivfflat`` index is
+        not built on an empty table; :meth:`add_vectors` builds it later.
+        """
+        if self.index_method == "hnsw":
+            options = f"m = {int(self.hnsw_m)}, ef_construction = {int(self.ef_construction)}"
+        else:
+            if await self._index_exists(db):
+                return
+            result = await db.execute(text(f"SELECT COUNT(*) FROM {self.table_name}"))
+            rows = result.scalar()
+            if rows == 0:
+                return
+            options = f"lists = {int(self.index_lists or _default_lists(rows))}"
+        
+        await db.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS {self.table_name}_embedding_idx
+            ON {self.table_name}
+            USING {self.index_method} ({self._index_expression()})
+            WITH ({options})
+        """))
+    
+    async def _drop_index(self, db: AsyncSession) -> None:
+        await db.execute(text(f"DROP INDEX IF EXISTS {self.table_name}_embedding_idx"))
+    
+    async def rebuild_index(self) -> None:
+        """Drop and rebuild the ANN index, e.g. to re-size IVF lists after large loads.
+        
+        The table is locked against reads and writes until the new index is built.
+        """
+        async with db_session() as db:
+            await self._drop_index(db)
+            await self._create_index(db)
+            await db.commit()
+        self._metrics_cache.clear()
+    
+    async def _set_search_options(
+        self,
+        db: AsyncSession,
+        filtered: bool,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> None:
+        """Apply per-transaction search settings for the configured index method."""
+        if self.index_method == "ivfflat":
+            nprobe = nprobe or self.nprobe
+            if nprobe:
+                await db.execute(text(f"SET LOCAL ivfflat.probes = {int(nprobe)}"))
+        else:
+            ef_search = ef_search or self.ef_search
+            if ef_search:
+                await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        
+        if filtered and self.iterative_scan:
+            await db.execute(text(
+                f"SET LOCAL {self.index_method}.iterative_scan = {self.iterative_scan}"
+            ))
+    
+    def _filter_clause(
+        self,
+        filter_criteria: Optional[Dict[str, Any]],
+        params: Dict[str, Any],
+        conditions: Tuple[str, ...] = ()
+    ) -> str:
+        """Return a ``WHERE`` clause matching ``filter_criteria`` and bind its value.
+        
+        Criteria are equality matches combined with AND, expressed as one JSONB
+        containment test so the GIN index can serve it. ``conditions`` are
+        ANDed in as they are.
+        """
+        conditions = list(conditions)
+        if filter_criteria:
+            params["filter"] = json.dumps(filter_criteria)
+            conditions.append("v.metadata @> CAST(:filter AS jsonb)")
+        if not conditions:
+            return ""
+        return "WHERE " + " AND ".join(conditions)
+    
+    def _index_cast(self) -> Optional[str]:
+        """Compressed type a full-precision column is indexed as, if any."""
+        if self.storage_dtype == "binary":
+            return f"bit({self.dimension})"
+        if self.storage_dtype == "float16" and self.rerank:
+            return f"halfvec({self.dimension})"
+        return None
+    
+    def _column_type(self) -> str:
+        if self.storage_dtype == "float16" and not self.rerank:
+            return "halfvec"
+        return "vector"
+    
+    def _index_expression(self) -> str:
+        """Return the indexed expression and operator class."""
+        cast = self._index_cast()
+        if self.storage_dtype == "binary":
+            return f"(binary_quantize(embedding)::{cast}) bit_hamming_ops"
+        if cast is not None:
+            return f"(embedding::{cast}) halfvec_cosine_ops"
+        return f"embedding {self._column_type()}_cosine_ops"
+    
+    def _candidate_order(self, query: str) -> str:
+        """Distance in the compressed index's space, matching its indexed expression."""
+        cast = self._index_cast()
+        if self.storage_dtype == "binary":
+            return f"binary_quantize(v.embedding)::{cast} <~> binary_quantize({query})"
+        return f"v.embedding::{cast} <=> ({query})::{cast}"
+    
+    def _nearest(
+        self,
+        query: str,
+        where: str = "",
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
+    ) -> str:
+        """Return a subquery of the ``:k`` rows nearest to the vector expression ``query``.
+        
+        ``where`` is applied before the ANN ordering, so filters restrict the
+        candidates rather than the final top ``k``. When the index is over a
+        compressed cast (``halfvec`` or binary), ``:k * rerank_factor``
+        candidates are taken from it and re-ordered by full-precision
+        distance; ``rerank=False`` keeps the index's own top ``k``.
+        """
+        if self._index_cast() is not None:
+            if rerank is False:
+                return f"""
+                    SELECT
+                        v.id,
+                        v.embedding <=> {query} as distance,
+                        v.metadata
+                    FROM {self.table_name} v
+                    {where}
+                    ORDER BY {self._candidate_order(query)}
+                    LIMIT :k
+                """
+            return f"""
+                SELECT
+                    c.id,
+                    c.embedding <=> {query} as distance,
+                    c.metadata
+                FROM (
+                    SELECT v.id, v.embedding, v.metadata
+                    FROM {self.table_name} v
+                    {where}
+                    ORDER BY {self._candidate_order(query)}
+                    LIMIT :k * {int(rerank_factor or self.rerank_factor)}
+                ) c
+                ORDER BY c.embedding <=> {query}
+                LIMIT :k
+            """
+        
+        if self._column_type() == "halfvec":
+            query = f"({query})::halfvec({self.dimension})"
+        return f"""
+                SELECT
+                    v.id,
+                    v.embedding <=> {query} as distance,
+                    v.metadata
+                FROM {self.table_name} v
+                {where}
+                ORDER BY v.embedding <=> {query}
+                LIMIT :k
+        """
+    
     async def add_vectors(
         self,
         vectors: np.ndarray,
         metadata: List[Dict[str, Any]],
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        rebuild_index: Optional[bool] = None
     ) -> List[str]:
-        """Add vectors to the store."""
+        """Add vectors to the store with binary COPY.
+        
+        IDs are reserved up front from the table's sequence, then rows are
+        streamed in ``copy_batch_size`` chunks inside a single
+        transaction. ``rebuild_index`` drops the ANN index for the duration of
+        the load and rebuilds it afterwards, which is much faster than
+        maintaining it row by row; it defaults to whether the load reaches
+        ``rebuild_index_threshold``. A rebuilt IVF index sizes its lists for
+        the new row count.
+        
+        Dropping the index takes an ACCESS EXCLUSIVE lock on the table, held
+        until the load commits: concurrent searches and writes on the table
+        block for the whole load, including the index build. Only rebuild
+        when the table can be taken offline for that long.
+        """
         if len(vectors) != len(metadata):
             raise ValueError("Number of vectors must match number of metadata entries")
+        if len(vectors) == 0:
+            return []
         
-        async with get_db() as db:
-            vector_ids = []
-            for i, (vector, meta) in enumerate(zip(vectors, metadata)):
-                # Insert vector
-                result = await db.execute(
-                    text(f"""
-                        INSERT INTO {self.table_name} (embedding)
-                        VALUES (:embedding)
-                        RETURNING id
-                    """),
-                    {"embedding": vector.tolist()}
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if rebuild_index is None:
+            rebuild_index = (
+                self.rebuild_index_threshold is not None
+                and len(vectors) >= self.rebuild_index_threshold
+            )
+        
+        async with db_session() as db:
+            # Reserve one ID per vector so both tables can be loaded with COPY
+            result = await db.execute(
+                text("""
+                    SELECT nextval(pg_get_serial_sequence(:table_name, 'id'))
+                    FROM generate_series(1, :count)
+                """),
+                {"table_name": self.table_name, "count": len(vectors)}
+            )
+            vector_ids = np.array(result.scalars().all(), dtype=np.int64)
+            
+            if rebuild_index:
+                await self._drop_index(db)
+            
+            # COPY goes through the asyncpg connection behind the session
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver = raw_connection.driver_connection
+            
+            half = self._column_type() == "halfvec"
+            for start in range(0, len(vectors), self.copy_batch_size):
+                stop = start + self.copy_batch_size
+                payload = _copy_payload(
+                    vector_ids[start:stop], vectors[start:stop], metadata[start:stop], half
                 )
-                vector_id = result.scalar()
-                
-                # Insert metadata
-                await db.execute(
-                    text(f"""
-                        INSERT INTO {self.metadata_table} (vector_id, metadata)
-                        VALUES (:vector_id, :metadata)
-                    """),
-                    {
-                        "vector_id": vector_id,
-                        "metadata": meta
-                    }
+                await driver.copy_to_table(
+                    self.table_name,
+                    source=io.BytesIO(payload),
+                    columns=["id", "embedding", "metadata"],
+                    format="binary"
                 )
-                
-                vector_ids.append(str(vector_id))
+            
+            # Also builds a deferred IVF index now that the table has rows
+            await self._create_index(db)
             
             await db.commit()
-            return vector_ids
+            self._metrics_cache.clear()
+            return [str(vector_id) for vector_id in vector_ids.tolist()]
     
     async def search(
         self,
         query_vector: np.ndarray,
         k: int = 10,
-        filter_criteria: Optional[Dict[str, Any]] = None
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors."""
+        """Search for similar vectors.
+        
+        Filters are applied inside the ANN query, so a filtered search still
+        returns up to ``k`` matching rows. ``nprobe`` (IVF) and ``ef_search``
+        (HNSW) override the configured recall/latency trade-off for this query,
+        and ``rerank``/``rerank_factor`` the reranking of compressed indexes.
+        """
         start_time = time.time()
+        params: Dict[str, Any] = {
+            "query_vector": np.asarray(query_vector, dtype=np.float32),
+            "k": k
+        }
+        where = self._filter_clause(filter_criteria, params)
         
-        async with get_db() as db:
-            # Build the query
-            query = f"""
-                WITH vector_matches AS (
-                    SELECT 
-                        v.id,
-                        v.embedding <=> :query_vector as distance
-                    FROM {self.table_name} v
-                    ORDER BY v.embedding <=> :query_vector
-                    LIMIT :k
-                )
-                SELECT 
-                    vm.id,
-                    vm.distance,
-                    m.metadata
-                FROM vector_matches vm
-                JOIN {self.metadata_table} m ON m.vector_id = vm.id
-            """
-            
-            # Add filter criteria if provided
-            if filter_criteria:
-                query += " WHERE "
-                conditions = []
-                for key, value in filter_criteria.items():
-                    conditions.append(f"m.metadata->>'{key}' = :{key}")
-                query += " AND ".join(conditions)
+        # Iterative scans may return rows slightly out of order
+        query = f"""
+            SELECT hit.id, hit.distance, hit.metadata
+            FROM (
+                {self._nearest("CAST(:query_vector AS vector)", where, rerank, rerank_factor)}
+            ) hit
+            ORDER BY hit.distance
+        """
+        
+        async with db_session() as db:
+            await self._set_search_options(db, bool(filter_criteria), nprobe, ef_search)
+            result = await db.execute(text(query), params)
+            rows = result.fetchall()
+            search_time = time.time() - start_time
             
-            # Execute query
-            result = await db.execute(
-                text(query),
+            return [
                 {
-                    "query_vector": query_vector.tolist(),
-                    "k": k,
-                    **filter_criteria or {}
+                    "id": str(row[0]),
+                    "distance": float(row[1]),
+                    "metadata": row[2],
+                    "search_time": search_time
                 }
+                for row in rows
+            ]
+    
+    async def search_batch(
+        self,
+        query_matrix: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        rerank_factor: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search all rows of ``query_matrix`` in one LATERAL-join query."""
+        query_matrix = np.atleast_2d(query_matrix)
+        # Wrapped rows go through the binary vector codec; asyncpg would read
+        # bare arrays as one two-dimensional float array
+        params: Dict[str, Any] = {
+            "queries": [Vector(row) for row in np.asarray(query_matrix, dtype=np.float32)],
+            "k": k
+        }
+        
+        # Filters run inside the lateral subquery, before the LIMIT
+        where = self._filter_clause(filter_criteria, params)
+        
+        query = f"""
+            SELECT q.ord, hit.id, hit.distance
+            FROM unnest(CAST(:queries AS vector[])) WITH ORDINALITY AS q(embedding, ord)
+            CROSS JOIN LATERAL (
+                {self._nearest("q.embedding", where, rerank, rerank_factor)}
+            ) hit
+            ORDER BY q.ord, hit.distance
+        """
+        
+        async with db_session() as db:
+            await self._set_search_options(db, bool(filter_criteria), nprobe, ef_search)
+            result = await db.execute(text(query), params)
+            rows = result.fetchall()
+        
+        distances = np.full((len(query_matrix), k), np.inf, dtype=np.float32)
+        ids = np.full((len(query_matrix), k), None, dtype=object)
+        rank = np.zeros(len(query_matrix), dtype=np.int64)
+        for ord_, id_, distance in rows:
+            row = ord_ - 1
+            distances[row, rank[row]] = distance
+            ids[row, rank[row]] = str(id_)
+            rank[row] += 1
+        
+        return distances, ids
+    
+    async def estimate_rerank_recall(
+        self,
+        k: int = 10,
+        num_queries: int = 50,
+        rerank_factor: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Measure how much exact reranking improves recall@k over the compressed index.
+        
+        Queries are sampled from the table. Ground truth comes from exact
+        sequential scans, and is compared with the index's own top ``k`` and
+        with the top ``k`` after reranking. The result is also reported by
+        :meth:`get_metrics`.
+        """
+        if self._index_cast() is None:
+            raise RuntimeError("Reranking needs a halfvec or binary index over a vector column")
+        
+        async with db_session() as db:
+            result = await db.execute(
+                text(f"SELECT embedding FROM {self.table_name} ORDER BY random() LIMIT :n"),
+                {"n": num_queries}
             )
-            
+            queries = np.array([row[0].to_numpy() for row in result], dtype=np.float32)
+        if len(queries) == 0:
+            raise ValueError("Cannot estimate recall on an empty table")
+        
+        true_ids = await self._exact_ids(queries, k)
+        _, first_ids = await self.search_batch(
+            queries, k, nprobe=nprobe, ef_search=ef_search, rerank=False
+        )
+        _, reranked_ids = await self.search_batch(
+            queries, k, nprobe=nprobe, ef_search=ef_search, rerank=True, rerank_factor=rerank_factor
+        )
+        
+        def as_ints(ids: np.ndarray) -> np.ndarray:
+            return np.array([[int(id_) if id_ is not None else -1 for id_ in row] for row in ids])
+        
+        first_stage = recall_at_k(as_ints(first_ids), true_ids)
+        reranked = recall_at_k(as_ints(reranked_ids), true_ids)
+        self._rerank_recall = {
+            "k": k,
+            "num_queries": len(queries),
+            "candidates": k * (rerank_factor or self.rerank_factor),
+            f"first_stage_recall_at_{k}": first_stage,
+            f"reranked_recall_at_{k}": reranked,
+            "recall_gain": reranked - first_stage
+        }
+        self._metrics_cache.clear()
+        return self._rerank_recall
+    
+    async def _exact_ids(self, queries: np.ndarray, k: int) -> np.ndarray:
+        """Exact top-``k`` IDs for every query, bypassing the ANN index."""
+        query = f"""
+            SELECT q.ord, hit.id
+            FROM unnest(CAST(:queries AS vector[])) WITH ORDINALITY AS q(embedding, ord)
+            CROSS JOIN LATERAL (
+                SELECT v.id
+                FROM {self.table_name} v
+                ORDER BY v.embedding <=> q.embedding
+                LIMIT :k
+            ) hit
+            ORDER BY q.ord
+        """
+        
+        async with db_session() as db:
+            await db.execute(text("SET LOCAL enable_indexscan = off"))
+            result = await db.execute(text(query), {
+                "queries": [Vector(row) for row in np.asarray(queries, dtype=np.float32)],
+                "k": k
+            })
+            rows = result.fetchall()
+        
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        rank = np.zeros(len(queries), dtype=np.int64)
+        for ord_, id_ in rows:
+            row = ord_ - 1
+            ids[row, rank[row]] = id_
+            rank[row] += 1
+        return ids
+    
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Full-text search over the ``text_field`` of each row's metadata.
+        
+        ``query_text`` is parsed with ``websearch_to_tsquery``, so quoted
+        phrases, ``or`` and ``-term`` work; rows are ranked by ``ts_rank_cd``.
+        """
+        start_time = time.time()
+        params: Dict[str, Any] = {"query_text": query_text, "k": k}
+        where = self._filter_clause(
+            filter_criteria, params, ("v.text_search @@ tsquery",)
+        )
+        
+        query = f"""
+            SELECT v.id, ts_rank_cd(v.text_search, tsquery) AS score, v.metadata
+            FROM {self.table_name} v,
+                websearch_to_tsquery('{self.text_search_config}', :query_text) tsquery
+            {where}
+            ORDER BY score DESC
+            LIMIT :k
+        """
+        
+        async with db_session() as db:
+            result = await db.execute(text(query), params)
             rows = result.fetchall()
             search_time = time.time() - start_time
             
             return [
                 {
                     "id": str(row[0]),
-                    "distance": float(row[1]),
+                    "score": float(row[1]),
                     "metadata": row[2],
                     "search_time": search_time
                 }
@@ -159,15 +690,16 @@ class PGVectorStore(VectorStore):
         if not ids:
             return
         
-        async with get_db() as db:
-            # Delete metadata first (due to foreign key constraint)
-            await db.execute(
-                text(f"""
-                    DELETE FROM {self.metadata_table}
-                    WHERE vector_id = ANY(:ids)
-                """),
-                {"ids": [int(id_) for id_ in ids]}
-            )
+        async with db_session() as db:
+            # Rows in the old metadata table still reference their vectors
+            if self._legacy_metadata:
+                await db.execute(
+                    text(f"""
+                        DELETE FROM {self.metadata_table}
+                        WHERE vector_id = ANY(:ids)
+                    """),
+                    {"ids": [int(id_) for id_ in ids]}
+                )
             
             # Delete vectors
             await db.execute(
@@ -179,40 +711,120 @@ class PGVectorStore(VectorStore):
             )
             
             await db.commit()
+        self._metrics_cache.clear()
     
-    async def get_metrics(self) -> Dict[str, Any]:
-        """Get store metrics."""
-        async with get_db() as db:
-            # Get vector count
+    async def get_metrics(self, exact: bool = False) -> Dict[str, Any]:
+        """Get store metrics.
+        
+        Row counts are planner estimates from ``pg_class.reltuples`` and
+        ``pg_stats`` unless ``exact`` is set, which scans the table. Results
+        are cached for ``metrics_ttl`` seconds and dropped on writes.
+        """
+        cached = self._metrics_cache.get(exact)
+        if cached is not None and time.monotonic() - cached[0] < self.metrics_ttl:
+            return cached[1]
+        
+        async with db_session() as db:
+            # Get table size, planner row estimate and vacuum state
             result = await db.execute(
-                text(f"SELECT COUNT(*) FROM {self.table_name}")
+                text("""
+                    SELECT
+                        c.reltuples::bigint,
+                        pg_relation_size(c.oid),
+                        pg_total_relation_size(c.oid),
+                        s.n_live_tup,
+                        s.n_dead_tup,
+                        s.last_autovacuum,
+                        s.last_autoanalyze,
+                        st.null_frac
+                    FROM pg_class c
+                    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                    LEFT JOIN pg_stats st
+                        ON st.schemaname = s.schemaname
+                        AND st.tablename = c.relname
+                        AND st.attname = 'metadata'
+                    WHERE c.oid = to_regclass(:table_name)
+                """),
+                {"table_name": self.table_name}
             )
-            vector_count = result.scalar()
+            (
+                reltuples, table_size, total_size, live_tuples, dead_tuples,
+                last_autovacuum, last_autoanalyze, metadata_null_frac
+            ) = result.one()
             
-            # Get metadata count
-            result = await db.execute(
-                text(f"SELECT COUNT(*) FROM {self.metadata_table}")
-            )
-            metadata_count = result.scalar()
+            if exact:
+                result = await db.execute(
+                    text(f"SELECT COUNT(*), COUNT(metadata) FROM {self.table_name}")
+                )
+                vector_count, metadata_count = result.one()
+            else:
+                # reltuples is -1 until the table is first vacuumed or analyzed
+                vector_count = reltuples if reltuples >= 0 else live_tuples
+                metadata_count = None
+                if vector_count is not None and metadata_null_frac is not None:
+                    metadata_count = int(vector_count * (1 - metadata_null_frac))
             
-            # Get index size
+            # Get per-index build options, size and usage
             result = await db.execute(
-                text(f"""
-                    SELECT pg_size_pretty(pg_relation_size('{self.table_name}_embedding_idx'))
-                """)
+                text("""
+                    SELECT
+                        c.relname,
+                        am.amname,
+                        c.reloptions,
+                        pg_relation_size(c.oid),
+                        s.idx_scan,
+                        s.idx_tup_read
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_am am ON am.oid = c.relam
+                    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+                    WHERE i.indrelid = to_regclass(:table_name)
+                """),
+                {"table_name": self.table_name}
             )
-            index_size = result.scalar()
-            
-            return {
-                "total_vectors": vector_count,
-                "metadata_count": metadata_count,
-                "index_size": index_size,
-                "dimension": self.dimension
-            }
+            indexes = [
+                {
+                    "name": name,
+                    "method": method,
+                    "options": dict(option.split("=", 1) for option in options or []),
+                    "size_bytes": size,
+                    "scans": scans,
+                    "tuples_read": tuples_read
+                }
+                for name, method, options, size, scans, tuples_read in result.fetchall()
+            ]
+        
+        embedding_index = f"{self.table_name}_embedding_idx"
+        index_size_bytes = next(
+            (index["size_bytes"] for index in indexes if index["name"] == embedding_index), None
+        )
+        metrics = {
+            "total_vectors": vector_count,
+            "metadata_count": metadata_count,
+            "counts_exact": exact,
+            "table_size_bytes": table_size,
+            "total_size_bytes": total_size,
+            "dead_tuples": dead_tuples,
+            "last_autovacuum": last_autovacuum.isoformat() if last_autovacuum else None,
+            "last_autoanalyze": last_autoanalyze.isoformat() if last_autoanalyze else None,
+            "index_size_bytes": index_size_bytes,
+            "indexes": indexes,
+            "dimension": self.dimension,
+            "index_method": self.index_method,
+            "storage_dtype": self.storage_dtype,
+            "column_type": self._column_type(),
+            "rerank": self._index_cast() is not None,
+            "rerank_factor": self.rerank_factor if self._index_cast() else None,
+            "rerank_recall": self._rerank_recall
+        }
+        self._metrics_cache[exact] = (time.monotonic(), metrics)
+        return metrics
     
     async def clear(self) -> None:
         """Clear all vectors from the store."""
-        async with get_db() as db:
-            await db.execute(text(f"TRUNCATE {self.metadata_table} CASCADE"))
+        async with db_session() as db:
+            if self._legacy_metadata:
+                await db.execute(text(f"TRUNCATE {self.metadata_table} CASCADE"))
             await db.execute(text(f"TRUNCATE {self.table_name} CASCADE"))
-            await db.commit() 
\ No newline at end of file
+            await db.commit()
+        self._metrics_cache.clear()
\ No newline at end of file
@@ -0,0 +1,104 @@
+from typing import Tuple
+import numpy as np
+
+def exact_rerank(
+    query_matrix: np.ndarray,
+    candidate_ids: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    metric: str = "l2",
+    chunk_size: int = 256
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Re-score candidates against full-precision vectors and keep the top ``k``.
+    
+    ``candidate_ids`` is an ``(n_queries, n_candidates)`` matrix of row numbers
+    into ``vectors`` with ``-1`` for empty slots. Returns ``(distances, ids)``
+    shaped ``(n_queries, k)``: squared L2 distances (ascending) for ``l2`` or
+    inner products (descending) for ``ip``. Queries are processed in chunks to
+    bound the size of the gathered candidate tensor.
+    
+    ``vectors`` may be memory-mapped; each chunk's candidate rows are read
+    once, in row order.
+    """
+    query_matrix = np.atleast_2d(query_matrix).astype(np.float32, copy=False)
+    n_queries = len(query_matrix)
+    k = min(k, candidate_ids.shape[1])
+    empty = -np.inf if metric == "ip" else np.inf
+    
+    distances = np.full((n_queries, k), empty, dtype=np.float32)
+    ids = np.full((n_queries, k), -1, dtype=np.int64)
+    
+    for start in range(0, n_queries, chunk_size):
+        queries = query_matrix[start:start + chunk_size]
+        candidates = candidate_ids[start:start + chunk_size]
+        valid = candidates >= 0
+        rows, positions = np.unique(np.where(valid, candidates, 0), return_inverse=True)
+        gathered = np.asarray(vectors[rows], dtype=np.float32)[positions.reshape(candidates.shape)]
+        
+        if metric == "ip":
+            scores = np.einsum("qcd,qd->qc", gathered, queries)
+            keys = -scores
+        else:
+            diff = gathered - queries[:, None, :]
+            scores = np.einsum("qcd,qcd->qc", diff, diff)
+            keys = scores.copy()
+        keys[~valid] = np.inf
+        scores[~valid] = empty
+        
+        order = np.argsort(keys, axis=1, kind="stable")[:, :k]
+        distances[start:start + chunk_size] = np.take_along_axis(scores, order, axis=1)
+        ids[start:start + chunk_size] = np.where(
+            np.take_along_axis(valid, order, axis=1),
+            np.take_along_axis(candidates, order, axis=1),
+            -1
+        )
+    
+    return distances, ids
+
+def recall_at_k(found_ids: np.ndarray, true_ids: np.ndarray) -> float:
+    """Mean fraction of each row of ``true_ids`` that appears in ``found_ids``."""
+    if true_ids.size == 0:
+        return 0.0
+    hits = [
+        len(np.intersect1d(found[found >= 0], true[true >= 0])) / max(1, int((true >= 0).sum()))
+        for found, true in zip(found_ids, true_ids)
+    ]
+    return float(np.mean(hits))
+
+def exact_knn(
+    query_matrix: np.ndarray,
+    vectors: np.ndarray,
+    rows: np.ndarray,
+    k: int,
+    metric: str = "l2",
+    block_size: int = 65536
+) -> np.ndarray:
+    """Exact top-``k`` among ``rows`` of ``vectors`` for every query.
+    
+    ``vectors`` is read ``block_size`` rows at a time, so a memory-mapped
+    corpus larger than memory can serve as ground truth. Returns row
+    numbers shaped ``(n_queries, k)`` with ``-1`` for empty slots.
+    """
+    query_matrix = np.atleast_2d(query_matrix).astype(np.float32, copy=False)
+    n_queries = len(query_matrix)
+    best_keys = np.full((n_queries, k), np.inf, dtype=np.float32)
+    best_ids = np.full((n_queries, k), -1, dtype=np.int64)
+    
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        block = np.asarray(vectors[block_rows], dtype=np.float32)
+        scores = query_matrix @ block.T
+        if metric == "ip":
+            keys = -scores
+        else:
+            # Squared L2 up to the per-query constant ||q||^2
+            keys = np.einsum("cd,cd->c", block, block)[None, :] - 2 * scores
+        
+        keys = np.concatenate([best_keys, keys], axis=1)
+        ids = np.concatenate([best_ids, np.broadcast_to(block_rows, scores.shape)], axis=1)
+        top = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        best_keys = np.take_along_axis(keys, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    
+    order = np.argsort(best_keys, axis=1, kind="stable")
+    return np.take_along_axis(best_ids, order, axis=1)
\ No newline at end of file
@@ -0,0 +1,347 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .base import VectorStore
+from .faiss_store import FAISSStore
+
+def _shard_worker(conn: Any, config: Dict[str, Any]) -> None:
+    """Serve FAISSStore calls for one shard until told to close.
+    
+    Requests arrive as ``(request_id, method, args, kwargs)`` and run
+    concurrently on the worker's event loop; each reply carries the ID of
+    its request, so replies may go out in any order.
+    """
+    loop = asyncio.new_event_loop()
+    store = FAISSStore()
+    try:
+        loop.run_until_complete(store.initialize(config))
+        conn.send(("ok", None))
+    except Exception as e:
+        conn.send(("error", e))
+        return
+    
+    async def handle(request_id: int, method: str, args: Tuple, kwargs: Dict[str, Any]) -> None:
+        try:
+            result = await getattr(store, method)(*args, **kwargs)
+        except Exception as e:
+            conn.send((request_id, "error", e))
+            return
+        conn.send((request_id, "ok", result))
+    
+    async def serve() -> None:
+        tasks = set()
+        while True:
+            request_id, method, args, kwargs = await loop.run_in_executor(None, conn.recv)
+            if method == "close":
+                await asyncio.gather(*tasks)
+                await store.close()
+                conn.send((request_id, "ok", None))
+                return
+            task = loop.create_task(handle(request_id, method, args, kwargs))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    
+    loop.run_until_complete(serve())
+    loop.close()
+
+def _resolve(future: "asyncio.Future[Any]", status: str, result: Any) -> None:
+    """Complete ``future`` with a shard's reply, unless its caller gave up."""
+    if future.done():
+        return
+    if status == "error":
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+class ShardedFAISSStore(VectorStore):
+    """Vector store that spreads vectors over FAISS shards in worker processes.
+    
+    Each shard is a :class:`FAISSStore` living in its own process, so the
+    corpus is not bound by one process's memory and searches use every core.
+    Vectors are routed to shards by a stable hash of their ID; queries fan
+    out to all shards in parallel and the per-shard top-k lists are merged.
+    
+    Calls to a shard are pipelined: every request is tagged with an ID, a
+    reader thread per shard hands each reply to the caller waiting on that
+    ID, and the worker runs requests concurrently. A slow call therefore
+    never holds up the others queued for the same shard.
+    """
+    
+    def __init__(self):
+        self.num_shards = 0
+        self.metric = None
+        self.path = None
+        self._processes = []
+        self._connections = []
+        self._send_locks = []
+        self._readers = []
+        self._pending: List[Dict[int, "asyncio.Future[Any]"]] = []
+        self._request_ids = itertools.count()
+        self._executor = None
+    
+    async def initialize(self, config: Dict[str, Any]) -> None:
+        """Start one worker process per shard.
+        
+        ``num_shards`` defaults to the CPU count. Every other key is passed to
+        the shard's :meth:`FAISSStore.initialize`; ``path`` gets a
+        ``shard_<i>`` subdirectory per shard and ``omp_threads`` defaults to
+        an even split of the cores.
+        """
+        self.num_shards = config.get("num_shards", os.cpu_count() or 1)
+        self.metric = config.get("metric", "l2")
+        self.path = config.get("path")
+        
+        shard_config = dict(config)
+        shard_config.pop("num_shards", None)
+        if not shard_config.get("omp_threads"):
+            shard_config["omp_threads"] = max(1, (os.cpu_count() or 1) // self.num_shards)
+        
+        context = multiprocessing.get_context("spawn")
+        self._executor = ThreadPoolExecutor(
+            max_workers=4 * self.num_shards,
+            thread_name_prefix="faiss-shard"
+        )
+        for i in range(self.num_shards):
+            config_i = dict(shard_config)
+            if self.path:
+                config_i["path"] = os.path.join(self.path, f"shard_{i}")
+            
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_shard_worker,
+                args=(child_conn, config_i),
+                daemon=True,
+                name=f"faiss-shard-{i}"
+            )
+            process.start()
+            self._processes.append(process)
+            self._connections.append(parent_conn)
+            self._send_locks.append(threading.Lock())
+            self._pending.append({})
+        
+        # Wait for every shard to report that its store is initialized
+        await asyncio.gather(*[self._receive(i) for i in range(self.num_shards)])
+        
+        for i in range(self.num_shards):
+            reader = threading.Thread(
+                target=self._read_replies,
+                args=(i,),
+                daemon=True,
+                name=f"faiss-shard-{i}-reader"
+            )
+            reader.start()
+            self._readers.append(reader)
+    
+    def _receive_sync(self, shard: int) -> Any:
+        status, result = self._connections[shard].recv()
+        if status == "error":
+            raise result
+        return result
+    
+    async def _receive(self, shard: int) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._receive_sync, shard)
+    
+    def _read_replies(self, shard: int) -> None:
+        """Hand each reply from ``shard`` to the caller waiting on its request ID."""
+        pending = self._pending[shard]
+        while True:
+            try:
+                request_id, status, result = self._connections[shard].recv()
+            except (EOFError, OSError):
+                break
+            future = pending.get(request_id)
+            if future is not None:
+                future.get_loop().call_soon_threadsafe(_resolve, future, status, result)
+        
+        # The worker is gone, so nothing still outstanding will be answered
+        error = ConnectionError(f"FAISS shard {shard} worker exited")
+        for future in list(pending.values()):
+            future.get_loop().call_soon_threadsafe(_resolve, future, "error", error)
+    
+    def _send(self, shard: int, request: Tuple) -> None:
+        with self._send_locks[shard]:
+            self._connections[shard].send(request)
+    
+    async def _call(self, shard: int, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call ``method`` on one shard without blocking the event loop."""
+        if not self._connections:
+            raise RuntimeError("Sharded FAISS store not initialized")
+        
+        loop = asyncio.get_running_loop()
+        request_id = next(self._request_ids)
+        future = loop.create_future()
+        pending = self._pending[shard]
+        pending[request_id] = future
+        try:
+            # Sending pickles the arguments, which is slow for large batches
+            await loop.run_in_executor(
+                self._executor, self._send, shard, (request_id, method, args, kwargs)
+            )
+            return await future
+        finally:
+            pending.pop(request_id, None)
+    
+    async def _broadcast(self, method: str, *args: Any, **kwargs: Any) -> List[Any]:
+        """Call ``method`` on every shard in parallel."""
+        return await asyncio.gather(
+            *[self._call(i, method, *args, **kwargs) for i in range(self.num_shards)]
+        )
+    
+    def _shard_of(self, id_: str) -> int:
+        """Return the shard that owns ``id_``."""
+        return zlib.crc32(id_.encode("utf-8")) % self.num_shards
+    
+    async def add_vectors(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Route vectors to their shards and add them in parallel."""
+        if len(vectors) != len(metadata):
+            raise ValueError("Number of vectors must match number of metadata entries")
+        
+        # Shard-local IDs would collide across shards, so generate global ones
+        if ids is None:
+            ids = [uuid.uuid4().hex for _ in range(len(vectors))]
+        
+        shards = np.array([self._shard_of(id_) for id_ in ids], dtype=np.int64)
+        calls = []
+        for shard in range(self.num_shards):
+            rows = np.flatnonzero(shards == shard)
+            if len(rows) == 0:
+                continue
+            calls.append(self._call(
+                shard,
+                "add_vectors",
+                vectors[rows],
+                [metadata[row] for row in rows],
+                [ids[row] for row in rows]
+            ))
+        await asyncio.gather(*calls)
+        
+        return ids
+    
+    async def search(
+        self,
+        query_vector: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        **search_params: Any
+    ) -> List[Dict[str, Any]]:
+        """Search every shard and merge the per-shard top-k lists."""
+        start_time = time.time()
+        shard_results = await self._broadcast(
+            "search", query_vector, k, filter_criteria, **search_params
+        )
+        
+        results = [result for shard in shard_results for result in shard]
+        results.sort(key=lambda result: result["distance"], reverse=self.metric == "ip")
+        search_time = time.time() - start_time
+        
+        for result in results[:k]:
+            result["search_time"] = search_time
+        return results[:k]
+    
+    async def search_batch(
+        self,
+        query_matrix: np.ndarray,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        **search_params: Any
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search every shard with the whole query matrix and merge per row."""
+        shard_results = await self._broadcast(
+            "search_batch", np.atleast_2d(query_matrix), k, filter_criteria, **search_params
+        )
+        
+        distances = np.concatenate([result[0] for result in shard_results], axis=1)
+        ids = np.concatenate([result[1] for result in shard_results], axis=1)
+        
+        # Empty slots must sort last regardless of the metric's direction
+        keys = -distances if self.metric == "ip" else distances.copy()
+        keys[ids == None] = np.inf  # noqa: E711 - elementwise comparison on an object array
+        order = np.argsort(keys, axis=1, kind="stable")[:, :k]
+        
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(ids, order, axis=1)
+    
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int = 10,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run BM25 on every shard and merge by score.
+        
+        Each shard scores against its own term statistics, which hash routing
+        keeps close to the corpus-wide ones.
+        """
+        shard_results = await self._broadcast("lexical_search", query_text, k, filter_criteria)
+        results = [result for shard in shard_results for result in shard]
+        results.sort(key=lambda result: result["score"], reverse=True)
+        return results[:k]
+    
+    async def delete_vectors(self, ids: List[str]) -> None:
+        """Delete vectors from the shards that own them."""
+        if not ids:
+            return
+        
+        by_shard: Dict[int, List[str]] = {}
+        for id_ in ids:
+            by_shard.setdefault(self._shard_of(id_), []).append(id_)
+        await asyncio.gather(*[
+            self._call(shard, "delete_vectors", shard_ids)
+            for shard, shard_ids in by_shard.items()
+        ])
+    
+    async def save(self) -> None:
+        """Save every shard to its own subdirectory of ``path``."""
+        await self._broadcast("save")
+    
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Get per-shard metrics and corpus-wide totals."""
+        if not self._connections:
+            return {"status": "not_initialized"}
+        
+        shards = await self._broadcast("get_metrics")
+        return {
+            "total_vectors": sum(shard.get("total_vectors", 0) for shard in shards),
+            "num_shards": self.num_shards,
+            "metric": self.metric,
+            "path": self.path,
+            "shards": shards
+        }
+    
+    async def clear(self) -> None:
+        """Clear all vectors from every shard."""
+        await self._broadcast("clear")
+    
+    async def close(self) -> None:
+        """Stop the worker processes."""
+        if not self._connections:
+            return
+        
+        await self._broadcast("close")
+        for process in self._processes:
+            process.join()
+        for reader in self._readers:
+            reader.join()
+        for conn in self._connections:
+            conn.close()
+        self._executor.shutdown(wait=True)
+        self._processes = []
+        self._connections = []
+        self._send_locks = []
+        self._readers = []
+        self._pending = []
\ No newline at end of file
@@ -0,0 +1,110 @@
+from typing import BinaryIO, Optional
+import os
+import numpy as np
+
+# Rows written at a time when copying the file elsewhere
+_COPY_BLOCK_ROWS = 65536
+
+class VectorFile:
+    """Full-precision vectors addressed by row, kept in a memory-mapped file.
+    
+    Rows are raw float32 values in ``path``. The file grows in doubling steps
+    and is re-mapped, so adding vectors never copies existing rows and a
+    search only reads the pages of the rows it gathers. Without a ``path``
+    the rows live in an in-memory array instead.
+    
+    The file stays open for the object's lifetime and is grown through that
+    handle. If ``path`` is removed or replaced meanwhile, growing raises
+    instead of silently starting a new, zero-filled file.
+    """
+    
+    def __init__(self, dimension: int, path: Optional[str] = None, read_only: bool = False):
+        self.dimension = dimension
+        self.path = path
+        self.read_only = read_only
+        self._file: Optional[BinaryIO] = None
+        self._array = np.zeros((0, dimension), dtype=np.float32)
+        if path and os.path.exists(path):
+            self._file = open(path, "rb" if read_only else "r+b")
+            self._map()
+    
+    def _map(self) -> None:
+        rows = os.fstat(self._file.fileno()).st_size // (self.dimension * 4)
+        if rows == 0:
+            self._array = np.zeros((0, self.dimension), dtype=np.float32)
+            return
+        self._array = np.memmap(
+            self._file,
+            dtype=np.float32,
+            mode="r" if self.read_only else "r+",
+            shape=(rows, self.dimension)
+        )
+    
+    def _check_file(self) -> None:
+        """Raise if ``path`` no longer names the open file."""
+        try:
+            same = os.path.samestat(os.stat(self.path), os.fstat(self._file.fileno()))
+        except FileNotFoundError:
+            same = False
+        if not same:
+            raise RuntimeError(f"Vector file {self.path} was removed or replaced")
+    
+    def __len__(self) -> int:
+        return len(self._array)
+    
+    def __getitem__(self, rows: np.ndarray) -> np.ndarray:
+        return self._array[rows]
+    
+    def _grow(self, capacity: int) -> None:
+        if self.path is None:
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[:len(self._array)] = self._array
+            self._array = grown
+            return
+        
+        self.flush()
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "x+b")
+        else:
+            self._check_file()
+        # Extending the file leaves the new rows zero-filled without writing them
+        self._file.truncate(capacity * self.dimension * 4)
+        self._map()
+    
+    def write(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Store ``vectors`` at ``rows``, growing the file as needed."""
+        if self.read_only:
+            raise RuntimeError("Vector file was opened read-only")
+        if len(rows) == 0:
+            return
+        
+        needed = int(rows.max()) + 1
+        if needed > len(self._array):
+            self._grow(max(needed, 2 * len(self._array), 1024))
+        self._array[rows] = vectors
+    
+    def flush(self) -> None:
+        """Write dirty pages back to the file."""
+        if isinstance(self._array, np.memmap) and not self.read_only:
+            self._array.flush()
+    
+    def close(self) -> None:
+        """Flush and unmap the rows and close the file."""
+        self.flush()
+        self._array = np.zeros((0, self.dimension), dtype=np.float32)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def save(self, path: str, rows: int) -> None:
+        """Copy the first ``rows`` rows to a new file at ``path``."""
+        if path == self.path:
+            raise ValueError("Cannot save a vector file over itself")
+        
+        with open(path, "wb") as f:
+            for start in range(0, rows, _COPY_BLOCK_ROWS):
+                stop = min(start + _COPY_BLOCK_ROWS, rows)
+                f.write(np.ascontiguousarray(self._array[start:stop]).tobytes())
\ No newline at end of file
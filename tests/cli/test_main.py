@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+
+import pytest
+from sqlalchemy import select
+from typer.testing import CliRunner
+
+from evalkit import config
+from evalkit.cli.main import app
+from evalkit.core.config import settings
+from evalkit.db.database import db_session
+from evalkit.db.models import Evaluation, GoldenDataset, Interaction
+
+# Commands run their own event loop, and pooled Postgres connections cannot
+# move between loops
+pytestmark = pytest.mark.skipif(
+    not os.environ["DATABASE_URL"].startswith("sqlite"),
+    reason="CLI tests run against the SQLite test database"
+)
+
+async def add_rows(*rows):
+    async with db_session() as db:
+        db.add_all(rows)
+
+async def evaluations():
+    async with db_session() as db:
+        result = await db.execute(select(Evaluation).order_by(Evaluation.interaction_id))
+        return result.scalars().all()
+
+@pytest.fixture
+def cli(judge_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", judge_server.url)
+    monkeypatch.setattr(settings, "JUDGE_CACHE_PATH", str(tmp_path / "judge_cache.sqlite"))
+    return CliRunner()
+
+def test_evaluate_scores_and_saves_interactions(database, cli, judge_server):
+    asyncio.run(add_rows(
+        Interaction(query="reset my password", response="Use the reset link."),
+        Interaction(query="export a report", response="Click export."),
+        GoldenDataset(name="support", query="reset my password", expected_response="Reset link.")
+    ))
+    
+    result = cli.invoke(app, ["evaluate", "--dataset", "support", "--concurrency", "2"])
+    
+    assert result.exit_code == 0, result.output
+    assert "Evaluation complete" in result.output
+    saved = asyncio.run(evaluations())
+    assert [evaluation.notes for evaluation in saved] == ["reset my password", "export a report"]
+    assert {evaluation.score for evaluation in saved} == {0.5}
+    assert {evaluation.evaluator_type for evaluation in saved} == {"gpt-4"}
+    
+    # A second run is served from the judge cache
+    requests = len(judge_server.requests)
+    result = cli.invoke(app, ["evaluate", "--dataset", "support"])
+    assert "2 cached, 0 requests" in result.output
+    assert len(judge_server.requests) == requests
+
+def test_evaluate_records_failed_items(database, cli, judge_server):
+    judge_server.failures = [(400, {})]
+    asyncio.run(add_rows(Interaction(query="reset my password", response="Use the reset link.")))
+    
+    result = cli.invoke(app, ["evaluate", "--dataset", "support"])
+    
+    assert result.exit_code == 0, result.output
+    assert "1 failed" in result.output
+    [saved] = asyncio.run(evaluations())
+    assert saved.score == 0.0
+    assert "400" in saved.notes
+
+def test_list_interactions(database, cli):
+    asyncio.run(add_rows(Interaction(query="reset my password", response="Use the reset link.")))
+    result = cli.invoke(app, ["list-interactions", "--with-evaluations"])
+    assert result.exit_code == 0, result.output
+    assert "reset my password" in result.output
+
+@pytest.fixture
+def vector_store(monkeypatch, tmp_path):
+    """Point the vector settings at a small FAISS store and the hash embedder."""
+    monkeypatch.setattr(config.settings, "VECTOR_STORE_TYPE", "faiss")
+    monkeypatch.setattr(config.settings, "VECTOR_STORE_PATH", str(tmp_path / "vectors"))
+    monkeypatch.setattr(config.settings, "VECTOR_DIMENSION", 64)
+    monkeypatch.setattr(config.settings, "EMBEDDING_BACKEND", "hash")
+    monkeypatch.setattr(config.settings, "EMBEDDING_CACHE_PATH", None)
+    source = tmp_path / "corpus.jsonl"
+    with open(source, "w") as f:
+        for i, text in enumerate(["reset your password", "export a report", "invite a user"]):
+            f.write(json.dumps({"id": f"doc-{i}", "text": text}) + "\n")
+    return str(source)
+
+def test_ingest_and_eval_retrieval(database, cli, vector_store):
+    result = cli.invoke(app, ["ingest", vector_store, "--id-field", "id"])
+    assert result.exit_code == 0, result.output
+    assert "Ingested 3 rows" in result.output
+    
+    asyncio.run(add_rows(GoldenDataset(
+        name="docs",
+        query="export a report",
+        expected_response="",
+        relevance_labels={"doc-1": 1}
+    )))
+    result = cli.invoke(app, ["eval-retrieval", "docs", "--k", "2"])
+    assert result.exit_code == 0, result.output
+    assert "hit_rate_at_2   │ 1.000" in result.output
+    
+    # Saved retrieval results are not interactions for the LLM judge
+    result = cli.invoke(app, ["evaluate", "--dataset", "docs"])
+    assert result.exit_code == 0, result.output
+    assert asyncio.run(evaluations()) == []
\ No newline at end of file
@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Settings are read at import time, so point evalkit at a throwaway database
+# before any test imports it. Set EVALKIT_TEST_DATABASE_URL to run the
+# database tests against Postgres instead of SQLite.
+os.environ["DATABASE_URL"] = os.environ.get("EVALKIT_TEST_DATABASE_URL") or (
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(prefix="evalkit-test-"), "evalkit.db")
+)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+@pytest.fixture
+async def database():
+    """Create the schema in the test database and drop it afterwards."""
+    from evalkit.db.database import engine
+    from evalkit.db.models import Base
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+class JudgeServer(ThreadingHTTPServer):
+    """Local OpenAI-compatible endpoint that answers chat completions as a judge.
+    
+    Each reply scores every criterion with ``score`` and explains with the
+    query it was given. ``failures`` is a queue of ``(status, headers)``
+    answers served before any success, ``stalls`` a queue of seconds to
+    wait before answering the next requests, and ``delays`` maps a query
+    to seconds to wait before every answer to it.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), JudgeHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/v1"
+        self.score = 0.5
+        self.failures = []
+        self.stalls = []
+        self.delays = {}
+        self.requests = []
+        self.lock = threading.Lock()
+    
+    def evaluation(self, query):
+        return {
+            "scores": {
+                criterion: self.score
+                for criterion in ("relevance", "accuracy", "completeness", "clarity")
+            },
+            "overall_score": self.score,
+            "explanation": query
+        }
+
+class JudgeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+        queries = re.findall(r"^Query: (.*)$", prompt, re.MULTILINE)
+        with self.server.lock:
+            self.server.requests.append(queries)
+            failure = self.server.failures.pop(0) if self.server.failures else None
+            stall = self.server.stalls.pop(0) if self.server.stalls else 0.0
+        
+        delays = [self.server.delays.get(query, 0.0) for query in queries]
+        time.sleep(max([stall, *delays]))
+        if failure is not None:
+            status, headers = failure
+            self.reply(status, {"error": {"message": f"status {status}"}}, headers)
+            return
+        
+        if len(queries) == 1 and "JSON array" not in prompt:
+            content = json.dumps(self.server.evaluation(queries[0]))
+        else:
+            content = json.dumps([
+                {"item": number, **self.server.evaluation(query)}
+                for number, query in enumerate(queries, 1)
+            ])
+        self.reply(200, {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }]
+        })
+    
+    def reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a delayed reply
+            pass
+
+@pytest.fixture
+def judge_server():
+    """Stub judge endpoint, served from a background thread."""
+    server = JudgeServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.pool import NullPool
+
+from evalkit.db.database import _engine_options, db_session, get_db
+from evalkit.db.models import Interaction
+
+async def count_interactions() -> int:
+    async with db_session() as db:
+        return (await db.execute(select(func.count()).select_from(Interaction))).scalar()
+
+async def test_db_session_commits_on_success(database):
+    async with db_session() as db:
+        db.add(Interaction(query="q", response="r", metadata={}))
+    assert await count_interactions() == 1
+
+async def test_db_session_rolls_back_on_error(database):
+    with pytest.raises(RuntimeError):
+        async with db_session() as db:
+            db.add(Interaction(query="q", response="r", metadata={}))
+            await db.flush()
+            raise RuntimeError("boom")
+    assert await count_interactions() == 0
+
+async def test_get_db_is_a_fastapi_dependency(database):
+    dependency = get_db()
+    db = await dependency.__anext__()
+    db.add(Interaction(query="q", response="r", metadata={}))
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    assert await count_interactions() == 1
+
+def test_sqlite_engines_do_not_pool():
+    assert _engine_options("sqlite+aiosqlite:///evalkit.db") == {"poolclass": NullPool}
+
+def test_postgres_engines_pool_and_cache_statements():
+    options = _engine_options("postgresql+asyncpg://user@localhost/evalkit")
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle"} <= set(options)
+    assert "prepared_statement_cache_size" in options["connect_args"]
\ No newline at end of file
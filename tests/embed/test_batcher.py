@@ -0,0 +1,112 @@
+import asyncio
+
+import numpy as np
+
+from evalkit.embed.batcher import BatchingEmbedder
+from evalkit.embed.hash_embedder import HashEmbedder
+
+class RecordingEmbedder(HashEmbedder):
+    """Hash embedder that records the batches it receives."""
+    
+    def __init__(self, fail_on=None, delay=0.0):
+        super().__init__(dimension=16)
+        self.calls = []
+        self.fail_on = fail_on
+        self.delay = delay
+        self.closed = False
+    
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_on is not None and self.fail_on in texts:
+            raise RuntimeError("embedding failed")
+        return await super().embed(texts)
+    
+    async def close(self):
+        self.closed = True
+
+async def test_concurrent_callers_share_one_batch():
+    inner = RecordingEmbedder()
+    embedder = BatchingEmbedder(inner, max_batch_size=100, max_wait=0.01)
+    texts = [[f"text {i}", f"other {i}"] for i in range(5)]
+    
+    results = await asyncio.gather(*(embedder.embed(group) for group in texts))
+    
+    assert len(inner.calls) == 1
+    assert sorted(inner.calls[0]) == sorted(text for group in texts for text in group)
+    for group, vectors in zip(texts, results):
+        np.testing.assert_allclose(vectors, inner.embed_sync(group))
+    assert embedder.batches == 1
+    assert embedder.texts == 10
+
+async def test_batches_are_flushed_at_the_size_limit():
+    inner = RecordingEmbedder()
+    embedder = BatchingEmbedder(inner, max_batch_size=4, max_wait=10.0)
+    texts = [f"text {i}" for i in range(8)]
+    
+    # Both batches fill up, so neither waits for the timer
+    vectors = await asyncio.wait_for(embedder.embed(texts), timeout=1.0)
+    
+    assert [len(call) for call in inner.calls] == [4, 4]
+    np.testing.assert_allclose(vectors, inner.embed_sync(texts))
+
+async def test_partial_batches_are_flushed_after_max_wait():
+    inner = RecordingEmbedder()
+    embedder = BatchingEmbedder(inner, max_batch_size=100, max_wait=0.01)
+    
+    vectors = await asyncio.wait_for(embedder.embed(["only one"]), timeout=1.0)
+    
+    assert inner.calls == [["only one"]]
+    assert vectors.shape == (1, 16)
+
+async def test_empty_input():
+    embedder = BatchingEmbedder(RecordingEmbedder())
+    assert (await embedder.embed([])).shape == (0, 16)
+    assert embedder.embedder.calls == []
+
+async def test_a_failed_batch_fails_its_callers_only():
+    inner = RecordingEmbedder(fail_on="bad")
+    embedder = BatchingEmbedder(inner, max_batch_size=2, max_wait=0.01)
+    
+    results = await asyncio.gather(
+        embedder.embed(["bad", "fine"]), embedder.embed(["good", "also good"]),
+        return_exceptions=True
+    )
+    
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].shape == (2, 16)
+    assert embedder.batches == 1
+
+async def test_concurrent_batches_are_limited():
+    inner = RecordingEmbedder(delay=0.02)
+    embedder = BatchingEmbedder(inner, max_batch_size=1, max_concurrent_batches=2)
+    active = 0
+    peak = 0
+    embed = inner.embed
+    
+    async def tracked(texts):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            return await embed(texts)
+        finally:
+            active -= 1
+    
+    inner.embed = tracked
+    await asyncio.gather(*(embedder.embed([f"text {i}"]) for i in range(6)))
+    
+    assert embedder.batches == 6
+    assert peak == 2
+
+async def test_close_flushes_and_closes_the_wrapped_embedder():
+    inner = RecordingEmbedder()
+    embedder = BatchingEmbedder(inner, max_batch_size=100, max_wait=10.0)
+    pending = asyncio.ensure_future(embedder.embed(["queued"]))
+    await asyncio.sleep(0)
+    
+    await embedder.close()
+    
+    assert (await pending).shape == (1, 16)
+    assert inner.closed
\ No newline at end of file
@@ -0,0 +1,77 @@
+import numpy as np
+
+from evalkit.embed.cache import CachedEmbedder, EmbeddingCache, text_hash
+from evalkit.embed.hash_embedder import HashEmbedder
+
+class CountingEmbedder(HashEmbedder):
+    """Hash embedder that records the texts it is asked to embed."""
+    
+    def __init__(self, dimension=16, model="hash-v1"):
+        super().__init__(dimension=dimension, model=model)
+        self.embedded = []
+    
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+        return await super().embed(texts)
+
+async def test_only_missing_texts_are_embedded(tmp_path):
+    inner = CountingEmbedder()
+    embedder = CachedEmbedder(inner, EmbeddingCache(str(tmp_path / "cache.db")))
+    
+    first = await embedder.embed(["a b", "c d"])
+    second = await embedder.embed(["c d", "e f", "a b"])
+    
+    assert inner.embedded == ["a b", "c d", "e f"]
+    assert (embedder.hits, embedder.misses) == (2, 3)
+    np.testing.assert_allclose(second[0], first[1])
+    np.testing.assert_allclose(second[2], first[0])
+    np.testing.assert_allclose(second, inner.embed_sync(["c d", "e f", "a b"]))
+    await embedder.close()
+
+async def test_duplicates_within_a_call_are_embedded_once(tmp_path):
+    inner = CountingEmbedder()
+    embedder = CachedEmbedder(inner, EmbeddingCache(str(tmp_path / "cache.db")))
+    
+    vectors = await embedder.embed(["same", "other", "same"])
+    
+    assert inner.embedded == ["same", "other"]
+    np.testing.assert_allclose(vectors[0], vectors[2])
+    await embedder.close()
+
+async def test_the_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = CachedEmbedder(CountingEmbedder(), EmbeddingCache(path))
+    expected = await first.embed(["persisted text"])
+    await first.close()
+    
+    inner = CountingEmbedder()
+    second = CachedEmbedder(inner, EmbeddingCache(path))
+    np.testing.assert_allclose(await second.embed(["persisted text"]), expected)
+    assert inner.embedded == []
+    await second.close()
+
+async def test_entries_are_scoped_to_the_model_and_dimension(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path)
+    await CachedEmbedder(CountingEmbedder(), cache).embed(["shared text"])
+    
+    for inner in (CountingEmbedder(model="hash-v2"), CountingEmbedder(dimension=32)):
+        vectors = await CachedEmbedder(inner, cache).embed(["shared text"])
+        assert inner.embedded == ["shared text"]
+        assert vectors.shape == (1, inner.dimension)
+    
+    assert cache.count() == 3
+    assert cache.count("hash-v1:16") == 1
+    cache.close()
+
+def test_lookups_span_more_than_one_statement(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"))
+    hashes = [text_hash(f"text {i}") for i in range(2000)]
+    vectors = np.random.default_rng(0).standard_normal((2000, 4)).astype(np.float32)
+    cache.put_many("model:4", hashes, vectors)
+    
+    found = cache.get_many("model:4", hashes + [text_hash("missing")])
+    
+    assert len(found) == 2000
+    np.testing.assert_array_equal(found[hashes[1500]], vectors[1500])
+    cache.close()
\ No newline at end of file
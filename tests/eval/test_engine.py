@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from evalkit.eval.engine import ScoringEngine, TokenBucket
+from evalkit.eval.scorer import GPTScorer, Scorer
+
+def make_items(n):
+    return [{"query": f"question {i}", "response": f"answer {i}"} for i in range(n)]
+
+@pytest.fixture
+async def make_engine(judge_server):
+    """Factory for engines scoring against the stub judge."""
+    scorers = []
+    
+    def make(**options):
+        scorer = GPTScorer(base_url=judge_server.url)
+        scorers.append(scorer)
+        return ScoringEngine(scorer, **{"backoff_base": 0.001, "timeout": 5.0, **options})
+    
+    yield make
+    for scorer in scorers:
+        await scorer.close()
+
+async def test_scores_are_parsed_from_the_judge(make_engine, judge_server):
+    engine = make_engine()
+    result = await engine.score_one(make_items(1)[0])
+    assert result["overall_score"] == 0.5
+    assert result["scores"]["accuracy"] == 0.5
+    assert result["explanation"] == "question 0"
+    assert engine.get_stats()["requests"] == 1
+
+async def test_429_waits_for_retry_after(make_engine, judge_server):
+    judge_server.failures = [(429, {"Retry-After": "0.3"})]
+    engine = make_engine()
+    
+    start = time.perf_counter()
+    result = await engine.score_one(make_items(1)[0])
+    
+    assert "error" not in result
+    assert time.perf_counter() - start >= 0.3
+    assert engine.get_stats()["retries"] == 1
+    assert len(judge_server.requests) == 2
+
+async def test_server_errors_are_retried(make_engine, judge_server):
+    judge_server.failures = [(500, {}), (503, {})]
+    engine = make_engine()
+    result = await engine.score_one(make_items(1)[0])
+    assert "error" not in result
+    assert engine.get_stats()["retries"] == 2
+
+async def test_client_errors_are_not_retried(make_engine, judge_server):
+    judge_server.failures = [(400, {})]
+    engine = make_engine()
+    result = await engine.score_one(make_items(1)[0])
+    assert "400" in result["error"]
+    assert engine.get_stats()["retries"] == 0
+
+async def test_timeouts_are_retried(make_engine, judge_server):
+    judge_server.stalls = [0.5]
+    engine = make_engine(timeout=0.1)
+    result = await engine.score_one(make_items(1)[0])
+    assert "error" not in result
+    assert engine.get_stats()["retries"] == 1
+
+async def test_attempts_that_keep_timing_out_fail(make_engine, judge_server):
+    judge_server.delays = {"question 0": 0.5}
+    engine = make_engine(timeout=0.1, max_retries=1)
+    result = await engine.score_one(make_items(1)[0])
+    assert result["error"] == "TimeoutError"
+    assert engine.get_stats()["failures"] == 1
+
+async def test_exhausted_retries_give_the_error_result(make_engine, judge_server):
+    judge_server.failures = [(503, {})] * 3
+    engine = make_engine(max_retries=2)
+    
+    result = await engine.score_one(make_items(1)[0])
+    
+    assert result["overall_score"] == 0.0
+    assert set(result["scores"].values()) == {0.0}
+    assert "503" in result["error"]
+    assert engine.get_stats()["requests"] == 3
+    assert engine.get_stats()["failures"] == 1
+
+async def test_one_failed_item_does_not_abort_the_run(make_engine, judge_server):
+    judge_server.failures = [(503, {})]
+    engine = make_engine(concurrency=1, max_retries=0)
+    results = await engine.score_many(make_items(3))
+    assert "error" in results[0]
+    assert [result["explanation"] for result in results[1:]] == ["question 1", "question 2"]
+
+@pytest.mark.parametrize("batch_size", [1, 3])
+async def test_score_many_keeps_input_order(make_engine, judge_server, batch_size):
+    items = make_items(8)
+    # Earlier items answer last, so completions arrive out of order
+    judge_server.delays = {item["query"]: 0.02 * (8 - i) for i, item in enumerate(items)}
+    engine = make_engine(concurrency=8, batch_size=batch_size)
+    finished = []
+    
+    results = await engine.score_many(items, on_result=lambda index, _: finished.append(index))
+    
+    assert [result["explanation"] for result in results] == [item["query"] for item in items]
+    assert sorted(finished) == list(range(8))
+    if batch_size == 1:
+        assert finished != list(range(8))
+    else:
+        assert len(judge_server.requests) == 3
+
+class PartialBatchScorer(Scorer):
+    """Scorer whose batch replies leave out the items listed in ``drop``."""
+    
+    def __init__(self, drop):
+        super().__init__(model="stub")
+        self.drop = set(drop)
+        self.batches = []
+        self.singles = []
+    
+    async def score(
+        self, query, response, expected_response=None, context=None, raise_errors=False
+    ):
+        self.singles.append(query)
+        return {"scores": {}, "overall_score": 1.0, "explanation": query}
+    
+    async def score_batch(self, items, raise_errors=False):
+        self.batches.append([item["query"] for item in items])
+        return [
+            None if item["query"] in self.drop
+            else {"scores": {}, "overall_score": 0.5, "explanation": item["query"]}
+            for item in items
+        ]
+
+async def test_unparsed_batch_items_are_split_and_retried():
+    items = make_items(6)
+    scorer = PartialBatchScorer(drop={"question 1", "question 2", "question 4"})
+    engine = ScoringEngine(scorer, batch_size=6)
+    
+    results = await engine.score_many(items)
+    
+    assert [result["explanation"] for result in results] == [item["query"] for item in items]
+    assert scorer.batches[0] == [item["query"] for item in items]
+    # The three dropped items are halved into a single and a pair; the
+    # pair fails again and is halved once more
+    assert scorer.batches[1:] == [["question 2", "question 4"]]
+    assert sorted(scorer.singles) == ["question 1", "question 2", "question 4"]
+    assert engine.get_stats()["split_retries"] == 2
+    assert [results[i]["overall_score"] for i in (0, 1)] == [0.5, 1.0]
+
+async def test_token_bucket_starts_with_a_small_burst():
+    bucket = TokenBucket(600)
+    assert bucket.capacity == 10
+    
+    start = time.perf_counter()
+    for _ in range(10):
+        await bucket.acquire()
+    assert time.perf_counter() - start < 0.05
+    
+    await bucket.acquire()
+    assert time.perf_counter() - start >= 0.08
+
+async def test_token_bucket_capacity_can_be_set():
+    assert TokenBucket(30).capacity == 1.0
+    bucket = TokenBucket(60_000, capacity=50)
+    await bucket.acquire(50)
+    start = time.perf_counter()
+    await bucket.acquire(50)
+    assert time.perf_counter() - start >= 0.04
+
+async def test_requests_above_capacity_leave_the_bucket_in_debt():
+    bucket = TokenBucket(6000, capacity=10)
+    await bucket.acquire(30)
+    
+    # The 20-token overdraft is repaid before the next token is handed out
+    start = time.perf_counter()
+    await bucket.acquire(1)
+    assert time.perf_counter() - start >= 0.18
+
+async def test_engine_passes_bursts_to_its_buckets(make_engine):
+    engine = make_engine(
+        requests_per_minute=600, tokens_per_minute=60_000, request_burst=3, token_burst=500
+    )
+    assert engine.request_bucket.capacity == 3
+    assert engine.token_bucket.capacity == 500
\ No newline at end of file
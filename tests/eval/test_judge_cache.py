@@ -0,0 +1,203 @@
+import time
+
+import pytest
+
+from evalkit.eval import judge_cache
+from evalkit.eval.engine import ScoringEngine
+from evalkit.eval.judge_cache import CachedScorer, JudgeCache, judge_key
+from evalkit.eval.scorer import Scorer
+
+class CountingScorer(Scorer):
+    """Scorer that rates every response by its length and counts its calls."""
+    
+    def __init__(self):
+        super().__init__(model="stub")
+        self.calls = []
+        self.batches = []
+        self.drop = set()
+        self.fail = False
+    
+    async def score(
+        self, query, response, expected_response=None, context=None, raise_errors=False
+    ):
+        self.calls.append(query)
+        if self.fail:
+            error = ConnectionError("judge unavailable")
+            if raise_errors:
+                raise error
+            return self.error_result(error)
+        return {
+            "scores": {"relevance": 1.0},
+            "overall_score": len(response) / 100,
+            "explanation": query
+        }
+    
+    async def score_batch(self, items, raise_errors=False):
+        self.batches.append([item["query"] for item in items])
+        # Queries in ``drop`` are left out of the reply, as if it failed to parse
+        return [
+            None if item["query"] in self.drop
+            else {"scores": {"relevance": 1.0}, "overall_score": 0.5, "explanation": "batch"}
+            for item in items
+        ]
+
+def key(query, **overrides):
+    arguments = {"model": "stub", "temperature": 0.0, "prompt_version": "1", **overrides}
+    return judge_key(
+        arguments["model"], arguments["temperature"], arguments["prompt_version"], query, "answer"
+    )
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = JudgeCache(str(tmp_path / "judge_cache.sqlite"))
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def scorer(cache):
+    return CachedScorer(CountingScorer(), cache)
+
+def test_keys_cover_every_input():
+    base = key("question")
+    assert key("question") == base
+    assert key("other question") != base
+    assert key("question", model="other") != base
+    assert key("question", temperature=0.5) != base
+    assert key("question", prompt_version="2") != base
+    assert judge_key("stub", 0.0, "1", "question", "answer", "expected") != base
+    assert judge_key("stub", 0.0, "1", "question", "answer", None, {"doc": 1}) != base
+
+def test_results_round_trip(cache):
+    assert cache.get(key("a")) is None
+    cache.put(key("a"), "stub", {"overall_score": 0.5})
+    assert cache.get(key("a")) == {"overall_score": 0.5}
+    assert cache.count() == 1
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = JudgeCache(str(tmp_path / "judge_cache.sqlite"), max_entries=2)
+    for query in ("a", "b"):
+        cache.put(key(query), "stub", {"query": query})
+        time.sleep(0.01)
+    cache.get(key("a"))
+    time.sleep(0.01)
+    cache.put(key("c"), "stub", {"query": "c"})
+    
+    assert cache.evict() == 1
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) == {"query": "a"}
+    assert cache.get(key("c")) == {"query": "c"}
+    cache.close()
+
+def test_eviction_runs_as_entries_are_written(tmp_path, monkeypatch):
+    monkeypatch.setattr(judge_cache, "_EVICT_EVERY", 4)
+    cache = JudgeCache(str(tmp_path / "judge_cache.sqlite"), max_entries=2)
+    for query in "abcd":
+        cache.put(key(query), "stub", {})
+    assert cache.count() == 2
+    cache.close()
+
+def test_expired_entries_are_not_served_or_kept(tmp_path):
+    path = str(tmp_path / "judge_cache.sqlite")
+    cache = JudgeCache(path, max_age=0.05)
+    cache.put(key("a"), "stub", {"query": "a"})
+    assert cache.get(key("a")) == {"query": "a"}
+    
+    time.sleep(0.1)
+    assert cache.get(key("a")) is None
+    assert cache.count() == 1
+    cache.close()
+    
+    # Opening the cache drops what has expired
+    reopened = JudgeCache(path, max_age=0.05)
+    assert reopened.count() == 0
+    reopened.close()
+
+async def test_repeated_items_are_served_from_the_cache(scorer):
+    item = {"query": "question", "response": "answer"}
+    first = await scorer.score(**item)
+    second = await scorer.score(**item)
+    
+    assert second == first
+    assert scorer.scorer.calls == ["question"]
+    assert (scorer.hits, scorer.misses) == (1, 1)
+    
+    await scorer.score(query="question", response="a different answer")
+    assert scorer.scorer.calls == ["question", "question"]
+
+async def test_error_results_are_not_cached(scorer):
+    scorer.scorer.fail = True
+    assert "error" in await scorer.score(query="question", response="answer")
+    
+    scorer.scorer.fail = False
+    assert "error" not in await scorer.score(query="question", response="answer")
+    assert len(scorer.scorer.calls) == 2
+    assert scorer.cache.count() == 1
+
+async def test_a_miss_is_counted_once_across_retries(scorer):
+    scorer.scorer.fail = True
+    engine = ScoringEngine(scorer, max_retries=2, backoff_base=0.001)
+    
+    result = await engine.score_one({"query": "question", "response": "answer"})
+    
+    assert "error" in result
+    assert len(scorer.scorer.calls) == 3
+    assert (scorer.hits, scorer.misses) == (0, 1)
+
+async def test_engine_skips_the_limits_for_cached_items(scorer):
+    items = [{"query": f"question {i}", "response": "answer"} for i in range(4)]
+    await ScoringEngine(scorer).score_many(items[:2])
+    
+    engine = ScoringEngine(scorer, requests_per_minute=600)
+    results = await engine.score_many(items)
+    
+    assert [result["explanation"] for result in results] == [item["query"] for item in items]
+    stats = engine.get_stats()
+    assert (stats["cached"], stats["requests"]) == (2, 2)
+    assert len(scorer.scorer.calls) == 4
+
+async def test_batch_results_are_cached_apart_from_single_results(scorer):
+    item = {"query": "question", "response": "answer"}
+    [batched] = await scorer.score_batch([item])
+    assert batched["explanation"] == "batch"
+    
+    # The single-item prompt differs, so its result is not served from the batch
+    single = await scorer.score(**item)
+    assert single["explanation"] == "question"
+    assert scorer.scorer.calls == ["question"]
+    assert scorer.cache.count() == 2
+    
+    assert await scorer.score_batch([item]) == [batched]
+    assert await scorer.score(**item) == single
+    assert scorer.scorer.batches == [["question"]]
+
+async def test_batch_lookups_fall_back_to_single_results(scorer):
+    items = [{"query": f"question {i}", "response": "answer"} for i in range(2)]
+    await scorer.score(**items[0])
+    
+    results = await scorer.score_batch(items)
+    
+    assert [result["explanation"] for result in results] == ["question 0", "batch"]
+    assert scorer.scorer.batches == [["question 1"]]
+
+async def test_batched_runs_are_fully_cached_on_rerun(scorer):
+    items = [{"query": f"question {i}", "response": "answer"} for i in range(5)]
+    first = await ScoringEngine(scorer, batch_size=2).score_many(items)
+    
+    engine = ScoringEngine(scorer, batch_size=2)
+    assert await engine.score_many(items) == first
+    assert engine.get_stats()["cached"] == 5
+    # The odd item out was scored alone
+    assert scorer.scorer.batches == [["question 0", "question 1"], ["question 2", "question 3"]]
+    assert scorer.scorer.calls == ["question 4"]
+
+async def test_split_retries_count_each_miss_once(scorer):
+    items = [{"query": f"question {i}", "response": "answer"} for i in range(4)]
+    scorer.scorer.drop = {"question 1"}
+    await ScoringEngine(scorer, batch_size=4).score_many(items)
+    
+    # The unparsed item was retried alone without another lookup
+    assert scorer.scorer.calls == ["question 1"]
+    assert (scorer.hits, scorer.misses) == (0, 4)
+    
+    await ScoringEngine(scorer, batch_size=4).score_many(items)
+    assert (scorer.hits, scorer.misses) == (4, 4)
\ No newline at end of file
@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from evalkit.db.database import db_session
+from evalkit.db.models import Evaluation, GoldenDataset, Interaction, RetrievalResult
+from evalkit.embed.hash_embedder import HashEmbedder
+from evalkit.eval.retrieval import RetrievalEvaluator, retrieval_metrics
+from evalkit.vector.faiss_store import FAISSStore
+
+def reference_metrics(found_ids, relevance, k):
+    """Per-query metrics computed one query at a time, straight from the definitions."""
+    rows = []
+    for found, labels in zip(found_ids, relevance):
+        found = list(found)[:k]
+        gains = [labels.get(id_, 0.0) if id_ is not None else 0.0 for id_ in found]
+        hits = sum(1 for gain in gains if gain > 0)
+        num_relevant = sum(1 for grade in labels.values() if grade > 0)
+        first_hit = next((rank for rank, gain in enumerate(gains, 1) if gain > 0), None)
+        dcg = sum((2 ** gain - 1) / math.log2(rank + 1) for rank, gain in enumerate(gains, 1))
+        ideal_gains = sorted(labels.values(), reverse=True)[:k]
+        ideal = sum(
+            (2 ** gain - 1) / math.log2(rank + 1) for rank, gain in enumerate(ideal_gains, 1)
+        )
+        rows.append({
+            f"recall_at_{k}": hits / num_relevant if num_relevant else math.nan,
+            f"precision_at_{k}": hits / k,
+            f"hit_rate_at_{k}": float(hits > 0),
+            "reciprocal_rank": 1.0 / first_hit if first_hit else 0.0,
+            f"ndcg_at_{k}": dcg / ideal if ideal > 0 else math.nan
+        })
+    return rows
+
+def random_case(seed, n_queries=40, k=8, corpus=30):
+    rng = np.random.default_rng(seed)
+    found_ids = np.empty((n_queries, k), dtype=object)
+    relevance = []
+    for row in range(n_queries):
+        ids = [f"doc-{i}" for i in rng.choice(corpus, size=k, replace=False)]
+        # Short result lists end in empty slots
+        for slot in range(int(rng.integers(k // 2, k + 1)), k):
+            ids[slot] = None
+        found_ids[row] = ids
+        labelled = rng.choice(corpus, size=int(rng.integers(0, 6)), replace=False)
+        relevance.append({f"doc-{i}": float(rng.integers(0, 4)) for i in labelled})
+    return found_ids, relevance
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [None, 3])
+def test_retrieval_metrics_match_a_brute_force_reference(seed, k):
+    found_ids, relevance = random_case(seed)
+    metrics = retrieval_metrics(found_ids, relevance, k)
+    expected = reference_metrics(found_ids, relevance, k or found_ids.shape[1])
+    
+    assert set(metrics) == set(expected[0])
+    for name, values in metrics.items():
+        np.testing.assert_allclose(values, [row[name] for row in expected], err_msg=name)
+
+def test_retrieval_metrics_without_any_labels():
+    found_ids = np.array([["a", "b"], [None, None]], dtype=object)
+    metrics = retrieval_metrics(found_ids, [{}, {}])
+    assert np.isnan(metrics["recall_at_2"]).all()
+    assert np.isnan(metrics["ndcg_at_2"]).all()
+    np.testing.assert_array_equal(metrics["precision_at_2"], [0.0, 0.0])
+    np.testing.assert_array_equal(metrics["reciprocal_rank"], [0.0, 0.0])
+
+DOCUMENTS = {
+    "password": "how to reset a forgotten password",
+    "billing": "update the credit card used for billing",
+    "export": "export a report as a csv file",
+    "invite": "invite a teammate to the workspace"
+}
+
+@pytest.fixture
+async def evaluator(database):
+    embedder = HashEmbedder(dimension=64)
+    store = FAISSStore()
+    await store.initialize({"dimension": 64, "executor_workers": 1})
+    await store.add_vectors(
+        await embedder.embed(list(DOCUMENTS.values())),
+        [{"text": text} for text in DOCUMENTS.values()],
+        list(DOCUMENTS)
+    )
+    async with db_session() as db:
+        db.add_all([
+            GoldenDataset(
+                name="support",
+                query="reset my forgotten password",
+                expected_response="",
+                relevance_labels={"password": 2}
+            ),
+            GoldenDataset(
+                name="support",
+                query="export the report to csv",
+                expected_response="",
+                relevance_labels={"export": 1, "billing": 0}
+            ),
+            # Unlabelled entries are not evaluated
+            GoldenDataset(name="support", query="hello", expected_response="")
+        ])
+    yield RetrievalEvaluator(store, embedder)
+    await store.close()
+
+async def test_evaluate_scores_and_saves_each_query(evaluator):
+    summary = await evaluator.evaluate("support", k=2)
+    
+    assert summary["num_queries"] == 2
+    assert summary["recall_at_2"] == 1.0
+    assert summary["reciprocal_rank"] == 1.0
+    assert summary["ndcg_at_2"] == 1.0
+    assert summary["precision_at_2"] == 0.5
+    
+    async with db_session() as db:
+        results = (
+            await db.execute(select(RetrievalResult).order_by(RetrievalResult.id))
+        ).scalars().all()
+        # Retrieval runs never show up as interactions for the judge or the dashboard
+        assert (await db.execute(select(Interaction))).scalars().all() == []
+        assert (await db.execute(select(Evaluation))).scalars().all() == []
+    assert [result.golden_dataset for result in results] == ["support"] * 2
+    assert [result.k for result in results] == [2, 2]
+    assert results[0].retrieved_ids[0] == "password"
+    assert [result.score for result in results] == [1.0, 1.0]
+    assert results[0].metrics["recall_at_2"] == 1.0
+
+async def test_evaluate_without_saving(evaluator):
+    await evaluator.evaluate("support", k=2, save=False)
+    async with db_session() as db:
+        assert (await db.execute(select(RetrievalResult))).scalars().all() == []
+
+async def test_unknown_datasets_are_rejected(evaluator):
+    with pytest.raises(ValueError, match="no entries with relevance labels"):
+        await evaluator.evaluate("missing")
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from evalkit.eval.scorer import (
+    CRITERIA,
+    GPTScorer,
+    ScorerFactory,
+    parse_batch_evaluation,
+    parse_evaluation
+)
+
+def evaluation(score=0.5, **extra):
+    return {"scores": {criterion: score for criterion in CRITERIA}, **extra}
+
+def test_parse_evaluation_tolerates_surrounding_text():
+    content = "Here you go:\n```json\n" + json.dumps(evaluation(0.8, explanation="ok")) + "\n```"
+    result = parse_evaluation(content)
+    assert result["scores"] == {criterion: 0.8 for criterion in CRITERIA}
+    assert result["overall_score"] == pytest.approx(0.8)
+    assert result["explanation"] == "ok"
+
+def test_parse_evaluation_clamps_scores():
+    data = evaluation(1.5, overall_score=-1)
+    data["scores"]["clarity"] = -0.2
+    result = parse_evaluation(json.dumps(data))
+    assert result["scores"]["relevance"] == 1.0
+    assert result["scores"]["clarity"] == 0.0
+    assert result["overall_score"] == 0.0
+
+@pytest.mark.parametrize("content", ["no json here", '{"overall_score": 1}'])
+def test_parse_evaluation_rejects_unusable_replies(content):
+    with pytest.raises(ValueError):
+        parse_evaluation(content)
+
+def test_parse_batch_evaluation_matches_items_by_number():
+    content = json.dumps([
+        {"item": 3, **evaluation(0.3)},
+        {"item": 1, **evaluation(0.1)},
+        # Duplicates and out-of-range numbers are ignored
+        {"item": 1, **evaluation(0.9)},
+        {"item": 7, **evaluation(0.7)}
+    ])
+    results = parse_batch_evaluation(content, 3)
+    assert results[0]["overall_score"] == pytest.approx(0.1)
+    assert results[1] is None
+    assert results[2]["overall_score"] == pytest.approx(0.3)
+
+def test_parse_batch_evaluation_falls_back_to_position():
+    content = json.dumps([evaluation(0.2), {"scores": {}}, evaluation(0.4)])
+    results = parse_batch_evaluation(content, 3)
+    assert [result and result["overall_score"] for result in results] == [
+        pytest.approx(0.2), None, pytest.approx(0.4)
+    ]
+
+@pytest.mark.parametrize("content", ["nothing", "[not json]", '{"item": 1}'])
+def test_parse_batch_evaluation_without_an_array(content):
+    assert parse_batch_evaluation(content, 2) == [None, None]
+
+async def test_batch_prompt_numbers_every_item():
+    scorer = ScorerFactory.create("gpt", model="gpt-4")
+    items = [
+        {"query": "first", "response": "one", "expected_response": "uno"},
+        {"query": "second", "response": "two", "context": {"doc": 2}}
+    ]
+    prompt = scorer.build_batch_prompt(items)
+    
+    assert prompt.index("### Item 1") < prompt.index("Query: first") < prompt.index("### Item 2")
+    assert "Expected Response: uno" in prompt
+    assert "Context: {'doc': 2}" in prompt
+    # The rubric is sent once, however many items there are
+    assert prompt.count("Relevance (0-1)") == 1
+    assert scorer.estimate_batch_tokens(items) < sum(
+        scorer.estimate_tokens(**item) for item in items
+    )
+    await scorer.close()
+
+async def test_gpt_scorer_reports_errors_unless_asked_to_raise(judge_server):
+    judge_server.failures = [(500, {}), (500, {})]
+    scorer = GPTScorer(base_url=judge_server.url)
+    
+    result = await scorer.score("question", "answer")
+    assert result["overall_score"] == 0.0
+    assert "500" in result["error"]
+    with pytest.raises(Exception):
+        await scorer.score("question", "answer", raise_errors=True)
+    await scorer.close()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import numpy as np
+from sqlalchemy import select
+
+from evalkit.db.database import db_session
+from evalkit.db.models import VectorStore as VectorStoreRecord
+from evalkit.vector.benchmark import ground_truth, load_dataset, run_benchmark, save_results
+
+async def saved_rows():
+    async with db_session() as db:
+        return (await db.execute(select(VectorStoreRecord))).scalars().all()
+
+def test_generated_dataset_is_normalized():
+    corpus, queries = load_dataset(num_vectors=200, dimension=8, num_queries=10)
+    assert corpus.shape == (200, 8) and queries.shape == (10, 8)
+    np.testing.assert_allclose(np.linalg.norm(corpus, axis=1), 1.0, rtol=1e-5)
+    
+    truth = ground_truth(corpus, queries, 5)
+    best = np.argmax(queries @ corpus.T, axis=1)
+    assert (truth[:, 0] == best).all()
+
+async def test_save_results_writes_a_row(database):
+    await save_results("faiss-flat", "faiss", {"index_type": "flat"}, {"recall_at_10": 1.0})
+    rows = await saved_rows()
+    assert [(row.name, row.type, row.config, row.metrics) for row in rows] == [
+        ("faiss-flat", "faiss", {"index_type": "flat"}, {"recall_at_10": 1.0})
+    ]
+
+async def test_run_benchmark_records_each_config(database):
+    corpus, queries = load_dataset(num_vectors=300, dimension=8, num_queries=20)
+    results = await run_benchmark(corpus, queries, names=["faiss-flat"], concurrency_levels=(1, 2))
+    
+    assert [result["name"] for result in results] == ["faiss-flat"]
+    metrics = results[0]["metrics"]
+    assert metrics["recall_at_10"] == 1.0
+    assert set(metrics["concurrency"]) == {"1", "2"}
+    
+    rows = await saved_rows()
+    assert [row.name for row in rows] == ["faiss-flat"]
+    assert rows[0].metrics["recall_at_10"] == 1.0
\ No newline at end of file
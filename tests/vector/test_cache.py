@@ -0,0 +1,118 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from evalkit.vector.cache import CachedVectorStore
+from evalkit.vector.faiss_store import FAISSStore
+
+DIM = 8
+
+class CountingStore(FAISSStore):
+    """FAISS store that counts the searches reaching it."""
+    
+    def __init__(self):
+        super().__init__()
+        self.searches = 0
+        self.batch_rows = 0
+    
+    async def search(self, *args, **kwargs):
+        self.searches += 1
+        return await super().search(*args, **kwargs)
+    
+    async def search_batch(self, query_matrix, *args, **kwargs):
+        self.batch_rows += len(query_matrix)
+        return await super().search_batch(query_matrix, *args, **kwargs)
+    
+    async def get_metrics(self, exact=False):
+        return {**await super().get_metrics(), "exact": exact}
+
+@pytest.fixture
+async def cached():
+    vectors = np.random.default_rng(0).standard_normal((20, DIM)).astype(np.float32)
+    store = CachedVectorStore(CountingStore(), ttl=None)
+    await store.initialize({"dimension": DIM, "executor_workers": 1})
+    await store.add_vectors(vectors, [{"text": f"chunk {i}"} for i in range(20)])
+    store.vectors = vectors
+    yield store
+    await store.close()
+
+async def test_repeated_searches_are_served_from_the_cache(cached):
+    first = await cached.search(cached.vectors[0], k=3)
+    second = await cached.search(cached.vectors[0], k=3)
+    assert cached.store.searches == 1
+    assert [result["id"] for result in second] == [result["id"] for result in first]
+    
+    # Mutating a returned result must not change the cached copy
+    second[0]["metadata"]["text"] = "changed"
+    assert (await cached.search(cached.vectors[0], k=3))[0]["metadata"]["text"] == "chunk 0"
+    
+    await cached.search(cached.vectors[0], k=4)
+    await cached.search(cached.vectors[0], k=3, filter_criteria={"text": "chunk 1"})
+    assert cached.store.searches == 3
+
+@pytest.mark.parametrize("write", ["add", "delete", "clear", "train"])
+async def test_writes_invalidate_the_cache(cached, write):
+    await cached.search(cached.vectors[0], k=3)
+    version = cached.version
+    if write == "add":
+        await cached.add_vectors(cached.vectors[:1], [{}], ["new"])
+    elif write == "delete":
+        await cached.delete_vectors(["0"])
+    elif write == "clear":
+        await cached.clear()
+    else:
+        # Delegated store methods that change results invalidate too
+        with pytest.raises(RuntimeError):
+            await cached.train(cached.vectors)
+    
+    assert cached.version == version + 1
+    await cached.search(cached.vectors[0], k=3)
+    assert cached.store.searches == 2
+
+async def test_results_of_searches_racing_a_write_are_not_cached(cached):
+    await asyncio.gather(
+        cached.search(cached.vectors[0], k=3),
+        cached.add_vectors(cached.vectors[:1], [{}], ["new"])
+    )
+    await cached.search(cached.vectors[0], k=3)
+    assert cached.store.searches == 2
+
+async def test_entries_expire_after_ttl(cached):
+    cached.ttl = 0.0
+    await cached.search(cached.vectors[0], k=3)
+    await cached.search(cached.vectors[0], k=3)
+    assert cached.store.searches == 2
+
+async def test_least_recently_used_entries_are_evicted(cached):
+    cached.max_entries = 2
+    for row in (0, 1, 0, 2):
+        await cached.search(cached.vectors[row], k=3)
+    assert cached.evictions == 1
+    
+    await cached.search(cached.vectors[0], k=3)
+    assert cached.store.searches == 3
+    await cached.search(cached.vectors[1], k=3)
+    assert cached.store.searches == 4
+
+async def test_search_batch_only_sends_missing_rows(cached):
+    distances, ids = await cached.search_batch(cached.vectors[:3], k=2)
+    again_distances, again_ids = await cached.search_batch(cached.vectors[:5], k=2)
+    assert cached.store.batch_rows == 5
+    np.testing.assert_array_equal(again_ids[:3], ids)
+    np.testing.assert_array_equal(again_distances[:3], distances)
+    assert again_ids[4, 0] == "4"
+
+async def test_lexical_search_is_cached(cached):
+    first = await cached.lexical_search("chunk", k=3)
+    assert await cached.lexical_search("chunk", k=3) == first
+    assert cached.hits == 1
+
+async def test_get_metrics_forwards_arguments(cached):
+    await cached.search(cached.vectors[0], k=3)
+    await cached.search(cached.vectors[0], k=3)
+    metrics = await cached.get_metrics(exact=True)
+    assert metrics["exact"] is True
+    assert metrics["total_vectors"] == 20
+    assert metrics["cache"]["hits"] == 1
+    assert metrics["cache"]["hit_rate"] == 0.5
\ No newline at end of file
@@ -0,0 +1,494 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import numpy as np
+import pytest
+
+from evalkit.vector.faiss_store import (
+    FULL_VECTORS_FILE,
+    INDEX_FILE,
+    METADATA_FILE,
+    WORKING_VECTORS_FILE,
+    FAISSStore,
+    _ReadWriteLock
+)
+
+DIM = 16
+
+def random_vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+@pytest.fixture
+async def make_store():
+    """Factory for initialized stores that are closed after the test."""
+    stores = []
+    
+    async def make(**config):
+        store = FAISSStore()
+        await store.initialize({"dimension": DIM, "executor_workers": 2, **config})
+        stores.append(store)
+        return store
+    
+    yield make
+    for store in stores:
+        await store.close()
+
+async def test_save_and_load_round_trip(make_store, tmp_path):
+    vectors = random_vectors(50)
+    store = await make_store(path=str(tmp_path))
+    ids = [f"doc-{i}" for i in range(50)]
+    await store.add_vectors(vectors, [{"n": i} for i in range(50)], ids)
+    await store.save()
+    
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [INDEX_FILE, METADATA_FILE, "metadata_columns"]
+    )
+    
+    loaded = await make_store(path=str(tmp_path))
+    results = await loaded.search(vectors[7], k=3)
+    assert results[0]["id"] == "doc-7"
+    assert results[0]["metadata"] == {"n": 7}
+    assert (await loaded.get_metrics())["total_vectors"] == 50
+
+async def test_mmap_load_is_read_only(make_store, tmp_path):
+    vectors = random_vectors(20)
+    store = await make_store()
+    await store.add_vectors(vectors, [{"n": i} for i in range(20)])
+    await store.save(str(tmp_path))
+    
+    mapped = await make_store(path=str(tmp_path), mmap=True)
+    assert mapped.read_only
+    assert (await mapped.search(vectors[3], k=1))[0]["id"] == "3"
+    with pytest.raises(RuntimeError, match="read-only"):
+        await mapped.add_vectors(vectors[:1], [{}])
+
+async def test_save_without_path_fails(make_store):
+    store = await make_store()
+    with pytest.raises(ValueError):
+        await store.save()
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw", "ivf_pq"])
+async def test_add_search_delete_save_load(make_store, tmp_path, index_type):
+    vectors = random_vectors(300)
+    store = await make_store(index_type=index_type, pq_m=4, pq_nbits=4)
+    ids = [f"doc-{i}" for i in range(300)]
+    await store.add_vectors(vectors, [{"n": i} for i in range(300)], ids)
+    
+    results = await store.search(vectors[42], k=5, nprobe=64)
+    assert results[0]["id"] == "doc-42"
+    
+    await store.delete_vectors(["doc-42"])
+    results = await store.search(vectors[42], k=5, nprobe=64)
+    assert "doc-42" not in [result["id"] for result in results]
+    
+    await store.save(str(tmp_path))
+    loaded = await make_store(path=str(tmp_path))
+    assert loaded.index_type == index_type
+    results = await loaded.search(vectors[7], k=5, nprobe=64)
+    assert results[0]["id"] == "doc-7"
+    assert "doc-42" not in [result["id"] for result in results]
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq"])
+async def test_search_before_training_is_empty(make_store, index_type):
+    store = await make_store(index_type=index_type, pq_m=4, pq_nbits=4)
+    assert await store.search(random_vectors(1)[0], k=3) == []
+    distances, ids = await store.search_batch(random_vectors(2), k=3)
+    assert ids.shape == (2, 3)
+    assert all(id_ is None for id_ in ids.ravel())
+
+async def test_search_after_clear_is_empty(make_store):
+    vectors = random_vectors(200)
+    store = await make_store(index_type="ivf_flat")
+    await store.add_vectors(vectors, [{} for _ in range(200)])
+    await store.clear()
+    assert await store.search(vectors[0], k=3) == []
+    
+    await store.add_vectors(vectors[:10], [{} for _ in range(10)], [f"new-{i}" for i in range(10)])
+    assert (await store.search(vectors[3], k=1, nprobe=64))[0]["id"] == "new-3"
+
+async def test_small_first_batch_derives_nlist(make_store):
+    vectors = random_vectors(100)
+    store = await make_store(index_type="ivf_flat")
+    await store.add_vectors(vectors, [{} for _ in range(100)])
+    assert store.index_type == "ivf_flat"
+    assert store.nlist == 2
+    assert (await store.search(vectors[5], k=1))[0]["id"] == "5"
+
+async def test_derived_nlist_grows_with_the_corpus(make_store, tmp_path):
+    vectors = random_vectors(20000)
+    store = await make_store(path=str(tmp_path), index_type="ivf_flat", nprobe=4)
+    for start in range(0, 20000, 1000):
+        batch = vectors[start:start + 1000]
+        await store.add_vectors(batch, [{} for _ in batch])
+        if start == 0:
+            assert store.nlist == 25
+    
+    assert store.nlist >= 256
+    assert faiss.extract_index_ivf(store.index).nlist == store.nlist
+    assert (await store.search(vectors[12345], k=1))[0]["id"] == "12345"
+    
+    # The derived list count keeps growing after a reload
+    await store.save()
+    reloaded = await make_store(path=str(tmp_path))
+    assert reloaded._auto_nlist and reloaded.nlist == store.nlist
+
+async def test_explicit_nlist_is_kept(make_store):
+    vectors = random_vectors(2000)
+    store = await make_store(index_type="ivf_flat", nlist=4)
+    for start in range(0, 2000, 500):
+        await store.add_vectors(vectors[start:start + 500], [{} for _ in range(500)])
+    assert store.nlist == 4
+
+async def test_batches_too_small_to_train_wait_in_flat_index(make_store):
+    vectors = random_vectors(300)
+    store = await make_store(index_type="ivf_pq", pq_m=4, pq_nbits=4)
+    await store.add_vectors(vectors[:10], [{} for _ in range(10)])
+    assert store.index_type == "flat"
+    assert (await store.search(vectors[5], k=1))[0]["id"] == "5"
+    
+    await store.add_vectors(vectors[10:], [{} for _ in range(290)])
+    assert store.index_type == "ivf_pq"
+    assert store.index.is_trained
+    assert (await store.search(vectors[250], k=1, nprobe=64))[0]["id"] == "250"
+
+async def test_explicit_train_on_too_few_vectors_fails(make_store):
+    store = await make_store(index_type="ivf_flat", nlist=64)
+    with pytest.raises(ValueError, match="at least 64"):
+        await store.train(random_vectors(10))
+
+async def test_adding_an_existing_id_replaces_it(make_store):
+    vectors = random_vectors(3)
+    store = await make_store()
+    await store.add_vectors(vectors[:2], [{"v": 1}, {"v": 1}], ["a", "b"])
+    await store.add_vectors(vectors[2:], [{"v": 2}], ["a"])
+    
+    results = await store.search(vectors[2], k=5)
+    assert [result["id"] for result in results] == ["a", "b"]
+    assert results[0]["metadata"] == {"v": 2}
+    assert (await store.get_metrics())["tombstoned_vectors"] == 1
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+async def test_compaction_removes_tombstones(make_store, index_type):
+    vectors = random_vectors(100)
+    store = await make_store(index_type=index_type, compaction_threshold=1.0)
+    await store.add_vectors(vectors, [{} for _ in range(100)])
+    await store.delete_vectors([str(i) for i in range(30)])
+    assert store.index.ntotal == 100
+    
+    await store.compact()
+    assert store.index.ntotal == 70
+    metrics = await store.get_metrics()
+    assert metrics["total_vectors"] == 70
+    assert metrics["tombstoned_vectors"] == 0
+    assert (await store.search(vectors[50], k=1, nprobe=64))[0]["id"] == "50"
+
+@pytest.mark.parametrize(
+    "index_type,storage_dtype",
+    [("flat", "int8"), ("ivf_flat", "float32"), ("hnsw", "float32"), ("hnsw", "int8")]
+)
+async def test_compacting_away_every_vector(make_store, index_type, storage_dtype):
+    vectors = random_vectors(50)
+    store = await make_store(
+        index_type=index_type, storage_dtype=storage_dtype, compaction_threshold=2.0
+    )
+    await store.add_vectors(vectors, [{} for _ in range(50)])
+    await store.delete_vectors([str(i) for i in range(50)])
+    
+    await store.compact()
+    assert len(await store.search(vectors[0], k=3)) == 0
+    
+    await store.add_vectors(vectors[:5], [{} for _ in range(5)], [f"new-{i}" for i in range(5)])
+    assert (await store.search(vectors[2], k=1, nprobe=64))[0]["id"] == "new-2"
+
+async def test_deletes_past_threshold_compact_in_background(make_store):
+    vectors = random_vectors(10)
+    store = await make_store(compaction_threshold=0.2)
+    await store.add_vectors(vectors, [{} for _ in range(10)])
+    await store.delete_vectors(["0", "1"])
+    await store._compaction_task
+    assert store.index.ntotal == 8
+
+async def test_failed_background_compaction_is_logged(make_store, caplog):
+    store = await make_store(compaction_threshold=0.2)
+    await store.add_vectors(random_vectors(10), [{} for _ in range(10)])
+    
+    async def fail():
+        raise OSError("disk full")
+    
+    store.compact = fail
+    await store.delete_vectors(["0", "1"])
+    task = store._compaction_task
+    await asyncio.wait([task])
+    await asyncio.sleep(0)
+    assert store._compaction_task is None
+    assert "Background compaction failed" in caplog.text
+    assert "disk full" in caplog.text
+
+async def test_close_waits_for_background_compaction():
+    store = FAISSStore()
+    await store.initialize({"dimension": DIM, "compaction_threshold": 0.2})
+    await store.add_vectors(random_vectors(10), [{} for _ in range(10)])
+    await store.delete_vectors(["0", "1"])
+    await store.close()
+    assert store.index.ntotal == 8
+
+async def test_search_batch_matches_single_searches(make_store):
+    vectors = random_vectors(40)
+    store = await make_store()
+    await store.add_vectors(vectors, [{} for _ in range(40)])
+    
+    distances, ids = await store.search_batch(vectors[:5], k=3)
+    assert distances.shape == ids.shape == (5, 3)
+    for row, query in enumerate(vectors[:5]):
+        expected = await store.search(query, k=3)
+        assert list(ids[row]) == [result["id"] for result in expected]
+        np.testing.assert_allclose(distances[row], [result["distance"] for result in expected])
+
+async def test_search_batch_pads_missing_hits_with_none(make_store):
+    vectors = random_vectors(2)
+    store = await make_store()
+    await store.add_vectors(vectors, [{}, {}])
+    _, ids = await store.search_batch(vectors, k=4)
+    assert ids.shape == (2, 4)
+    assert [id_ is None for id_ in ids[0]] == [False, False, True, True]
+
+@pytest.mark.parametrize("exact_filter_fraction", [0.0, 1.0])
+async def test_filtered_search_fills_k(make_store, exact_filter_fraction):
+    vectors = random_vectors(200)
+    store = await make_store(exact_filter_fraction=exact_filter_fraction)
+    metadata = [{"parity": i % 2} for i in range(200)]
+    await store.add_vectors(vectors, metadata)
+    
+    results = await store.search(vectors[10], k=10, filter_criteria={"parity": 1})
+    assert len(results) == 10
+    assert all(result["metadata"]["parity"] == 1 for result in results)
+    
+    # The unfiltered nearest neighbour is excluded by the filter
+    assert "10" not in [result["id"] for result in results]
+
+async def test_filters_follow_deletes_and_replacements(make_store):
+    vectors = random_vectors(3)
+    store = await make_store()
+    await store.add_vectors(vectors, [{"tag": "x"}, {"tag": "x"}, {"tag": "y"}], ["a", "b", "c"])
+    await store.delete_vectors(["a"])
+    await store.add_vectors(vectors[1:2], [{"tag": "y"}], ["b"])
+    
+    assert await store.search(vectors[0], k=3, filter_criteria={"tag": "x"}) == []
+    results = await store.search(vectors[0], k=3, filter_criteria={"tag": "y"})
+    assert sorted(result["id"] for result in results) == ["b", "c"]
+
+async def test_index_work_runs_on_the_executor(make_store):
+    store = await make_store()
+    await store.add_vectors(random_vectors(1), [{}])
+    thread_name = await store._run(lambda: threading.current_thread().name)
+    assert thread_name.startswith("faiss")
+
+async def test_close_leaves_a_shared_executor_running():
+    executor = ThreadPoolExecutor(max_workers=1)
+    store = FAISSStore()
+    await store.initialize({"dimension": DIM, "executor": executor})
+    await store.add_vectors(random_vectors(1), [{}])
+    await store.close()
+    assert executor.submit(lambda: 1).result() == 1
+    executor.shutdown()
+
+def test_read_write_lock_excludes_readers_during_a_write():
+    lock = _ReadWriteLock()
+    events = []
+    
+    def read():
+        with lock.read():
+            events.append("read")
+    
+    with lock.write():
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(0.1)
+        assert events == []
+    reader.join(1)
+    assert events == ["read"]
+
+async def test_concurrent_searches_and_writes(make_store):
+    vectors = random_vectors(200)
+    store = await make_store(executor_workers=4)
+    await store.add_vectors(vectors[:100], [{"n": i} for i in range(100)])
+    
+    async def write():
+        for start in range(100, 200, 10):
+            await store.add_vectors(vectors[start:start + 10], [{"n": start}] * 10)
+    
+    results = await asyncio.gather(write(), *(store.search(vectors[i], k=5) for i in range(50)))
+    for i, hits in enumerate(results[1:]):
+        assert hits[0]["id"] == str(i)
+
+async def test_searches_race_adds_and_deletes(make_store):
+    vectors = random_vectors(400)
+    store = await make_store(executor_workers=8, compaction_threshold=1.0)
+    metadata = [{"text": f"chunk number {i}", "n": i, "tag": f"t{i % 7}"} for i in range(400)]
+    await store.add_vectors(vectors[:100], metadata[:100])
+    
+    async def write():
+        for start in range(100, 400, 20):
+            await store.add_vectors(vectors[start:start + 20], metadata[start:start + 20])
+            await store.delete_vectors([str(i) for i in range(start - 100, start - 90)])
+    
+    async def read(i):
+        for result in await store.search(vectors[i], k=5):
+            assert result["metadata"]["n"] == int(result["id"])
+        for result in await store.lexical_search("chunk number", k=5):
+            assert result["metadata"]["n"] == int(result["id"])
+        distances, ids = await store.search_batch(vectors[i:i + 1], k=3)
+        for distance, id_ in zip(distances[0], ids[0]):
+            expected = np.sum((vectors[int(id_)] - vectors[i]) ** 2)
+            assert distance == pytest.approx(expected, rel=1e-4, abs=1e-4)
+    
+    await asyncio.gather(write(), *(read(i % 400) for i in range(300)))
+
+@pytest.mark.parametrize("storage_dtype", ["float16", "int8"])
+async def test_reduced_precision_storage_with_rerank(make_store, storage_dtype):
+    vectors = random_vectors(500)
+    store = await make_store(storage_dtype=storage_dtype, rerank=True)
+    await store.add_vectors(vectors, [{} for _ in range(500)])
+    
+    results = await store.search(vectors[9], k=3)
+    assert results[0]["id"] == "9"
+    assert results[0]["distance"] == pytest.approx(0.0, abs=1e-5)
+    
+    metrics = await store.get_metrics()
+    assert metrics["storage_dtype"] == storage_dtype
+    assert 0.0 <= metrics["quantization_recall_at_10"] <= 1.0
+    assert metrics["rerank_recall_at_10"] >= metrics["quantization_recall_at_10"]
+
+async def test_tuning_settings_override_the_snapshot(make_store, tmp_path):
+    vectors = random_vectors(200)
+    store = await make_store(
+        path=str(tmp_path), index_type="hnsw", hnsw_m=8, ef_search=16, storage_dtype="float16"
+    )
+    await store.add_vectors(vectors, [{} for _ in range(200)])
+    await store.save()
+    
+    reopened = await make_store(path=str(tmp_path))
+    assert (reopened.ef_search, reopened.rerank) == (16, False)
+    
+    # Structural settings come from the snapshot whatever the caller asks for
+    tuned = await make_store(
+        path=str(tmp_path), index_type="flat", hnsw_m=64, ef_search=256, rerank=True
+    )
+    assert (tuned.index_type, tuned.hnsw_m, tuned.storage_dtype) == ("hnsw", 8, "float16")
+    assert (tuned.ef_search, tuned.rerank) == (256, True)
+    results = await tuned.search(vectors[150], k=1)
+    assert results[0]["id"] == "150"
+
+def read_snapshot_vectors(path) -> np.ndarray:
+    return np.fromfile(os.path.join(path, FULL_VECTORS_FILE), dtype=np.float32).reshape(-1, DIM)
+
+def working_files(path):
+    return sorted(name for name in os.listdir(path) if name.startswith(WORKING_VECTORS_FILE))
+
+async def test_full_vectors_snapshot_only_changes_on_save(make_store, tmp_path):
+    vectors = random_vectors(50)
+    store = await make_store(path=str(tmp_path), storage_dtype="float16", rerank=True)
+    await store.add_vectors(vectors, [{} for _ in range(50)])
+    await store.save()
+    np.testing.assert_array_equal(read_snapshot_vectors(tmp_path), vectors)
+    
+    # Replacing and adding vectors leaves the saved snapshot untouched
+    replacement = random_vectors(1, seed=1)
+    await store.add_vectors(replacement, [{}], ["3"])
+    await store.add_vectors(random_vectors(5, seed=2), [{} for _ in range(5)])
+    np.testing.assert_array_equal(read_snapshot_vectors(tmp_path), vectors)
+    assert working_files(tmp_path) == [os.path.basename(store._full_vectors.path)]
+    
+    reloaded = await make_store(path=str(tmp_path))
+    results = await reloaded.search(vectors[3], k=1)
+    assert results[0]["id"] == "3"
+    assert results[0]["distance"] == pytest.approx(0.0, abs=1e-5)
+    
+    await store.save()
+    saved = read_snapshot_vectors(tmp_path)
+    assert len(saved) == 56
+    np.testing.assert_array_equal(saved[store._id_to_internal["3"]], replacement[0])
+
+async def test_full_vectors_are_copied_when_saving_elsewhere(make_store, tmp_path):
+    vectors = random_vectors(20)
+    store = await make_store(path=str(tmp_path / "live"), rerank=True)
+    await store.add_vectors(vectors, [{} for _ in range(20)])
+    await store.save(str(tmp_path / "copy"))
+    
+    np.testing.assert_array_equal(read_snapshot_vectors(tmp_path / "copy"), vectors)
+    assert sorted(os.listdir(tmp_path / "copy")) == sorted(
+        [INDEX_FILE, METADATA_FILE, FULL_VECTORS_FILE, "metadata_columns"]
+    )
+
+async def test_loaded_full_vectors_are_written_to_a_working_copy(make_store, tmp_path):
+    vectors = random_vectors(20)
+    store = await make_store(path=str(tmp_path), rerank=True)
+    await store.add_vectors(vectors, [{} for _ in range(20)])
+    await store.save()
+    
+    reloaded = await make_store(path=str(tmp_path), rerank=True)
+    await reloaded.add_vectors(random_vectors(1, seed=1), [{}], ["0"])
+    np.testing.assert_array_equal(read_snapshot_vectors(tmp_path), vectors)
+    
+    mapped = await make_store(path=str(tmp_path), mmap=True)
+    assert mapped._full_vectors.path == os.path.join(tmp_path, FULL_VECTORS_FILE)
+    assert (await mapped.search(vectors[5], k=1))[0]["id"] == "5"
+
+async def test_readers_leave_a_writers_working_file_alone(make_store, tmp_path):
+    vectors = random_vectors(2000)
+    store = await make_store(path=str(tmp_path), rerank=True)
+    await store.add_vectors(vectors[:20], [{} for _ in range(20)])
+    await store.save()
+    
+    await store.close()
+    assert working_files(tmp_path) == []
+    
+    writer = await make_store(path=str(tmp_path), rerank=True)
+    [working] = working_files(tmp_path)
+    # Neither a read-only reader nor a second writer touches the first writer's file
+    await make_store(path=str(tmp_path), mmap=True)
+    other = await make_store(path=str(tmp_path), rerank=True)
+    assert working in working_files(tmp_path)
+    assert len(working_files(tmp_path)) == 2
+    
+    # Growing past the copied rows keeps the rows already written
+    await writer.add_vectors(vectors[20:], [{} for _ in range(1980)])
+    await writer.save()
+    np.testing.assert_array_equal(read_snapshot_vectors(tmp_path), vectors)
+    
+    await other.close()
+    assert working_files(tmp_path) == [working]
+
+async def test_growing_a_removed_working_file_raises(make_store, tmp_path):
+    store = await make_store(path=str(tmp_path), rerank=True)
+    await store.add_vectors(random_vectors(20), [{} for _ in range(20)])
+    os.remove(store._full_vectors.path)
+    with pytest.raises(RuntimeError, match="removed or replaced"):
+        await store.add_vectors(random_vectors(2000, seed=1), [{} for _ in range(2000)])
+
+async def test_ivf_pq_rejects_storage_dtype(make_store):
+    with pytest.raises(ValueError, match="ivf_pq"):
+        await make_store(index_type="ivf_pq", storage_dtype="float16")
+
+async def test_lexical_and_hybrid_search(make_store):
+    texts = ["reset your password", "billing invoice overdue", "password policy for admins"]
+    vectors = random_vectors(3)
+    store = await make_store()
+    metadata = [{"text": text, "team": i % 2} for i, text in enumerate(texts)]
+    await store.add_vectors(vectors, metadata)
+    
+    results = await store.lexical_search("password", k=5)
+    assert sorted(result["id"] for result in results) == ["0", "2"]
+    assert all(result["score"] > 0 for result in results)
+    filtered = await store.lexical_search("password", k=5, filter_criteria={"team": 1})
+    assert [result["id"] for result in filtered] == []
+    
+    hybrid = await store.hybrid_search("password", vectors[2], k=2)
+    assert hybrid[0]["id"] == "2"
+    assert hybrid[0]["dense_rank"] == 1 and hybrid[0]["lexical_rank"] is not None
+    
+    await store.delete_vectors(["2"])
+    assert [result["id"] for result in await store.lexical_search("password", k=5)] == ["0"]
\ No newline at end of file
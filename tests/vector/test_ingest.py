@@ -0,0 +1,177 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from evalkit.embed.hash_embedder import HashEmbedder
+from evalkit.vector.faiss_store import FAISSStore
+from evalkit.vector.ingest import IngestPipeline, load_checkpoint, read_records
+
+DIM = 16
+
+class RecordingStore(FAISSStore):
+    """FAISS store that records the IDs written and counts saves."""
+    
+    def __init__(self):
+        super().__init__()
+        self.written = []
+        self.saves = 0
+        self.saved_rows = []
+    
+    async def add_vectors(self, vectors, metadata, ids=None):
+        self.written.extend(ids or [])
+        return await super().add_vectors(vectors, metadata, ids)
+    
+    async def save(self, path=None):
+        self.saves += 1
+        self.saved_rows.append(len(self.written))
+
+@pytest.fixture
+async def store():
+    store = RecordingStore()
+    await store.initialize({"dimension": DIM, "executor_workers": 1})
+    yield store
+    await store.close()
+
+def write_jsonl(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return str(path)
+
+def documents(n):
+    return [{"doc_id": f"doc-{i}", "text": f"document number {i}", "n": i} for i in range(n)]
+
+async def test_ingests_jsonl_with_ids_and_metadata(store, tmp_path):
+    source = write_jsonl(tmp_path / "corpus.jsonl", documents(25))
+    pipeline = IngestPipeline(
+        store, HashEmbedder(dimension=DIM), id_field="doc_id", batch_size=10
+    )
+    
+    progress = await pipeline.run(source)
+    
+    assert progress["rows"] == 25
+    assert progress["skipped"] == 0
+    assert store.written == [f"doc-{i}" for i in range(25)]
+    query = HashEmbedder(dimension=DIM).embed_sync(["document number 7"])[0]
+    results = await store.search(query, k=1)
+    assert results[0]["id"] == "doc-7"
+    assert results[0]["metadata"] == {"text": "document number 7", "n": 7}
+
+async def test_records_without_text_or_id_are_skipped_and_counted(store, tmp_path):
+    records = documents(6)
+    records[1]["text"] = ""
+    del records[3]["text"]
+    del records[4]["doc_id"]
+    source = write_jsonl(tmp_path / "corpus.jsonl", records)
+    pipeline = IngestPipeline(store, HashEmbedder(dimension=DIM), id_field="doc_id")
+    
+    progress = await pipeline.run(source)
+    
+    assert progress["rows"] == 3
+    assert progress["skipped"] == 3
+    assert store.written == ["doc-0", "doc-2", "doc-5"]
+
+async def test_precomputed_vectors(store, tmp_path):
+    vectors = np.random.default_rng(0).standard_normal((5, DIM)).astype(np.float32)
+    records = [{"id": str(i), "embedding": vector.tolist()} for i, vector in enumerate(vectors)]
+    source = write_jsonl(tmp_path / "vectors.jsonl", records)
+    pipeline = IngestPipeline(store, id_field="id", vector_field="embedding")
+    
+    await pipeline.run(source)
+    
+    results = await store.search(vectors[3], k=1)
+    assert results[0]["id"] == "3"
+    assert "embedding" not in results[0]["metadata"]
+
+async def test_an_embedder_is_required_for_text(store, tmp_path):
+    source = write_jsonl(tmp_path / "corpus.jsonl", documents(1))
+    with pytest.raises(ValueError, match="embedder"):
+        await IngestPipeline(store).run(source)
+
+async def test_resumes_from_the_checkpoint(store, tmp_path):
+    source = write_jsonl(tmp_path / "corpus.jsonl", documents(30))
+    checkpoint_path = str(tmp_path / "corpus.checkpoint")
+    
+    class Interrupted(Exception):
+        pass
+    
+    def interrupt(progress):
+        if progress["rows"] >= 20:
+            raise Interrupted
+    
+    pipeline = IngestPipeline(
+        store,
+        HashEmbedder(dimension=DIM),
+        id_field="doc_id",
+        batch_size=10,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every=10
+    )
+    with pytest.raises(Interrupted):
+        await pipeline.run(source, on_progress=interrupt)
+    
+    checkpoint = load_checkpoint(checkpoint_path, source)
+    assert checkpoint["rows"] == 20
+    assert not checkpoint["complete"]
+    assert store.saves == 2
+    
+    store.written.clear()
+    progress = await pipeline.run(source)
+    
+    assert progress["resumed_from"] == checkpoint["offset"]
+    assert progress["rows"] == 30
+    assert store.written == [f"doc-{i}" for i in range(20, 30)]
+    assert load_checkpoint(checkpoint_path, source)["complete"]
+
+@pytest.mark.parametrize("growth, saved_rows", [
+    (0.5, [10, 20, 40, 80, 100]),
+    (0, [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 100])
+])
+async def test_checkpoint_interval_grows_with_the_corpus(store, tmp_path, growth, saved_rows):
+    source = write_jsonl(tmp_path / "corpus.jsonl", documents(100))
+    pipeline = IngestPipeline(
+        store,
+        HashEmbedder(dimension=DIM),
+        id_field="doc_id",
+        batch_size=10,
+        checkpoint_path=str(tmp_path / "corpus.checkpoint"),
+        checkpoint_every=10,
+        checkpoint_growth=growth
+    )
+    await pipeline.run(source)
+    assert store.saved_rows == saved_rows
+
+async def test_a_checkpoint_for_another_source_is_rejected(store, tmp_path):
+    first = write_jsonl(tmp_path / "first.jsonl", documents(3))
+    second = write_jsonl(tmp_path / "second.jsonl", documents(3))
+    checkpoint_path = str(tmp_path / "ingest.checkpoint")
+    pipeline = IngestPipeline(
+        store, HashEmbedder(dimension=DIM), checkpoint_path=checkpoint_path
+    )
+    await pipeline.run(first)
+    
+    with pytest.raises(ValueError, match="belongs to"):
+        await pipeline.run(second)
+
+def test_parquet_offsets_skip_whole_row_groups(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "corpus.parquet")
+    pq.write_table(pa.Table.from_pylist(documents(25)), path, row_group_size=10)
+    
+    chunks = list(read_records(path, batch_size=4, offset=13))
+    
+    assert [record["n"] for records, _ in chunks for record in records] == list(range(13, 25))
+    assert chunks[-1][1] == 25
+    assert all(offset == records[-1]["n"] + 1 for records, offset in chunks)
+
+def test_parquet_without_pyarrow_names_the_extra(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(ImportError, match=r"evalkit\[parquet\]"):
+        next(read_records(str(tmp_path / "corpus.parquet")))
+
+def test_unknown_formats_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported ingest format"):
+        read_records(str(tmp_path / "corpus.csv"))
\ No newline at end of file
@@ -0,0 +1,78 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from evalkit.vector.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+
+DOCS = [
+    "error ERR-1042 raised while syncing the cache",
+    "the cache is synced every minute",
+    "upgrade to v1.2.3 to fix the sync error",
+    "unrelated text about cooking pasta",
+    "error error error in the cache layer",
+]
+
+def reference_bm25(docs, query, k1=1.2, b=0.75):
+    """Textbook BM25 scores of every document, for comparison."""
+    terms = [tokenize(doc) for doc in docs]
+    average_length = sum(len(doc) for doc in terms) / len(terms)
+    scores = []
+    for doc in terms:
+        counts = Counter(doc)
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in other for other in terms)
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(terms) - df + 0.5) / (df + 0.5))
+            tf = counts[term]
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / average_length))
+        scores.append(score)
+    return np.array(scores)
+
+def test_tokenize_keeps_compound_tokens_and_their_parts():
+    assert tokenize("Fix ERR-1042 in v1.2.3") == [
+        "fix", "err-1042", "err", "1042", "in", "v1.2.3", "v1", "2", "3"
+    ]
+
+@pytest.mark.parametrize("query", ["error cache", "ERR-1042", "sync", "pasta error"])
+def test_bm25_matches_the_reference(query):
+    index = BM25Index()
+    for internal_id, doc in enumerate(DOCS):
+        index.add(internal_id, doc)
+    
+    scores, ids = index.search(query, k=len(DOCS))
+    expected = reference_bm25(DOCS, query)
+    np.testing.assert_allclose(scores, expected[ids], rtol=1e-5)
+    assert set(ids.tolist()) == set(np.flatnonzero(expected).tolist())
+    assert (np.diff(scores) <= 0).all()
+
+def test_removed_documents_leave_the_statistics():
+    index = BM25Index()
+    for internal_id, doc in enumerate(DOCS):
+        index.add(internal_id, doc)
+    index.remove(3)
+    
+    scores, ids = index.search("error cache", k=10)
+    live = [doc for i, doc in enumerate(DOCS) if i != 3]
+    expected = reference_bm25(live, "error cache")
+    positions = [i if i < 3 else i - 1 for i in ids.tolist()]
+    np.testing.assert_allclose(scores, expected[positions], rtol=1e-5)
+    assert len(index) == 4
+
+def test_search_respects_allowed_ids_and_k():
+    index = BM25Index()
+    for internal_id, doc in enumerate(DOCS):
+        index.add(internal_id, doc)
+    _, ids = index.search("error", k=1)
+    assert ids.tolist() == [4]
+    _, ids = index.search("error", k=10, allowed=np.array([0, 2]))
+    assert sorted(ids.tolist()) == [0, 2]
+    assert index.search("nothing", k=10)[1].tolist() == []
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+    assert [id_ for id_, _ in fused] == ["a", "c", "b"]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from evalkit.vector.metadata_index import InvertedMetadataIndex
+
+def test_match_intersects_criteria():
+    index = InvertedMetadataIndex()
+    index.add(1, {"lang": "en", "tier": 1})
+    index.add(2, {"lang": "en", "tier": 2})
+    index.add(3, {"lang": "de", "tier": 1})
+    
+    assert index.match({"lang": "en"}).tolist() == [1, 2]
+    assert index.match({"lang": "en", "tier": 1}).tolist() == [1]
+    assert index.match({"lang": "fr"}).tolist() == []
+
+def test_unhashable_values_are_not_indexed():
+    index = InvertedMetadataIndex()
+    index.add(1, {"tags": ["a", "b"], "lang": "en"})
+    assert index.match({"tags": ["a", "b"]}).tolist() == []
+    assert index.match({"lang": "en"}).tolist() == [1]
+
+def test_remove_drops_empty_postings():
+    index = InvertedMetadataIndex()
+    index.add(1, {"lang": "en"})
+    index.remove(1, {"lang": "en"})
+    assert len(index) == 0
+    assert index.match({"lang": "en"}).tolist() == []
\ No newline at end of file
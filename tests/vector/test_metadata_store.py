@@ -0,0 +1,72 @@
+import json
+import os
+
+import numpy as np
+
+from evalkit.vector.metadata_store import SCHEMA_FILE, ColumnarMetadataStore
+
+def ids(*values):
+    return np.array(values, dtype=np.int64)
+
+def test_take_returns_rows_in_order():
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(0, 1, 2), [{"source": "a", "n": 1}, {"source": "b"}, {"n": 2.5}])
+    assert store.take(ids(2, 0)) == [{"n": 2.5}, {"source": "a", "n": 1}]
+    assert store.get(1) == {"source": "b"}
+    assert store.get(5) is None
+    assert len(store) == 3
+
+def test_mixed_values_widen_the_column():
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(0), [{"v": 1}])
+    store.set_rows(ids(1), [{"v": "x"}])
+    store.set_rows(ids(2), [{"v": [1, 2]}])
+    assert [row["v"] for row in store.take(ids(0, 1, 2))] == [1, "x", [1, 2]]
+
+def test_mixed_numbers_keep_their_types(tmp_path):
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(0), [{"page": 1}])
+    store.set_rows(ids(1), [{"page": 1.5}])
+    pages = [row["page"] for row in store.take(ids(0, 1))]
+    assert pages == [1, 1.5] and type(pages[0]) is int
+    
+    path = str(tmp_path / "columns")
+    store.save(path)
+    loaded = ColumnarMetadataStore()
+    loaded.load(path)
+    assert type(loaded.get(0)["page"]) is int
+    assert loaded.get(1) == {"page": 1.5}
+
+def test_gather_decodes_strings():
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(0, 1), [{"text": "hello"}, {}])
+    assert store.gather("text", ids(0, 1)).tolist() == ["hello", None]
+    assert store.gather("missing", ids(0)).tolist() == [None]
+
+def test_compact_releases_deleted_strings():
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(0, 1, 2), [{"text": f"chunk {i}", "only": "x"} for i in range(3)])
+    store.delete(ids(0, 2))
+    store.set_rows(ids(3), [{"text": "chunk 3"}])
+    store.delete(ids(1))
+    store.compact()
+    
+    assert store._columns["text"].dictionary == ["chunk 3"]
+    assert "only" not in store._columns
+    assert store.take(ids(3)) == [{"text": "chunk 3"}]
+    
+    store.set_rows(ids(4), [{"text": "chunk 4"}])
+    assert store.take(ids(3, 4)) == [{"text": "chunk 3"}, {"text": "chunk 4"}]
+
+def test_save_writes_only_used_strings(tmp_path):
+    store = ColumnarMetadataStore()
+    store.set_rows(ids(*range(100)), [{"text": f"chunk {i}"} for i in range(100)])
+    store.delete(ids(*range(99)))
+    path = str(tmp_path / "columns")
+    store.save(path)
+    
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        assert json.load(f)["columns"][0]["dictionary"] == ["chunk 99"]
+    loaded = ColumnarMetadataStore()
+    loaded.load(path, mmap=True)
+    assert loaded.items() == [(99, {"text": "chunk 99"})]
\ No newline at end of file
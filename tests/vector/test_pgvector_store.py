@@ -0,0 +1,262 @@
+import os
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from evalkit.db.database import db_session, engine
+from evalkit.vector.pgvector_store import PGVectorStore
+
+pytestmark = pytest.mark.skipif(
+    not os.environ["DATABASE_URL"].startswith("postgresql"),
+    reason="set EVALKIT_TEST_DATABASE_URL to a Postgres database with pgvector"
+)
+
+DIM = 8
+
+def random_vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+@pytest.fixture
+async def make_store():
+    """Factory for stores on fresh tables, dropped after the test."""
+    tables = []
+    
+    async def make(**config):
+        store = PGVectorStore()
+        table_name = f"test_vectors_{uuid.uuid4().hex[:8]}"
+        tables.append(table_name)
+        # Iterative index scans need pgvector 0.8
+        await store.initialize(
+            {"dimension": DIM, "table_name": table_name, "iterative_scan": None, **config}
+        )
+        return store
+    
+    yield make
+    async with db_session() as db:
+        for table_name in tables:
+            await db.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+    await engine.dispose()
+
+async def test_add_search_delete_and_clear(make_store):
+    vectors = random_vectors(20)
+    store = await make_store()
+    ids = await store.add_vectors(vectors, [{"n": i} for i in range(20)])
+    
+    results = await store.search(vectors[4], k=3)
+    assert results[0]["id"] == ids[4]
+    assert results[0]["metadata"] == {"n": 4}
+    
+    await store.delete_vectors([ids[4]])
+    assert ids[4] not in [result["id"] for result in await store.search(vectors[4], k=3)]
+    
+    await store.clear()
+    assert await store.search(vectors[0], k=3) == []
+
+async def index_oid(table_name: str):
+    async with db_session() as db:
+        result = await db.execute(
+            text("SELECT to_regclass(:name)::oid"), {"name": f"{table_name}_embedding_idx"}
+        )
+        return result.scalar()
+
+async def test_copy_loads_rows_in_batches(make_store):
+    vectors = random_vectors(25)
+    metadata = [{"text": f"résumé {i}", "tags": ["a", i]} for i in range(25)]
+    store = await make_store(copy_batch_size=7)
+    ids = await store.add_vectors(vectors, metadata)
+    
+    assert len(set(ids)) == 25
+    async with db_session() as db:
+        result = await db.execute(
+            text(f"SELECT id, embedding, metadata FROM {store.table_name} ORDER BY id")
+        )
+        rows = result.fetchall()
+    assert [str(row[0]) for row in rows] == ids
+    np.testing.assert_allclose(np.stack([row[1].to_numpy() for row in rows]), vectors)
+    assert [row[2] for row in rows] == metadata
+
+async def test_large_loads_rebuild_the_ivf_index(make_store):
+    store = await make_store(rebuild_index_threshold=10)
+    assert await index_oid(store.table_name) is None
+    
+    # The IVF index is deferred until the table has rows
+    await store.add_vectors(random_vectors(5), [{} for _ in range(5)])
+    first = await index_oid(store.table_name)
+    assert first is not None
+    
+    await store.add_vectors(random_vectors(5, seed=1), [{} for _ in range(5)])
+    assert await index_oid(store.table_name) == first
+    
+    await store.add_vectors(random_vectors(20, seed=2), [{} for _ in range(20)])
+    assert await index_oid(store.table_name) not in (None, first)
+    assert (await store.get_metrics(exact=True))["total_vectors"] == 30
+
+async def test_search_batch_binds_vectors_through_the_codec(make_store):
+    vectors = random_vectors(30)
+    store = await make_store()
+    await store.add_vectors(vectors, [{} for _ in range(30)])
+    
+    distances, found = await store.search_batch(vectors[:4], k=3)
+    assert found.shape == distances.shape == (4, 3)
+    for row, query in enumerate(vectors[:4]):
+        expected = await store.search(query, k=3)
+        assert list(found[row]) == [result["id"] for result in expected]
+        np.testing.assert_allclose(
+            distances[row], [result["distance"] for result in expected], rtol=1e-5
+        )
+
+async def test_exact_ids_bind_vectors_through_the_codec(make_store):
+    vectors = random_vectors(30)
+    store = await make_store()
+    ids = await store.add_vectors(vectors, [{} for _ in range(30)])
+    
+    exact = await store._exact_ids(vectors[:4], k=3)
+    assert exact.shape == (4, 3)
+    assert [str(row[0]) for row in exact] == ids[:4]
+
+async def test_filters_apply_before_the_limit(make_store):
+    vectors = random_vectors(60)
+    store = await make_store()
+    ids = await store.add_vectors(vectors, [{"parity": i % 2, "src": "x"} for i in range(60)])
+    
+    results = await store.search(vectors[10], k=10, filter_criteria={"parity": 1, "src": "x"})
+    assert len(results) == 10
+    assert all(result["metadata"]["parity"] == 1 for result in results)
+    assert ids[10] not in [result["id"] for result in results]
+    
+    _, found = await store.search_batch(vectors[:2], k=5, filter_criteria={"parity": 0})
+    odd = set(ids[1::2])
+    assert found.shape == (2, 5)
+    assert not odd & set(found.ravel())
+
+async def test_filter_values_are_bound_not_interpolated(make_store):
+    store = await make_store()
+    await store.add_vectors(random_vectors(2), [{"name": "it's"}, {"name": "x"}])
+    results = await store.search(random_vectors(1)[0], k=5, filter_criteria={"name": "it's"})
+    assert [result["metadata"] for result in results] == [{"name": "it's"}]
+
+async def test_legacy_metadata_table_is_migrated(make_store):
+    table_name = f"test_vectors_{uuid.uuid4().hex[:8]}"
+    metadata_table = f"{table_name}_metadata"
+    async with db_session() as db:
+        await db.execute(text(
+            f"CREATE TABLE {table_name} (id SERIAL PRIMARY KEY, embedding vector({DIM}))"
+        ))
+        await db.execute(text(f"""
+            CREATE TABLE {metadata_table} (
+                vector_id INTEGER REFERENCES {table_name}(id),
+                metadata JSONB
+            )
+        """))
+        await db.execute(
+            text(f"INSERT INTO {table_name} (embedding) VALUES (CAST(:v AS vector))"),
+            {"v": random_vectors(1)[0]}
+        )
+        await db.execute(
+            text(f"INSERT INTO {metadata_table} VALUES (1, CAST(:meta AS jsonb))"),
+            {"meta": '{"n": 1}'}
+        )
+    
+    try:
+        store = await make_store(table_name=table_name, metadata_table=metadata_table)
+        results = await store.search(random_vectors(1)[0], k=1, filter_criteria={"n": 1})
+        assert results[0]["metadata"] == {"n": 1}
+        
+        await store.delete_vectors([results[0]["id"]])
+        assert await store.search(random_vectors(1)[0], k=1) == []
+    finally:
+        async with db_session() as db:
+            await db.execute(text(f"DROP TABLE IF EXISTS {metadata_table}, {table_name}"))
+
+async def pgvector_version():
+    async with db_session() as db:
+        result = await db.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        return tuple(int(part) for part in result.scalar().split("."))
+
+async def test_hnsw_index_is_built_with_its_options(make_store):
+    vectors = random_vectors(40)
+    store = await make_store(index_method="hnsw", hnsw_m=8, ef_construction=32, ef_search=20)
+    await store.add_vectors(vectors, [{} for _ in range(40)])
+    
+    metrics = await store.get_metrics()
+    index = next(index for index in metrics["indexes"] if index["method"] == "hnsw")
+    assert index["options"] == {"m": "8", "ef_construction": "32"}
+    
+    results = await store.search(vectors[3], k=5, ef_search=64)
+    assert len(results) == 5
+    _, found = await store.search_batch(vectors[:2], k=5, ef_search=64)
+    assert found.shape == (2, 5)
+
+async def test_ivfflat_probes_can_be_set_per_query(make_store):
+    vectors = random_vectors(40)
+    store = await make_store(index_lists=4, nprobe=1)
+    ids = await store.add_vectors(vectors, [{} for _ in range(40)])
+    results = await store.search(vectors[8], k=1, nprobe=4)
+    assert results[0]["id"] == ids[8]
+
+async def test_unknown_index_method_is_rejected(make_store):
+    with pytest.raises(ValueError, match="index method"):
+        await make_store(index_method="diskann")
+
+async def test_iterative_scan_on_filtered_search(make_store):
+    if await pgvector_version() < (0, 8):
+        pytest.skip("iterative index scans need pgvector 0.8")
+    vectors = random_vectors(60)
+    store = await make_store(index_method="hnsw", iterative_scan="relaxed_order")
+    await store.add_vectors(vectors, [{"parity": i % 2} for i in range(60)])
+    results = await store.search(vectors[0], k=10, filter_criteria={"parity": 1})
+    assert len(results) == 10
+
+async def test_estimate_rerank_recall_over_a_halfvec_index(make_store):
+    if await pgvector_version() < (0, 7):
+        pytest.skip("halfvec indexes need pgvector 0.7")
+    vectors = random_vectors(60)
+    store = await make_store(index_method="hnsw", storage_dtype="float16", rerank=True)
+    await store.add_vectors(vectors, [{} for _ in range(60)])
+    
+    estimate = await store.estimate_rerank_recall(k=5, num_queries=10)
+    assert estimate["num_queries"] == 10
+    assert 0.0 <= estimate["first_stage_recall_at_5"] <= estimate["reranked_recall_at_5"] <= 1.0
+
+async def test_metrics_are_cached_until_a_write(make_store):
+    store = await make_store(metrics_ttl=3600)
+    await store.add_vectors(random_vectors(5), [{"n": i} for i in range(5)])
+    
+    metrics = await store.get_metrics(exact=True)
+    assert metrics["total_vectors"] == 5
+    assert metrics["metadata_count"] == 5
+    assert metrics["counts_exact"]
+    assert await store.get_metrics(exact=True) is metrics
+    
+    await store.add_vectors(random_vectors(2, seed=1), [{}, {}])
+    assert (await store.get_metrics(exact=True))["total_vectors"] == 7
+
+async def test_estimated_metrics_use_planner_statistics(make_store):
+    store = await make_store(metrics_ttl=0)
+    await store.add_vectors(random_vectors(10), [{"n": i} for i in range(10)])
+    async with db_session() as db:
+        await db.execute(text(f"ANALYZE {store.table_name}"))
+    
+    metrics = await store.get_metrics()
+    assert not metrics["counts_exact"]
+    assert metrics["total_vectors"] == 10
+    assert metrics["metadata_count"] == 10
+    assert metrics["table_size_bytes"] > 0
+    assert any(index["name"].endswith("_embedding_idx") for index in metrics["indexes"])
+
+async def test_lexical_and_hybrid_search(make_store):
+    texts = ["reset your password", "billing invoice overdue", "password policy for admins"]
+    vectors = random_vectors(3)
+    store = await make_store()
+    ids = await store.add_vectors(vectors, [{"text": text} for text in texts])
+    
+    results = await store.lexical_search("passwords", k=5)
+    assert sorted(result["id"] for result in results) == sorted([ids[0], ids[2]])
+    assert [result["id"] for result in await store.lexical_search("password -admins")] == [ids[0]]
+    
+    hybrid = await store.hybrid_search("password", vectors[2], k=2)
+    assert hybrid[0]["id"] == ids[2]
\ No newline at end of file
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from evalkit.vector.rerank import exact_knn, exact_rerank, recall_at_k
+
+def brute_force(queries, vectors, k, metric):
+    if metric == "ip":
+        scores = queries @ vectors.T
+        return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    distances = ((queries[:, None, :] - vectors[None, :, :]) ** 2).sum(axis=2)
+    return np.argsort(distances, axis=1, kind="stable")[:, :k]
+
+@pytest.mark.parametrize("metric", ["l2", "ip"])
+def test_exact_rerank_orders_candidates_by_exact_distance(metric):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    queries = rng.standard_normal((5, 8)).astype(np.float32)
+    candidates = np.tile(np.arange(50), (5, 1))
+    candidates[:, -3:] = -1
+    
+    distances, ids = exact_rerank(queries, candidates, vectors, 4, metric, chunk_size=2)
+    expected = brute_force(queries, vectors[:47], 4, metric)
+    np.testing.assert_array_equal(ids, expected)
+    if metric == "l2":
+        assert (np.diff(distances, axis=1) >= 0).all()
+    else:
+        assert (np.diff(distances, axis=1) <= 0).all()
+
+def test_exact_rerank_keeps_empty_slots_last():
+    vectors = np.eye(3, dtype=np.float32)
+    distances, ids = exact_rerank(vectors[:1], np.array([[-1, 2, -1]]), vectors, 3)
+    assert ids.tolist() == [[2, -1, -1]]
+    assert np.isinf(distances[0, 1:]).all()
+
+@pytest.mark.parametrize("metric", ["l2", "ip"])
+def test_exact_knn_matches_brute_force(metric):
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((300, 8)).astype(np.float32)
+    queries = rng.standard_normal((4, 8)).astype(np.float32)
+    rows = np.arange(300)
+    found = exact_knn(queries, vectors, rows, 5, metric, block_size=64)
+    np.testing.assert_array_equal(found, brute_force(queries, vectors, 5, metric))
+
+def test_recall_at_k():
+    found = np.array([[1, 2, 3], [4, 5, -1]])
+    true = np.array([[1, 2, 9], [4, -1, -1]])
+    assert recall_at_k(found, true) == pytest.approx((2 / 3 + 1) / 2)
+    assert recall_at_k(found[:0], true[:0]) == 0.0
\ No newline at end of file
@@ -0,0 +1,46 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from evalkit.vector.sharded_store import ShardedFAISSStore
+
+DIM = 8
+
+@pytest.fixture
+async def store():
+    store = ShardedFAISSStore()
+    await store.initialize({"dimension": DIM, "num_shards": 2, "executor_workers": 2})
+    yield store
+    await store.close()
+
+async def test_add_search_and_delete_across_shards(store):
+    vectors = np.random.default_rng(0).standard_normal((60, DIM)).astype(np.float32)
+    ids = [f"doc-{i}" for i in range(60)]
+    await store.add_vectors(vectors, [{"text": f"chunk {i}"} for i in range(60)], ids)
+    
+    metrics = await store.get_metrics()
+    assert metrics["total_vectors"] == 60
+    assert all(shard["total_vectors"] for shard in metrics["shards"])
+    
+    results = await store.search(vectors[11], k=3)
+    assert results[0]["id"] == "doc-11"
+    _, found = await store.search_batch(vectors[:4], k=2)
+    assert found[:, 0].tolist() == ids[:4]
+    
+    await store.delete_vectors(["doc-11"])
+    assert "doc-11" not in [result["id"] for result in await store.search(vectors[11], k=3)]
+
+async def test_concurrent_calls_get_their_own_replies(store):
+    vectors = np.random.default_rng(1).standard_normal((200, DIM)).astype(np.float32)
+    ids = [f"doc-{i}" for i in range(200)]
+    await store.add_vectors(vectors, [{} for _ in range(200)], ids)
+    
+    results = await asyncio.gather(*(store.search(vectors[i], k=1) for i in range(200)))
+    assert [hits[0]["id"] for hits in results] == ids
+
+async def test_shard_errors_reach_the_caller(store):
+    with pytest.raises(AttributeError):
+        await store._call(0, "no_such_method")
+    # The pipe stays usable after a failed call
+    assert (await store.get_metrics())["total_vectors"] == 0
\ No newline at end of file